@@ -1,5 +1,11 @@
-from src.gui.app import App
+from src.gui.startup import TIMER
+
+# python main.py --startup-timing: per-component import / construction times (no-op otherwise)
+TIMER.import_modules(("numpy", "customtkinter", "src.pipeline", "src.configio"))
+with TIMER.timed("import src.gui.app"):
+    from src.gui.app import App
 
 if __name__ == "__main__":
-    app = App()
+    with TIMER.timed("App()"):
+        app = App()
     app.mainloop()
@@ -1,60 +1,93 @@
+import importlib.util
 import json
 import os
 import platform
 import subprocess
 import threading
 import tkinter as tk
-import traceback
+from collections import OrderedDict
+from functools import lru_cache
+from types import SimpleNamespace
 from tkinter import font as tkfont
 from tkinter import ttk, filedialog, messagebox
 
+from src.gui.startup import TIMER
+
+# python main_legacy.py --startup-timing: per-component import / construction times (no-op otherwise)
+TIMER.import_modules(("numpy", "matplotlib.figure", "matplotlib.backends.backend_tkagg", "src.pipeline", "src.mesh"))
+
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 # Matplotlib for 3D rendering embedded in Tkinter
 from matplotlib.figure import Figure
 
-from src.configio import load_config
+from src.configio import load_config, normalize_config
 from src.pipeline import run_case
-from src.utils import export_fuselage_stl, stamp_name
-
-#interactive 3D via Plotly inside Tk HTML frame
-try:
-    from tkinterweb import HtmlFrame  # pip install tkinterweb
-    import plotly.graph_objects as go  # pip install plotly
-    HAS_PLOTLY = True
-except Exception:
-    HAS_PLOTLY = False
-
-#show Plotly in a separate pywebview window (recommended on Manjaro)
-try:
-    import webview as pywebview  # pip install pywebview (needs webkit2gtk on Linux)
-    HAS_PYWEBVIEW = True
-except Exception:
-    HAS_PYWEBVIEW = False
+from src.mesh import fuselage_lod
+from src.utils import export_fuselage_mesh, export_fuselage_stl, stamp_name
+from src.gui.executor import TkExecutor
+from src.gui.plot_raster import render_ppm
+from src.gui.plotly_shell import publish_surface
+
+
+def _available(*modules):
+    """True if every top-level module is installed (found without importing it)."""
+    return all(importlib.util.find_spec(m) is not None for m in modules)
+
+
+# Optional 3D backends are only probed here; they are imported when the 3D view is first built.
+#interactive 3D via Plotly inside Tk HTML frame (pip install tkinterweb plotly)
+HAS_PLOTLY = _available("tkinterweb", "plotly")
+
+# True: plotly.js cached once under results/.cache, small HTML shell + base64 float32 mesh per update.
+# False: self-contained HTML with plotly.js inlined on every render (multi-MB, old behaviour).
+PLOTLY_SHELL = True
+
+#show Plotly in a separate pywebview window (recommended on Manjaro; needs webkit2gtk on Linux)
+HAS_PYWEBVIEW = _available("webview")
 
 #native interactive 3D via VTK embedded in Tk
-try:
+HAS_VTK = _available("vtkmodules")
+
+# Rendered 2D plots kept for flipping between plot choices; only the current canvas size is kept
+# (a full-window PPM is ~10 MB, and a resize makes every other size useless)
+PLOT2D_CACHE_SIZE = 3
+
+
+@lru_cache(maxsize=None)
+def _vtk():
+    """The VTK classes used by the viewer, imported on first use (~0.3 s with the OpenGL backend)."""
     from vtkmodules.vtkRenderingCore import vtkRenderer, vtkActor, vtkPolyDataMapper
     from vtkmodules.vtkCommonDataModel import vtkPolyData, vtkCellArray
     from vtkmodules.vtkCommonCore import vtkPoints
+    from vtkmodules.vtkCommonCore import VTK_ID_TYPE
+    from vtkmodules.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray, get_numpy_array_type
     from vtkmodules.vtkInteractionStyle import vtkInteractorStyleTrackballCamera
-    from vtkmodules.vtkRenderingOpenGL2 import *  # noqa: F401
+    import vtkmodules.vtkRenderingOpenGL2  # noqa: F401  (registers the OpenGL render window)
     from vtkmodules.tk.vtkTkRenderWindowInteractor import vtkTkRenderWindowInteractor
-    HAS_VTK = True
-except Exception:
-    HAS_VTK = False
+    return SimpleNamespace(
+        vtkRenderer=vtkRenderer, vtkActor=vtkActor, vtkPolyDataMapper=vtkPolyDataMapper,
+        vtkPolyData=vtkPolyData, vtkCellArray=vtkCellArray, vtkPoints=vtkPoints,
+        numpy_to_vtk=numpy_to_vtk, numpy_to_vtkIdTypeArray=numpy_to_vtkIdTypeArray,
+        VTK_ID_DTYPE=get_numpy_array_type(VTK_ID_TYPE),
+        vtkInteractorStyleTrackballCamera=vtkInteractorStyleTrackballCamera,
+        vtkTkRenderWindowInteractor=vtkTkRenderWindowInteractor,
+    )
 
 
 class FuselageLabApp(tk.Tk):
     def __init__(self):
-        super().__init__()
+        with TIMER.timed("Tk root window"):
+            super().__init__()
         self.title("FuselageLab")
         self.geometry("1960x1360")
 
         # State
         self.config_path = os.path.abspath("config.json")
         self.running = False
-        self.worker = None
+        # Runs and exports share one cancellable worker; 2D plot renders have their own
+        self.executor = TkExecutor(self, interactive=("plot2d",))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._log_buffer = []  # holds early logs before log widget exists
 
         # Fonts (larger for readability in Summary and Config)
@@ -69,10 +102,14 @@ class FuselageLabApp(tk.Tk):
             self._config_font = None
 
         # UI
-        self._build_ui()
+        with TIMER.timed("build UI"):
+            self._build_ui()
         # Apply dark theme and modern styling after widgets exist
-        self._apply_dark_theme()
-        self._load_config_to_form(self.config_path)
+        with TIMER.timed("dark theme"):
+            self._apply_dark_theme()
+        with TIMER.timed("load config"):
+            self._load_config_to_form(self.config_path)
+        TIMER.window_shown(self)
 
     # ---------- UI construction ----------
     def _build_ui(self):
@@ -110,104 +147,33 @@ class FuselageLabApp(tk.Tk):
         top_paned.add(view3d_frame, weight=3)
         self.view_frame = view3d_frame
 
-        # Choose rendering backend: prefer VTK, else Plotly, else Matplotlib
+        # Choose rendering backend: prefer VTK, else Plotly, else Matplotlib.
+        # The backend widgets are built on first render (_ensure_3d_view), not at startup.
         self._use_vtk = bool(HAS_VTK)
         self._use_plotly = bool(HAS_PLOTLY) and not self._use_vtk
         self._plotly_uirev = 1
         self._last_plotly_html = None
         self._last_plotly_html_path = None
+        self._view3d_built = False
+        self.vtk_widget = None
+        self.vtk_renderer = None
+        self.view3d_html = None
+        self.fig3d = None
+        self.ax3d = None
+        self.canvas3d = None
         self.toolbar3d = None
-        if self._use_vtk:
-            try:
-                # VTK renderer embedded in Tk
-                container = ttk.Frame(view3d_frame)
-                container.pack(fill=tk.BOTH, expand=True)
-                self.vtk_widget = vtkTkRenderWindowInteractor(container, width=600, height=400)
-                self.vtk_widget.pack(fill=tk.BOTH, expand=True)
-                self.vtk_renderer = vtkRenderer()
-                self.vtk_widget.GetRenderWindow().AddRenderer(self.vtk_renderer)
-                # Interactor style for smooth mouse controls
-                style = vtkInteractorStyleTrackballCamera()
-                self.vtk_widget.GetRenderWindow().GetInteractor().SetInteractorStyle(style)
-                self.vtk_widget.Initialize()
-                self.vtk_widget.Start()
-                # No Matplotlib or Plotly widgets in this mode
-                self.view3d_html = None
-                self.fig3d = None
-                self.ax3d = None
-                self.canvas3d = None
-            except Exception as e:
-                # VTK not usable (e.g., missing libvtkRenderingTk). Fallback.
-                self._use_vtk = False
-                try:
-                    if 'container' in locals() and container.winfo_exists():
-                        container.destroy()
-                except Exception:
-                    pass
-                self._log(f"VTK initialization failed; falling back. {e}\n")
-        if (not self._use_vtk) and self._use_plotly:
-            try:
-                # HTML frame for interactive Plotly scene
-                self.view3d_html = HtmlFrame(view3d_frame, messages_enabled=False)
-                self.view3d_html.pack(fill=tk.BOTH, expand=True)
-                # Add a tiny control bar
-                btnbar = ttk.Frame(view3d_frame)
-                btnbar.pack(side=tk.BOTTOM, fill=tk.X)
-                ttk.Button(btnbar, text="Open in Browser", command=self._open_plotly_in_browser).pack(side=tk.RIGHT, padx=6, pady=4)
-                # No Matplotlib figure in this mode
-                self.fig3d = None
-                self.ax3d = None
-                self.canvas3d = None
-            except Exception:
-                # Fall back if HtmlFrame fails to init
-                self._use_plotly = False
-                try:
-                    if hasattr(self, 'view3d_html') and self.view3d_html and self.view3d_html.winfo_exists():
-                        self.view3d_html.destroy()
-                except Exception:
-                    pass
-        if not self._use_plotly and not self._use_vtk:
-            # Initialize Matplotlib figure as fallback
-            self.fig3d = Figure(figsize=(5, 4), dpi=100)
-            self.ax3d = self.fig3d.add_subplot(111, projection="3d")
-            self.ax3d.set_xlabel("x [m]")
-            self.ax3d.set_ylabel("y [m]")
-            self.ax3d.set_zlabel("z [m]")
-            self.ax3d.set_title("Fuselage (revolved)", pad=4)
-            # Tighten inner margins and label paddings
-            self._tighten_mpl_margins()
-            self._maximize_mpl_axes()
-            # Apply pure black background for wireframe look
-            try:
-                self.fig3d.patch.set_facecolor("#000000")
-                self.ax3d.set_facecolor("#000000")
-                # Hide axes on startup for a clean empty canvas
-                self.ax3d.set_axis_off()
-            except Exception:
-                pass
-            mpl_container = ttk.Frame(view3d_frame, padding=0)
-            try:
-                mpl_container.configure(borderwidth=0)
-            except Exception:
-                pass
-            mpl_container.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
-            self.canvas3d = FigureCanvasTkAgg(self.fig3d, master=mpl_container)
-            self.canvas3d.draw()
-            ctk = self.canvas3d.get_tk_widget()
-            try:
-                ctk.configure(highlightthickness=0, bd=0)
-            except Exception:
-                pass
-            ctk.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=0, pady=0)
-            # Optional toolbar for interaction (limited)
-            self.toolbar3d = NavigationToolbar2Tk(self.canvas3d, mpl_container, pack_toolbar=False)
-            self.toolbar3d.update()
-            self.toolbar3d.pack(side=tk.BOTTOM, fill=tk.X)
-
-        # Prepare 2D Matplotlib canvas (lazy: created on first use)
-        self.fig2d = None
-        self.ax2d = None
-        self.canvas2d = None
+        self._view3d_hint = ttk.Label(view3d_frame, text="Run a case to see the fuselage.", anchor=tk.CENTER)
+        self._view3d_hint.pack(fill=tk.BOTH, expand=True)
+
+        # 2D plots are rasterized off-thread (Agg) and shown as an image (lazy: created on first use)
+        self._plot2d_label = None
+        self._plot2d_style = None      # dark-theme colors for the Agg renderer
+        self._plot2d_current = None    # (choice, draw) on screen, re-rendered on resize
+        self._plot2d_after = None
+        self._dist_cache = OrderedDict()   # (id(payload), op, cf_model) -> (payload, distributions)
+        self._plot2d_cache = OrderedDict()  # (choice, id(payload), id(cfg)) -> (payload, cfg, ppm) at _plot2d_size
+        self._plot2d_size = None
+        self._cache_lock = threading.Lock()
 
         # Right: controls + summary + Config form (smaller)
         right = ttk.Frame(top_paned)
@@ -220,6 +186,8 @@ class FuselageLabApp(tk.Tk):
 
         self.run_btn = ttk.Button(actions, text="Run", command=self._on_run_clicked)
         self.run_btn.pack(side=tk.LEFT, padx=6, pady=6)
+        self.cancel_btn = ttk.Button(actions, text="Cancel", command=self._on_cancel_clicked, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=6, pady=6)
 
         self.open_results_btn = ttk.Button(actions, text="Open Results Folder", command=self._open_results)
         self.open_results_btn.pack(side=tk.LEFT, padx=6, pady=6)
@@ -227,6 +195,7 @@ class FuselageLabApp(tk.Tk):
         # STL export (ASCII and Binary)
         ttk.Button(actions, text="Export STL (ASCII)", command=lambda: self._export_stl(True)).pack(side=tk.LEFT, padx=6, pady=6)
         ttk.Button(actions, text="Export STL (Binary)", command=lambda: self._export_stl(False)).pack(side=tk.LEFT, padx=6, pady=6)
+        ttk.Button(actions, text="Export PLY/OBJ/GLB", command=self._export_indexed_mesh).pack(side=tk.LEFT, padx=6, pady=6)
 
         # Wireframe/axes controls
         self.show_axes_var = tk.BooleanVar(value=False)
@@ -370,6 +339,10 @@ class FuselageLabApp(tk.Tk):
             "io": {
                 "export_csv": tk.BooleanVar(),
                 "csv_path": tk.StringVar(),
+                "results_format": tk.StringVar(),
+                "run_index": tk.StringVar(),
+                "run_dirs": tk.BooleanVar(),
+                "storage_dtype": tk.StringVar(),
             },
             "plots": {
                 "make_plots": tk.BooleanVar(),
@@ -457,6 +430,15 @@ class FuselageLabApp(tk.Tk):
         e_csv = ttk.Entry(tab_io, textvariable=self.cfg_vars["io"]["csv_path"], style="Config.TEntry")
         e_csv.grid(row=1, column=1, sticky="ew", padx=8, pady=4)
         ttk.Button(tab_io, text="Browse…", command=self._browse_csv_path, style="Config.TButton").grid(row=1, column=2, sticky="w", padx=(0,8), pady=4)
+        ttk.Label(tab_io, text="Results format", style="Config.TLabel").grid(row=2, column=0, sticky="w", padx=8, pady=4)
+        fmt_cb = ttk.Combobox(tab_io, textvariable=self.cfg_vars["io"]["results_format"], values=["json", "compact", "both"], state="readonly", style="Config.TCombobox")
+        fmt_cb.grid(row=2, column=1, sticky="ew", padx=8, pady=4)
+        ttk.Label(tab_io, text="Run index (empty = off)", style="Config.TLabel").grid(row=3, column=0, sticky="w", padx=8, pady=4)
+        ttk.Entry(tab_io, textvariable=self.cfg_vars["io"]["run_index"], style="Config.TEntry").grid(row=3, column=1, sticky="ew", padx=8, pady=4)
+        cb_rundirs = ttk.Checkbutton(tab_io, text="Per-run output folders (results/runs)", variable=self.cfg_vars["io"]["run_dirs"], style="Config.TCheckbutton")
+        cb_rundirs.grid(row=4, column=0, columnspan=2, sticky="w", padx=8, pady=4)
+        ttk.Label(tab_io, text="Storage dtype", style="Config.TLabel").grid(row=5, column=0, sticky="w", padx=8, pady=4)
+        ttk.Combobox(tab_io, textvariable=self.cfg_vars["io"]["storage_dtype"], values=["float64", "float32"], state="readonly", style="Config.TCombobox").grid(row=5, column=1, sticky="ew", padx=8, pady=4)
 
         # Plots
         tab_plots = ttk.Frame(nb)
@@ -512,6 +494,8 @@ class FuselageLabApp(tk.Tk):
         # Fill vars safely (stringify numerics for entries)
         def s(v):
             return "" if v is None else (str(v))
+        # Sections without form fields (e.g. "retention") are carried over on save
+        self._extra_sections = {k: v for k, v in cfg.items() if k not in self.cfg_vars}
         try:
             g = cfg.get("geom", {})
             self.cfg_vars["geom"]["l"].set(s(g.get("l", "")))
@@ -549,6 +533,10 @@ class FuselageLabApp(tk.Tk):
             io = cfg.get("io", {})
             self.cfg_vars["io"]["export_csv"].set(bool(io.get("export_csv", True)))
             self.cfg_vars["io"]["csv_path"].set(io.get("csv_path", "results/data/fuselaje_xy.csv"))
+            self.cfg_vars["io"]["results_format"].set(io.get("results_format", "json"))
+            self.cfg_vars["io"]["run_index"].set(io.get("run_index", "results/runs.sqlite"))
+            self.cfg_vars["io"]["run_dirs"].set(bool(io.get("run_dirs", True)))
+            self.cfg_vars["io"]["storage_dtype"].set(io.get("storage_dtype", "float64"))
 
             pl = cfg.get("plots", {})
             self.cfg_vars["plots"]["make_plots"].set(bool(pl.get("make_plots", True)))
@@ -608,6 +596,10 @@ class FuselageLabApp(tk.Tk):
             "io": {
                 "export_csv": bool(self.cfg_vars["io"]["export_csv"].get()),
                 "csv_path": self.cfg_vars["io"]["csv_path"].get() or "results/data/fuselaje_xy.csv",
+                "results_format": (self.cfg_vars["io"]["results_format"].get() or "json"),
+                "run_index": self.cfg_vars["io"]["run_index"].get().strip(),
+                "run_dirs": bool(self.cfg_vars["io"]["run_dirs"].get()),
+                "storage_dtype": (self.cfg_vars["io"]["storage_dtype"].get() or "float64"),
             },
             "plots": {
                 "make_plots": bool(self.cfg_vars["plots"]["make_plots"].get()),
@@ -622,6 +614,8 @@ class FuselageLabApp(tk.Tk):
         else:
             # rho_material and t_skin should be >0; sigma can be present but unused
             pass
+        for k, v in getattr(self, "_extra_sections", {}).items():
+            cfg.setdefault(k, v)
         return cfg
 
     # ---------- Actions ----------
@@ -660,41 +654,52 @@ class FuselageLabApp(tk.Tk):
                 messagebox.showerror("Save error", f"Could not save config.\n\n{e}")
 
     def _on_run_clicked(self):
-        if self.running:
-            return
-        # Save current form content to file, then run pipeline using load_config
-        path = self.path_var.get().strip() or self.config_path
-        if not path.lower().endswith(".json"):
-            messagebox.showerror("Invalid path", "Config path must end with .json")
-            return
+        # Run straight from the form (validated in memory); the config file is only written on Save.
+        # A click during a run cancels it and starts over with the current form values.
         try:
-            self._save_form_to_file(path)
+            cfg = normalize_config(self._collect_cfg_from_form())
         except Exception as e:
-            messagebox.showerror("Save error", f"Could not save config file.\n\n{e}")
+            messagebox.showerror("Invalid configuration", str(e))
             return
 
+        if self.running:
+            self._log("Restarting run with the current form values\n")
+        else:
+            self._log("Starting run with the current form values\n")
         self._set_running(True)
-        self._log(f"Starting run with: {path}\n")
+        self.executor.submit(
+            "run", lambda token, progress: run_case(cfg, token, progress),
+            on_done=lambda payload: self._on_run_done(cfg, payload),
+            on_error=self._on_run_failed,
+            on_progress=lambda frac, stage: self.title(f"FuselageLab - {stage} ({frac:.0%})"),
+        )
 
-        def worker():
-            try:
-                cfg = load_config(path)
-                payload = run_case(cfg)
-                # Schedule UI updates in main thread
-                self.after(0, lambda: self._set_last(cfg, payload))
-                self.after(0, lambda: self._update_summary(payload))
-                self.after(0, lambda: self._render_view_current())
-                self.after(0, lambda: self._log("Run completed successfully.\n"))
-            except Exception:
-                err = traceback.format_exc()
-                # Log and show error in main thread
-                self.after(0, lambda: self._log(err))
-                self.after(0, lambda: messagebox.showerror("Run failed", err))
-            finally:
-                self.after(0, lambda: self._set_running(False))
+    def _on_run_done(self, cfg, payload):
+        self._set_running(False)
+        self._set_last(cfg, payload)
+        self._update_summary(payload)
+        self._render_view_current()
+        out = f" Outputs: {payload['run_dir']}" if payload.get("run_dir") else ""
+        self._log(f"Run completed successfully.{out}\n")
 
-        self.worker = threading.Thread(target=worker, daemon=True)
-        self.worker.start()
+    def _on_run_failed(self, exc, err):
+        self._set_running(False)
+        self._log(err)
+        messagebox.showerror("Run failed", err)
+
+    def _on_cancel_clicked(self):
+        if self.running:
+            self.executor.cancel("run")
+            self._set_running(False)
+            self._log("Run cancelled.\n")
+        if self.executor.busy("export"):
+            self.executor.cancel("export")
+            self._log("Export cancelled.\n")
+        self.cancel_btn.configure(state=tk.DISABLED)
+
+    def _on_close(self):
+        self.executor.shutdown()
+        self.destroy()
 
     def _open_results(self):
         # Open the results folder in the system file browser
@@ -733,15 +738,53 @@ class FuselageLabApp(tk.Tk):
             )
             if not path:
                 return
-            export_fuselage_stl(geom, path, ascii=ascii, n_theta=128, name="fuselage")
-            self._log(f"[OK] Exported STL to: {path}\n")
-            try:
-                messagebox.showinfo("Export STL", f"Saved: {path}")
-            except Exception:
-                pass
+            self._submit_export(
+                lambda token, progress: export_fuselage_stl(geom, path, ascii=ascii, n_theta=128, name="fuselage", token=token),
+                f"[OK] Exported STL to: {path}\n", "Could not export STL", notify=("Export STL", f"Saved: {path}"))
         except Exception as e:
             self._log(f"Could not export STL: {e}\n")
 
+    def _export_indexed_mesh(self):
+        try:
+            payload = getattr(self, "_last_payload", None)
+            if not payload or not payload.get("geom"):
+                messagebox.showinfo("Export mesh", "Run a case first to generate geometry.")
+                return
+            default_dir = os.path.abspath(os.path.join("results", "meshes"))
+            os.makedirs(default_dir, exist_ok=True)
+            path = filedialog.asksaveasfilename(
+                title="Export mesh (PLY/OBJ/GLB)",
+                defaultextension=".ply",
+                filetypes=[("PLY files", "*.ply"), ("OBJ files", "*.obj"), ("glTF binary", "*.glb"), ("All files", "*.*")],
+                initialdir=default_dir,
+                initialfile=stamp_name("fuselage", ext="ply"),
+            )
+            if not path:
+                return
+            geom = payload["geom"]
+            self._submit_export(
+                lambda token, progress: export_fuselage_mesh(geom, path, n_theta=128, name="fuselage", token=token),
+                f"[OK] Exported mesh to: {path}\n", "Could not export mesh")
+        except Exception as e:
+            self._log(f"Could not export mesh: {e}\n")
+
+    def _submit_export(self, job, ok_msg: str, err_prefix: str, notify=None):
+        """Write a mesh on the background worker; a newer export supersedes a pending one."""
+        def done(_):
+            if not self.running:
+                self.cancel_btn.configure(state=tk.DISABLED)
+            self._log(ok_msg)
+            if notify:
+                messagebox.showinfo(*notify)
+
+        def failed(exc, err):
+            if not self.running:
+                self.cancel_btn.configure(state=tk.DISABLED)
+            self._log(f"{err_prefix}: {exc}\n")
+
+        self.cancel_btn.configure(state=tk.NORMAL)
+        self.executor.submit("export", job, on_done=done, on_error=failed)
+
     # ---------- Helpers ----------
     def _load_config_to_form(self, path: str):
         path = os.path.abspath(path)
@@ -768,10 +811,14 @@ class FuselageLabApp(tk.Tk):
         self._log(f"Saved config: {path}\n")
 
     def _set_running(self, running: bool):
+        # Run stays clickable (a new click restarts the run); Cancel stops it between stages
         self.running = running
-        state = tk.DISABLED if running else tk.NORMAL
-        self.run_btn.configure(state=state)
-        self.path_entry.configure(state=state)
+        self.run_btn.configure(text="Restart" if running else "Run")
+        if running or not self.executor.busy("export"):
+            self.cancel_btn.configure(state=tk.NORMAL if running else tk.DISABLED)
+        self.path_entry.configure(state=tk.DISABLED if running else tk.NORMAL)
+        if not running:
+            self.title("FuselageLab")
 
     def _update_summary(self, payload: dict):
         try:
@@ -863,24 +910,136 @@ class FuselageLabApp(tk.Tk):
         self.view_frame.configure(text="3D View")
         self._render_3d_from_payload(payload)
 
+    def _ensure_3d_view(self):
+        """Build the 3D backend widgets (VTK, Plotly frame or Matplotlib canvas) once, on first render."""
+        if self._view3d_built:
+            return
+        self._view3d_built = True
+        try:
+            self._view3d_hint.destroy()
+        except Exception:
+            pass
+        view3d_frame = self.view_frame
+        backend = "VTK" if self._use_vtk else ("Plotly" if self._use_plotly else "Matplotlib")
+        with TIMER.timed(f"3D view ({backend})"):
+            self._build_3d_backend(view3d_frame)
+        # The theme was applied before these widgets existed
+        style = self._plot2d_style
+        if style is not None:
+            if self.toolbar3d is not None:
+                self._style_toolbar_dark(self.toolbar3d, style["surface"], style["fg"])
+            if self.vtk_renderer is not None:
+                self._apply_vtk_dark(self.vtk_renderer)
+
+    def _build_3d_backend(self, view3d_frame):
+        if self._use_vtk:
+            try:
+                vtk = _vtk()
+                # VTK renderer embedded in Tk
+                container = ttk.Frame(view3d_frame)
+                container.pack(fill=tk.BOTH, expand=True)
+                self.vtk_widget = vtk.vtkTkRenderWindowInteractor(container, width=600, height=400)
+                self.vtk_widget.pack(fill=tk.BOTH, expand=True)
+                self.vtk_renderer = vtk.vtkRenderer()
+                self.vtk_widget.GetRenderWindow().AddRenderer(self.vtk_renderer)
+                # Interactor style for smooth mouse controls
+                style = vtk.vtkInteractorStyleTrackballCamera()
+                self.vtk_widget.GetRenderWindow().GetInteractor().SetInteractorStyle(style)
+                self.vtk_widget.Initialize()
+                self.vtk_widget.Start()
+                # No Matplotlib or Plotly widgets in this mode
+                self.view3d_html = None
+                self.fig3d = None
+                self.ax3d = None
+                self.canvas3d = None
+            except Exception as e:
+                # VTK not usable (e.g., missing libvtkRenderingTk). Fallback.
+                self._use_vtk = False
+                self.vtk_widget = None
+                self.vtk_renderer = None
+                try:
+                    if 'container' in locals() and container.winfo_exists():
+                        container.destroy()
+                except Exception:
+                    pass
+                self._log(f"VTK initialization failed; falling back. {e}\n")
+        if (not self._use_vtk) and self._use_plotly:
+            try:
+                # HTML frame for interactive Plotly scene
+                from tkinterweb import HtmlFrame
+                self.view3d_html = HtmlFrame(view3d_frame, messages_enabled=False)
+                self.view3d_html.pack(fill=tk.BOTH, expand=True)
+                # Add a tiny control bar
+                btnbar = ttk.Frame(view3d_frame)
+                btnbar.pack(side=tk.BOTTOM, fill=tk.X)
+                ttk.Button(btnbar, text="Open in Browser", command=self._open_plotly_in_browser).pack(side=tk.RIGHT, padx=6, pady=4)
+                # No Matplotlib figure in this mode
+                self.fig3d = None
+                self.ax3d = None
+                self.canvas3d = None
+            except Exception:
+                # Fall back if HtmlFrame fails to init
+                self._use_plotly = False
+                try:
+                    if hasattr(self, 'view3d_html') and self.view3d_html and self.view3d_html.winfo_exists():
+                        self.view3d_html.destroy()
+                except Exception:
+                    pass
+                self.view3d_html = None
+        if not self._use_plotly and not self._use_vtk:
+            # Initialize Matplotlib figure as fallback
+            self.fig3d = Figure(figsize=(5, 4), dpi=100)
+            self.ax3d = self.fig3d.add_subplot(111, projection="3d")
+            self.ax3d.set_xlabel("x [m]")
+            self.ax3d.set_ylabel("y [m]")
+            self.ax3d.set_zlabel("z [m]")
+            self.ax3d.set_title("Fuselage (revolved)", pad=4)
+            # Tighten inner margins and label paddings
+            self._tighten_mpl_margins()
+            self._maximize_mpl_axes()
+            # Apply pure black background for wireframe look
+            try:
+                self.fig3d.patch.set_facecolor("#000000")
+                self.ax3d.set_facecolor("#000000")
+                # Hide axes on startup for a clean empty canvas
+                self.ax3d.set_axis_off()
+            except Exception:
+                pass
+            mpl_container = ttk.Frame(view3d_frame, padding=0)
+            try:
+                mpl_container.configure(borderwidth=0)
+            except Exception:
+                pass
+            mpl_container.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
+            self.canvas3d = FigureCanvasTkAgg(self.fig3d, master=mpl_container)
+            self.canvas3d.draw()
+            ctk = self.canvas3d.get_tk_widget()
+            try:
+                ctk.configure(highlightthickness=0, bd=0)
+            except Exception:
+                pass
+            ctk.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=0, pady=0)
+            # Optional toolbar for interaction (limited)
+            self.toolbar3d = NavigationToolbar2Tk(self.canvas3d, mpl_container, pack_toolbar=False)
+            self.toolbar3d.update()
+            self.toolbar3d.pack(side=tk.BOTTOM, fill=tk.X)
+
     def _ensure_2d_canvas(self):
-        if self.fig2d is None:
-            from matplotlib.figure import Figure
-            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-            self.fig2d = Figure(figsize=(5, 4), dpi=100)
-            self.ax2d = self.fig2d.add_subplot(111)
+        if self._plot2d_label is None:
             container = ttk.Frame(self.view_frame, padding=0)
             try:
                 container.configure(borderwidth=0)
             except Exception:
                 pass
             container.pack(fill=tk.BOTH, expand=True)
-            self.canvas2d = FigureCanvasTkAgg(self.fig2d, master=container)
-            self.canvas2d.draw()
-            self.canvas2d.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            bg = (self._plot2d_style or {}).get("surface", "#1e1e1e")
+            self._plot2d_label = tk.Label(container, bd=0, highlightthickness=0, bg=bg)
+            self._plot2d_label.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            self._plot2d_label.bind("<Configure>", self._on_plot2d_resized)
             self._mpl2d_container = container
-            # Hide 3D widgets if present
-        # Hide 3D widgets
+        # Hide 3D widgets (or the placeholder if no 3D render happened yet)
+        if not self._view3d_built:
+            self._view3d_hint.pack_forget()
         try:
             if getattr(self, 'vtk_widget', None):
                 self.vtk_widget.pack_forget()
@@ -906,6 +1065,7 @@ class FuselageLabApp(tk.Tk):
             pass
 
     def _ensure_3d_visible(self):
+        self._ensure_3d_view()
         # Hide 2D
         try:
             if getattr(self, '_mpl2d_container', None):
@@ -940,13 +1100,9 @@ class FuselageLabApp(tk.Tk):
             if x is None or y is None or x.size == 0:
                 self._log("No geometry to render.\n")
                 return
-            # Build revolution surface: revolve y around x-axis
-            n_theta = 64
-            theta = np.linspace(0.0, 2*np.pi, n_theta)
-            X = np.repeat(x[:, None], n_theta, axis=1)
-            R = np.repeat(y[:, None], n_theta, axis=1)
-            Y = R * np.cos(theta)
-            Z = R * np.sin(theta)
+            # Revolution surface from the shared kernel (cached per geometry)
+            lod = fuselage_lod(geom, "viewer")
+            X, Y, Z = lod.X, lod.Y, lod.Z
             # Cache surface for potential re-render (e.g., toggle axes)
             self._last_surface = (X, Y, Z)
 
@@ -954,7 +1110,9 @@ class FuselageLabApp(tk.Tk):
             self._ensure_3d_visible()
             if self._use_vtk:
                 # Build/update VTK surface actor
-                actor = self._build_vtk_surface(X, Y, Z)
+                # Bulk conversion keeps the full-resolution mesh cheap enough for the Tk thread
+                hi = fuselage_lod(geom, "export")
+                actor = self._build_vtk_surface(hi.V, hi.F)
                 # Clear previous actors
                 self.vtk_renderer.RemoveAllViewProps()
                 self.vtk_renderer.AddActor(actor)
@@ -964,10 +1122,10 @@ class FuselageLabApp(tk.Tk):
                 self._log("Rendered interactive 3D surface (VTK).\n")
             elif self._use_plotly:
                 # Interactive shaded surface via Plotly
+                import plotly.graph_objects as go
                 fig = go.Figure(
                     data=[
                         go.Surface(
-                            x=X, y=Y, z=Z,
                             colorscale="Blues",
                             showscale=False,
                             opacity=1.0,
@@ -987,27 +1145,9 @@ class FuselageLabApp(tk.Tk):
                 )
                 # Apply dark theme if in use
                 self._apply_plotly_dark(fig)
-                # Smooth zoom/rotate with scroll
-                config = dict(scrollZoom=True, displaylogo=False)
-                # Embed Plotly JS inline to avoid network dependency
-                html = fig.to_html(include_plotlyjs=True, full_html=False, config=config)
-                try:
-                    if hasattr(self.view3d_html, "load_html"):
-                        self.view3d_html.load_html(html)
-                    elif hasattr(self.view3d_html, "set_html"):
-                        self.view3d_html.set_html(html)
-                except Exception as e:
-                    self._log(f"Could not update Plotly view: {e}\n")
-                # Save html to file for browser fallback
-                try:
-                    os.makedirs("results", exist_ok=True)
-                    path = os.path.join("results", "interactive_3d.html")
-                    with open(path, "w", encoding="utf-8") as f:
-                        f.write("<meta charset='utf-8'>\n" + html)
-                    self._last_plotly_html = html
-                    self._last_plotly_html_path = os.path.abspath(path)
-                except Exception as e:
-                    self._log(f"Could not save interactive 3D HTML: {e}\n")
+                html = self._publish_plotly(fig, X, Y, Z)
+                if html is not None:
+                    self._load_plotly_frame(html)
                 self._log("Rendered interactive 3D surface (Plotly).\n")
             else:
                 # Fallback to Matplotlib wireframe
@@ -1223,19 +1363,11 @@ class FuselageLabApp(tk.Tk):
         except Exception:
             pass
 
-        # 2D Matplotlib dark styling (lazy canvas)
+        # 2D Matplotlib dark styling (applied by the off-thread renderer)
+        self._plot2d_style = {"surface": surface, "fg": fg, "border": border}
         try:
-            if getattr(self, 'fig2d', None) is not None and getattr(self, 'ax2d', None) is not None:
-                self.fig2d.patch.set_facecolor(surface)
-                self.ax2d.set_facecolor(surface)
-                self.ax2d.tick_params(colors=fg)
-                for spine in self.ax2d.spines.values():
-                    spine.set_color(border)
-                self.ax2d.title.set_color(fg)
-                self.ax2d.xaxis.label.set_color(fg)
-                self.ax2d.yaxis.label.set_color(fg)
-                if getattr(self, 'canvas2d', None) is not None:
-                    self.canvas2d.draw_idle()
+            if getattr(self, '_plot2d_label', None) is not None:
+                self._plot2d_label.configure(bg=surface)
         except Exception:
             pass
 
@@ -1350,7 +1482,7 @@ class FuselageLabApp(tk.Tk):
                     import plotly.graph_objects as go
                     fig = go.Figure(
                         data=[
-                            go.Surface(x=X, y=Y, z=Z, colorscale=[[0, "#ffffff"],[1, "#ffffff"]], showscale=False, opacity=0.0,
+                            go.Surface(colorscale=[[0, "#ffffff"],[1, "#ffffff"]], showscale=False, opacity=0.0,
                                        contours=dict(
                                            x=dict(show=True, color="#ffffff"),
                                            y=dict(show=True, color="#ffffff"),
@@ -1371,12 +1503,9 @@ class FuselageLabApp(tk.Tk):
                         title="Fuselage (wireframe)",
                         uirevision=str(self._plotly_uirev),
                     )
-                    config = dict(scrollZoom=True, displaylogo=False)
-                    html = fig.to_html(include_plotlyjs=True, full_html=False, config=config)
-                    if hasattr(self.view3d_html, "load_html"):
-                        self.view3d_html.load_html(html)
-                    elif hasattr(self.view3d_html, "set_html"):
-                        self.view3d_html.set_html(html)
+                    html = self._publish_plotly(fig, X, Y, Z)
+                    if html is not None:
+                        self._load_plotly_frame(html)
                 except Exception:
                     pass
             # VTK path omitted (no axes actor by default)
@@ -1401,7 +1530,7 @@ class FuselageLabApp(tk.Tk):
                     return
                 fig = go.Figure(
                     data=[
-                        go.Surface(x=X, y=Y, z=Z, colorscale="Blues", showscale=False, opacity=1.0)
+                        go.Surface(colorscale="Blues", showscale=False, opacity=1.0)
                     ]
                 )
                 fig.update_layout(
@@ -1415,18 +1544,8 @@ class FuselageLabApp(tk.Tk):
                     self._apply_plotly_dark(fig)
                 except Exception:
                     pass
-                config = dict(scrollZoom=True, displaylogo=False)
-                html = fig.to_html(include_plotlyjs=True, full_html=False, config=config)
-                try:
-                    os.makedirs("results", exist_ok=True)
-                    path = os.path.join("results", "interactive_3d.html")
-                    with open(path, "w", encoding="utf-8") as f:
-                        f.write("<meta charset='utf-8'>\n" + html)
-                    self._last_plotly_html = html
-                    self._last_plotly_html_path = os.path.abspath(path)
-                except Exception as e:
-                    self._log(f"Could not save interactive 3D HTML: {e}\n")
-                    messagebox.showerror("Interactive 3D", f"Could not save HTML file.\n\n{e}")
+                if self._publish_plotly(fig, X, Y, Z) is None:
+                    messagebox.showerror("Interactive 3D", "Could not save HTML file (see log).")
                     return
             # Open via pywebview if available; else default browser
             path = self._last_plotly_html_path
@@ -1434,11 +1553,10 @@ class FuselageLabApp(tk.Tk):
                 try:
                     # Launch pywebview in a background thread to avoid blocking Tk
                     import webview as _wv
-                    with open(path, "r", encoding="utf-8") as f:
-                        html = f.read()
                     def _run_webview():
                         try:
-                            _wv.create_window("Fuselage 3D", html=html, width=1000, height=700)
+                            # Load the file itself: the shell's relative plotly.js / data scripts resolve
+                            _wv.create_window("Fuselage 3D", url=path, width=1000, height=700)
                             _wv.start()
                         except Exception as e:
                             # Fallback to browser from main thread
@@ -1460,6 +1578,39 @@ class FuselageLabApp(tk.Tk):
         except Exception as e:
             self._log(f"Open interactive 3D failed: {e}\n")
 
+    def _publish_plotly(self, fig, X, Y, Z):
+        """
+        Write results/interactive_3d.html for a single-surface figure (trace style + layout, no
+        arrays) and return the HTML for the embedded frame, or None if it could not be saved.
+        """
+        config = dict(scrollZoom=True, displaylogo=False)
+        path = os.path.join("results", "interactive_3d.html")
+        try:
+            if PLOTLY_SHELL:
+                html = publish_surface(fig, X, Y, Z, config, path)
+            else:
+                fig.data[0].update(x=X, y=Y, z=Z)
+                # Embed Plotly JS inline to avoid network dependency
+                html = fig.to_html(include_plotlyjs=True, full_html=False, config=config)
+                os.makedirs("results", exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("<meta charset='utf-8'>\n" + html)
+        except Exception as e:
+            self._log(f"Could not save interactive 3D HTML: {e}\n")
+            return None
+        self._last_plotly_html = html
+        self._last_plotly_html_path = os.path.abspath(path)
+        return html
+
+    def _load_plotly_frame(self, html: str):
+        try:
+            if hasattr(self.view3d_html, "load_html"):
+                self.view3d_html.load_html(html)
+            elif hasattr(self.view3d_html, "set_html"):
+                self.view3d_html.set_html(html)
+        except Exception as e:
+            self._log(f"Could not update Plotly view: {e}\n")
+
     def _style_toolbar_dark(self, toolbar: NavigationToolbar2Tk, bg: str, fg: str):
         try:
             toolbar.configure(background=bg)
@@ -1499,63 +1650,35 @@ class FuselageLabApp(tk.Tk):
             pass
 
     # ---------- VTK helpers ----------
-    def _build_vtk_surface(self, X, Y, Z):
-        """Create a VTK surface from gridded X,Y,Z arrays."""
-        n_i, n_j = X.shape
-        points = vtkPoints()
-        points.SetNumberOfPoints(n_i * n_j)
-        # Insert points row-major
-        idx = 0
-        for i in range(n_i):
-            for j in range(n_j):
-                points.SetPoint(idx, float(X[i, j]), float(Y[i, j]), float(Z[i, j]))
-                idx += 1
-
-        polys = vtkCellArray()
-        # Build quads as two triangles
-        def idx_of(i, j):
-            return i * n_j + j
-        for i in range(n_i - 1):
-            for j in range(n_j - 1):
-                p0 = idx_of(i, j)
-                p1 = idx_of(i + 1, j)
-                p2 = idx_of(i + 1, j + 1)
-                p3 = idx_of(i, j + 1)
-                # Triangle 1: p0, p1, p2
-                polys.InsertNextCell(3)
-                polys.InsertCellPoint(p0)
-                polys.InsertCellPoint(p1)
-                polys.InsertCellPoint(p2)
-                # Triangle 2: p0, p2, p3
-                polys.InsertNextCell(3)
-                polys.InsertCellPoint(p0)
-                polys.InsertCellPoint(p2)
-                polys.InsertCellPoint(p3)
-
-        # Wrap last column to first to close the surface (if ring is closed)
-        j_last = n_j - 1
-        for i in range(n_i - 1):
-            p0 = idx_of(i, j_last)
-            p1 = idx_of(i + 1, j_last)
-            p2 = idx_of(i + 1, 0)
-            p3 = idx_of(i, 0)
-            polys.InsertNextCell(3)
-            polys.InsertCellPoint(p0)
-            polys.InsertCellPoint(p1)
-            polys.InsertCellPoint(p2)
-            polys.InsertNextCell(3)
-            polys.InsertCellPoint(p0)
-            polys.InsertCellPoint(p2)
-            polys.InsertCellPoint(p3)
-
-        polydata = vtkPolyData()
+    def _build_vtk_surface(self, V, F):
+        """Create a VTK surface from the kernel's indexed triangle mesh (V, F), converted in bulk."""
+        vtk = _vtk()
+        points = vtk.vtkPoints()
+        # Deep copies so VTK owns its buffers (the kernel arrays are cached and read-only)
+        points.SetData(vtk.numpy_to_vtk(np.ascontiguousarray(V, dtype=np.float64), deep=True))
+
+        n_tri = F.shape[0]
+        conn = np.ascontiguousarray(F, dtype=vtk.VTK_ID_DTYPE).ravel()
+        polys = vtk.vtkCellArray()
+        if hasattr(polys, "SetData"):
+            # VTK >= 9: offsets/connectivity layout
+            offsets = np.arange(0, 3 * n_tri + 1, 3, dtype=vtk.VTK_ID_DTYPE)
+            polys.SetData(vtk.numpy_to_vtkIdTypeArray(offsets, deep=True), vtk.numpy_to_vtkIdTypeArray(conn, deep=True))
+        else:
+            # Older VTK: legacy [n, p0, p1, p2, ...] layout
+            legacy = np.empty((n_tri, 4), dtype=vtk.VTK_ID_DTYPE)
+            legacy[:, 0] = 3
+            legacy[:, 1:] = F
+            polys.SetCells(n_tri, vtk.numpy_to_vtkIdTypeArray(legacy.ravel(), deep=True))
+
+        polydata = vtk.vtkPolyData()
         polydata.SetPoints(points)
         polydata.SetPolys(polys)
 
-        mapper = vtkPolyDataMapper()
+        mapper = vtk.vtkPolyDataMapper()
         mapper.SetInputData(polydata)
 
-        actor = vtkActor()
+        actor = vtk.vtkActor()
         actor.SetMapper(mapper)
         prop = actor.GetProperty()
         prop.SetColor(0.45, 0.64, 0.85)  # steelblue-ish
@@ -1612,148 +1735,207 @@ class FuselageLabApp(tk.Tk):
             'x': x, 'Re_x': Re_x, 'Cf_local': Cf_local, 'tau_w': tau_w, 'Df_cum': Df_cum
         }
 
-    def _clear_ax2d(self):
-        self.ax2d.clear()
-        self.ax2d.grid(True, alpha=0.3)
+    def _distributions(self, payload: dict, cfg: dict):
+        """_compute_distributions cached per (payload, op, cf_model): switching plots reuses them."""
+        key = (id(payload), json.dumps(cfg.get("op", {}), sort_keys=True),
+               json.dumps(cfg.get("cf_model", {}), sort_keys=True))
+        with self._cache_lock:
+            hit = self._dist_cache.get(key)
+            if hit is not None and hit[0] is payload:  # same object, not a recycled id
+                self._dist_cache.move_to_end(key)
+                return hit[1]
+        dat = self._compute_distributions(payload, cfg)
+        with self._cache_lock:
+            self._dist_cache[key] = (payload, dat)
+            while len(self._dist_cache) > 8:
+                self._dist_cache.popitem(last=False)
+        return dat
+
+    def _render_2d(self, choice: str, draw):
+        """
+        Rasterize draw(ax) on the worker with Agg and blit the image on the Tk thread.
+
+        Finished images are cached per (plot, payload, cfg, size); a newer plot request
+        supersedes one still rendering.
+        """
+        self._ensure_2d_canvas()
+        self.view_frame.configure(text=choice)
+        self._plot2d_current = (choice, draw)
+        payload = getattr(self, "_last_payload", None)
+        cfg = getattr(self, "_last_cfg", None)
+        w = self._plot2d_label.winfo_width()
+        h = self._plot2d_label.winfo_height()
+        if w < 50 or h < 50:  # not laid out yet: use the viewer frame
+            w, h = self.view_frame.winfo_width() - 8, self.view_frame.winfo_height() - 24
+        key = (choice, id(payload), id(cfg))
+        with self._cache_lock:
+            if self._plot2d_size != (w, h):  # resized: every cached image is the wrong size
+                self._plot2d_cache.clear()
+                self._plot2d_size = (w, h)
+            hit = self._plot2d_cache.get(key)
+        if hit is not None and hit[0] is payload and hit[1] is cfg:
+            self._plot2d_cache.move_to_end(key)
+            self._show_2d_image(hit[2])
+            return
+
+        style = self._plot2d_style
+
+        def done(ppm):
+            with self._cache_lock:
+                if self._plot2d_size == (w, h):
+                    self._plot2d_cache[key] = (payload, cfg, ppm)
+                    while len(self._plot2d_cache) > PLOT2D_CACHE_SIZE:
+                        self._plot2d_cache.popitem(last=False)
+            self._show_2d_image(ppm)
+
+        self.executor.submit(
+            "plot2d", lambda token, progress: render_ppm(draw, w, h, style=style),
+            on_done=done, on_error=lambda exc, err: self._log(f"Render plot failed: {exc}\n"),
+        )
+
+    def _show_2d_image(self, ppm: str):
+        img = tk.PhotoImage(data=ppm, format="PPM")
+        self._plot2d_label.configure(image=img)
+        self._plot2d_label.image = img  # keep a reference
+
+    def _on_plot2d_resized(self, _event=None):
+        if self._plot2d_current is None:
+            return
+        if self._plot2d_after is not None:
+            self.after_cancel(self._plot2d_after)
+        self._plot2d_after = self.after(150, self._rerender_2d)
+
+    def _rerender_2d(self):
+        self._plot2d_after = None
+        if self._plot2d_current is not None and self._mpl2d_container.winfo_ismapped():
+            self._render_2d(*self._plot2d_current)
 
     def _render_plot_rex(self, payload: dict, cfg: dict):
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Re_x vs x")
-        dat = self._compute_distributions(payload, cfg)
-        self._clear_ax2d()
-        self.ax2d.plot(dat['x'], dat['Re_x'], lw=1.6)
-        self.ax2d.set_xlabel('x [m]'); self.ax2d.set_ylabel('Re_x')
-        self.ax2d.set_title('Local Reynolds number Re_x(x)')
-        self.canvas2d.draw()
+        def draw(ax):
+            dat = self._distributions(payload, cfg)
+            ax.plot(dat['x'], dat['Re_x'], lw=1.6)
+            ax.set_xlabel('x [m]'); ax.set_ylabel('Re_x')
+            ax.set_title('Local Reynolds number Re_x(x)')
+        self._render_2d("Re_x vs x", draw)
 
     def _render_plot_cflocal(self, payload: dict, cfg: dict):
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Cf_local vs x")
-        dat = self._compute_distributions(payload, cfg)
-        self._clear_ax2d()
-        self.ax2d.plot(dat['x'], dat['Cf_local'], lw=1.6)
-        self.ax2d.set_xlabel('x [m]'); self.ax2d.set_ylabel('Cf_local [-]')
-        self.ax2d.set_title('Local skin-friction coefficient Cf(x) (approx.)')
-        self.canvas2d.draw()
+        def draw(ax):
+            dat = self._distributions(payload, cfg)
+            ax.plot(dat['x'], dat['Cf_local'], lw=1.6)
+            ax.set_xlabel('x [m]'); ax.set_ylabel('Cf_local [-]')
+            ax.set_title('Local skin-friction coefficient Cf(x) (approx.)')
+        self._render_2d("Cf_local vs x", draw)
 
     def _render_plot_tau(self, payload: dict, cfg: dict):
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="tau_w vs x")
-        dat = self._compute_distributions(payload, cfg)
-        self._clear_ax2d()
-        self.ax2d.plot(dat['x'], dat['tau_w'], lw=1.6)
-        self.ax2d.set_xlabel('x [m]'); self.ax2d.set_ylabel('tau_w [Pa]')
-        self.ax2d.set_title('Wall shear stress τ_w(x) (approx.)')
-        self.canvas2d.draw()
+        def draw(ax):
+            dat = self._distributions(payload, cfg)
+            ax.plot(dat['x'], dat['tau_w'], lw=1.6)
+            ax.set_xlabel('x [m]'); ax.set_ylabel('tau_w [Pa]')
+            ax.set_title('Wall shear stress τ_w(x) (approx.)')
+        self._render_2d("tau_w vs x", draw)
 
     def _render_plot_df_cum(self, payload: dict, cfg: dict):
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Cumulative friction drag")
-        dat = self._compute_distributions(payload, cfg)
-        self._clear_ax2d()
-        self.ax2d.plot(dat['x'], dat['Df_cum'], lw=1.6)
-        self.ax2d.set_xlabel('x [m]'); self.ax2d.set_ylabel('∫ τ_w dS [N]')
-        self.ax2d.set_title('Cumulative friction drag vs x (approx.)')
-        self.canvas2d.draw()
+        def draw(ax):
+            dat = self._distributions(payload, cfg)
+            ax.plot(dat['x'], dat['Df_cum'], lw=1.6)
+            ax.set_xlabel('x [m]'); ax.set_ylabel('∫ τ_w dS [N]')
+            ax.set_title('Cumulative friction drag vs x (approx.)')
+        self._render_2d("Cumulative friction drag", draw)
 
     def _render_sweep_ld(self, cfg: dict):
         from src.calcs import aero_from_geometry
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Sweep: CD_total vs l/d")
-        d = float(cfg['geom']['d']); op = cfg['op']; cf_model = cfg['cf_model']
-        ld_grid = np.linspace(1.5, 12.0, 60)
-        CDs = []
-        for ld in ld_grid:
-            l = ld * d
-            geom_tmp = {'l': l, 'd': d}
-            aero = aero_from_geometry(geom_tmp, op, cf_model)
-            CDs.append(aero['CD_total'])
-        CDs = np.asarray(CDs)
-        self._clear_ax2d()
-        self.ax2d.plot(ld_grid, CDs, lw=1.8)
-        self.ax2d.set_xlabel('l/d'); self.ax2d.set_ylabel('C_D total [-]')
-        self.ax2d.set_title('C_D vs thinness ratio (with base drag)')
-        self.canvas2d.draw()
+
+        def draw(ax):
+            d = float(cfg['geom']['d']); op = cfg['op']; cf_model = cfg['cf_model']
+            ld_grid = np.linspace(1.5, 12.0, 60)
+            CDs = []
+            for ld in ld_grid:
+                l = ld * d
+                geom_tmp = {'l': l, 'd': d}
+                aero = aero_from_geometry(geom_tmp, op, cf_model)
+                CDs.append(aero['CD_total'])
+            CDs = np.asarray(CDs)
+            ax.plot(ld_grid, CDs, lw=1.8)
+            ax.set_xlabel('l/d'); ax.set_ylabel('C_D total [-]')
+            ax.set_title('C_D vs thinness ratio (with base drag)')
+        self._render_2d("Sweep: CD_total vs l/d", draw)
 
     def _render_sweep_base_ratio(self, cfg: dict):
         from src.calcs import aero_from_geometry
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Sweep: CD_total vs base_ratio")
-        geom = cfg['geom']; op = dict(cfg['op']); cf_model = cfg['cf_model']
-        br_grid = np.linspace(0.0, 0.8, 41)
-        CDs = []
-        for br in br_grid:
-            op_tmp = dict(op); op_tmp['base_ratio'] = br
-            aero = aero_from_geometry(geom, op_tmp, cf_model)
-            CDs.append(aero['CD_total'])
-        CDs = np.asarray(CDs)
-        self._clear_ax2d()
-        self.ax2d.plot(br_grid, CDs, lw=1.8)
-        self.ax2d.set_xlabel('base_ratio'); self.ax2d.set_ylabel('C_D total [-]')
-        self.ax2d.set_title('C_D vs base_ratio (flat base penalty)')
-        self.canvas2d.draw()
+
+        def draw(ax):
+            geom = cfg['geom']; op = dict(cfg['op']); cf_model = cfg['cf_model']
+            br_grid = np.linspace(0.0, 0.8, 41)
+            CDs = []
+            for br in br_grid:
+                op_tmp = dict(op); op_tmp['base_ratio'] = br
+                aero = aero_from_geometry(geom, op_tmp, cf_model)
+                CDs.append(aero['CD_total'])
+            CDs = np.asarray(CDs)
+            ax.plot(br_grid, CDs, lw=1.8)
+            ax.set_xlabel('base_ratio'); ax.set_ylabel('C_D total [-]')
+            ax.set_title('C_D vs base_ratio (flat base penalty)')
+        self._render_2d("Sweep: CD_total vs base_ratio", draw)
 
     def _render_sweep_V(self, cfg: dict):
         from src.calcs import aero_from_geometry
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Sweep: CD_total vs V")
-        geom = cfg['geom']; op = dict(cfg['op']); cf_model = cfg['cf_model']
-        V0 = float(op['V']); V_grid = np.linspace(max(0.1, 0.25*V0), 2.5*V0, 60)
-        CDs = []
-        for V in V_grid:
-            op_tmp = dict(op); op_tmp['V'] = float(V)
-            aero = aero_from_geometry(geom, op_tmp, cf_model)
-            CDs.append(aero['CD_total'])
-        CDs = np.asarray(CDs)
-        self._clear_ax2d()
-        self.ax2d.plot(V_grid, CDs, lw=1.8)
-        self.ax2d.set_xlabel('V [m/s]'); self.ax2d.set_ylabel('C_D total [-]')
-        self.ax2d.set_title('C_D vs speed V (Re effects)')
-        self.canvas2d.draw()
+
+        def draw(ax):
+            geom = cfg['geom']; op = dict(cfg['op']); cf_model = cfg['cf_model']
+            V0 = float(op['V']); V_grid = np.linspace(max(0.1, 0.25*V0), 2.5*V0, 60)
+            CDs = []
+            for V in V_grid:
+                op_tmp = dict(op); op_tmp['V'] = float(V)
+                aero = aero_from_geometry(geom, op_tmp, cf_model)
+                CDs.append(aero['CD_total'])
+            CDs = np.asarray(CDs)
+            ax.plot(V_grid, CDs, lw=1.8)
+            ax.set_xlabel('V [m/s]'); ax.set_ylabel('C_D total [-]')
+            ax.set_title('C_D vs speed V (Re effects)')
+        self._render_2d("Sweep: CD_total vs V", draw)
 
     def _render_sweep_k3d(self, cfg: dict):
         from src.calcs import aero_from_geometry
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Sweep: CD_total vs 3D correction")
-        geom = cfg['geom']; op = cfg['op']; cf_model = dict(cfg['cf_model'])
-        k0 = float(cf_model['threeD_correction']); k_grid = np.linspace(0.8*k0, 1.3*k0, 41)
-        CDs = []
-        for k in k_grid:
-            cfm = dict(cf_model); cfm['threeD_correction'] = float(k)
-            aero = aero_from_geometry(geom, op, cfm)
-            CDs.append(aero['CD_total'])
-        CDs = np.asarray(CDs)
-        self._clear_ax2d()
-        self.ax2d.plot(k_grid, CDs, lw=1.8)
-        self.ax2d.set_xlabel('threeD_correction'); self.ax2d.set_ylabel('C_D total [-]')
-        self.ax2d.set_title('C_D vs 3D correction factor')
-        self.canvas2d.draw()
 
-    def _render_overlay_modes(self, cfg: dict):
-        from src.calcs import aero_from_geometry
-        self._ensure_2d_canvas()
-        self.view_frame.configure(text="Overlay: CD_total vs l/d (modes)")
-        d = float(cfg['geom']['d']); op = cfg['op']; cf_model = cfg['cf_model']
-        ld_grid = np.linspace(1.5, 12.0, 60)
-        modes = ['laminar', 'transition', 'turbulent']
-        self._clear_ax2d()
-        for m in modes:
+        def draw(ax):
+            geom = cfg['geom']; op = cfg['op']; cf_model = dict(cfg['cf_model'])
+            k0 = float(cf_model['threeD_correction']); k_grid = np.linspace(0.8*k0, 1.3*k0, 41)
             CDs = []
-            cfm = dict(cf_model); cfm['mode'] = m
-            for ld in ld_grid:
-                l = ld * d
-                geom_tmp = {'l': l, 'd': d}
-                aero = aero_from_geometry(geom_tmp, op, cfm)
+            for k in k_grid:
+                cfm = dict(cf_model); cfm['threeD_correction'] = float(k)
+                aero = aero_from_geometry(geom, op, cfm)
                 CDs.append(aero['CD_total'])
-            self.ax2d.plot(ld_grid, np.asarray(CDs), lw=1.6, label=m)
-        self.ax2d.set_xlabel('l/d'); self.ax2d.set_ylabel('C_D total [-]')
-        self.ax2d.set_title('C_D vs l/d for laminar/transition/turbulent')
-        self.ax2d.legend()
-        self.canvas2d.draw()
+            CDs = np.asarray(CDs)
+            ax.plot(k_grid, CDs, lw=1.8)
+            ax.set_xlabel('threeD_correction'); ax.set_ylabel('C_D total [-]')
+            ax.set_title('C_D vs 3D correction factor')
+        self._render_2d("Sweep: CD_total vs 3D correction", draw)
+
+    def _render_overlay_modes(self, cfg: dict):
+        from src.calcs import aero_from_geometry
+
+        def draw(ax):
+            d = float(cfg['geom']['d']); op = cfg['op']; cf_model = cfg['cf_model']
+            ld_grid = np.linspace(1.5, 12.0, 60)
+            modes = ['laminar', 'transition', 'turbulent']
+            for m in modes:
+                CDs = []
+                cfm = dict(cf_model); cfm['mode'] = m
+                for ld in ld_grid:
+                    l = ld * d
+                    geom_tmp = {'l': l, 'd': d}
+                    aero = aero_from_geometry(geom_tmp, op, cfm)
+                    CDs.append(aero['CD_total'])
+                ax.plot(ld_grid, np.asarray(CDs), lw=1.6, label=m)
+            ax.set_xlabel('l/d'); ax.set_ylabel('C_D total [-]')
+            ax.set_title('C_D vs l/d for laminar/transition/turbulent')
+            ax.legend()
+        self._render_2d("Overlay: CD_total vs l/d (modes)", draw)
 
 
 def main():
-    app = FuselageLabApp()
+    with TIMER.timed("FuselageLabApp()"):
+        app = FuselageLabApp()
     app.mainloop()
 
 
@@ -1 +1,10 @@
-from . import calcs, build, plots
+import importlib
+
+from . import calcs, build
+
+
+def __getattr__(name):
+    # plots pulls in matplotlib.pyplot (~0.5 s): imported on first use of src.plots only
+    if name == "plots":
+        return importlib.import_module(".plots", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
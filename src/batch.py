@@ -0,0 +1,340 @@
+# src/batch.py
+# Struct-of-arrays container for sweeps: every input and every output is one column array,
+# and the builder / integrals / aero / mass stages run on whole columns at once.
+from __future__ import annotations
+import copy
+import numpy as np
+
+from .records import Results
+
+MODES = ("laminar", "transition", "turbulent")
+
+# column -> (config section, key, dtype)
+INPUT_SPEC = {
+    "l": ("geom", "l", np.float64),
+    "d": ("geom", "d", np.float64),
+    "base_ratio": ("geom", "base_ratio", np.float64),
+    "V": ("op", "V", np.float64),
+    "rho": ("op", "rho", np.float64),
+    "nu": ("op", "nu", np.float64),
+    "cf_mode": ("cf_model", "mode", np.int8),          # index into MODES
+    "k_transition": ("cf_model", "k_transition", np.float64),
+    "threeD_correction": ("cf_model", "threeD_correction", np.float64),
+    "Ln_frac": ("builder", "Ln_frac", np.float64),
+    "C_haack": ("builder", "C_haack", np.float64),
+    "Nn": ("builder", "Nn", np.int64),
+    "Lt_frac": ("builder", "Lt_frac", np.float64),
+    "r_tip": ("builder", "r_tip", np.float64),
+    "enforce_tail_angle": ("builder", "enforce_tail_angle", np.bool_),
+    "alpha_max_deg": ("builder", "alpha_max_deg", np.float64),
+    "Nt": ("builder", "Nt", np.int64),
+    "use_surface_density": ("mass", "use_surface_density", np.bool_),
+    "sigma_surface": ("mass", "sigma_surface", np.float64),
+    "rho_material": ("mass", "rho_material", np.float64),
+    "t_skin": ("mass", "t_skin", np.float64),
+    "include_base_disk_area": ("mass", "include_base_disk_area", np.bool_),
+    "g": ("mass", "g", np.float64),
+}
+OUTPUTS = Results.KEYS
+_N_CYL = 60  # stations of the cylindrical section (as build.build_fuselage)
+
+
+def _column(values, dtype) -> np.ndarray:
+    if dtype is np.int8:
+        values = [MODES.index(v) if isinstance(v, str) else v for v in np.atleast_1d(values)]
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+class DesignBatch:
+    """
+    N design cases as columns.
+
+    batch.inputs[name] / batch.outputs[name] are 1D arrays of length N (names in
+    INPUT_SPEC / Results.KEYS; note inputs["V"] is the speed, outputs["V"] the volume).
+    `base` is the configuration the columns override (io, plots and any non-swept key).
+    Slicing (batch[10:20]) returns views; masks and index arrays return copies.
+    """
+    __slots__ = ("inputs", "outputs", "base")
+
+    def __init__(self, inputs: dict, outputs: dict | None = None, base: dict | None = None):
+        n = {len(v) for v in inputs.values()} | {len(v) for v in (outputs or {}).values()}
+        if len(n) > 1:
+            raise ValueError("DesignBatch: all columns must have the same length")
+        missing = set(INPUT_SPEC) - set(inputs)
+        if missing:
+            raise ValueError(f"DesignBatch: missing input columns {sorted(missing)}")
+        self.inputs = inputs
+        self.outputs = outputs if outputs is not None else {}
+        self.base = base
+
+    # --- construction ---
+
+    @classmethod
+    def from_configs(cls, cfgs: list) -> "DesignBatch":
+        """One row per (validated) configuration dict."""
+        inputs = {name: _column([c[sec][key] for c in cfgs], dt) for name, (sec, key, dt) in INPUT_SPEC.items()}
+        return cls(inputs, base=copy.deepcopy(cfgs[0]) if cfgs else None)
+
+    @classmethod
+    def from_grid(cls, base_cfg: dict, axes: dict) -> "DesignBatch":
+        """
+        Cartesian sweep around base_cfg. axes maps input columns (or "section.key")
+        to value lists: {"V": np.linspace(5, 30, 26), "geom.l": [8, 10, 12]}.
+        """
+        names = [cls._column_name(k) for k in axes]
+        values = [np.atleast_1d(np.asarray(v)) for v in axes.values()]
+        shape = tuple(len(v) for v in values)
+        n = int(np.prod(shape)) if shape else 1
+        inputs = {}
+        for name, (sec, key, dt) in INPUT_SPEC.items():
+            inputs[name] = np.full(n, _column([base_cfg[sec][key]], dt)[0], dtype=dt)
+        grids = np.meshgrid(*[np.arange(len(v)) for v in values], indexing="ij") if values else []
+        for name, v, g in zip(names, values, grids):
+            inputs[name] = _column(v, INPUT_SPEC[name][2])[g.ravel()]
+        return cls(inputs, base=copy.deepcopy(base_cfg))
+
+    @staticmethod
+    def _column_name(key: str) -> str:
+        if key in INPUT_SPEC:
+            return key
+        for name, (sec, k, _) in INPUT_SPEC.items():
+            if key == f"{sec}.{k}":
+                return name
+        raise ValueError(f"DesignBatch: '{key}' is not a sweepable input")
+
+    @staticmethod
+    def concat(batches: list) -> "DesignBatch":
+        """Rows of all batches (same columns) in order; base config of the first."""
+        inputs = {k: np.concatenate([b.inputs[k] for b in batches]) for k in INPUT_SPEC}
+        out_keys = set.intersection(*(set(b.outputs) for b in batches)) if batches else set()
+        outputs = {k: np.concatenate([b.outputs[k] for b in batches]) for k in OUTPUTS if k in out_keys}
+        return DesignBatch(inputs, outputs, batches[0].base if batches else None)
+
+    # --- access ---
+
+    def __len__(self) -> int:
+        return len(next(iter(self.inputs.values())))
+
+    def __getitem__(self, sel) -> "DesignBatch":
+        if isinstance(sel, str):
+            raise TypeError("DesignBatch: use batch.inputs[name] or batch.outputs[name] for columns")
+        if isinstance(sel, (int, np.integer)):
+            sel = slice(sel, sel + 1 if sel != -1 else None)
+        return DesignBatch({k: v[sel] for k, v in self.inputs.items()},
+                           {k: v[sel] for k, v in self.outputs.items()}, self.base)
+
+    def filter(self, mask) -> "DesignBatch":
+        """Rows where the boolean mask (e.g. batch.outputs["V"] > 0.02) is True."""
+        return self[np.asarray(mask, dtype=bool)]
+
+    def mode_names(self) -> np.ndarray:
+        return np.asarray(MODES)[self.inputs["cf_mode"]]
+
+    def config(self, i: int) -> dict:
+        """Full configuration dict of row i (base config with this row's inputs)."""
+        cfg = copy.deepcopy(self.base) if self.base is not None else {s: {} for s, _, _ in INPUT_SPEC.values()}
+        for name, (sec, key, _) in INPUT_SPEC.items():
+            v = self.inputs[name][i]
+            cfg[sec][key] = MODES[int(v)] if name == "cf_mode" else v.item()
+        if "op" in cfg:
+            cfg["op"]["base_ratio"] = cfg["geom"]["base_ratio"]
+        return cfg
+
+    def as_payload(self, dtype=None) -> dict:
+        """
+        {"n", "config", "inputs": {...}, "outputs": {...}} for save_results_compact. The column
+        arrays are handed over as they are (no copy); dtype=np.float32 casts the float columns.
+        """
+        def cast(cols):
+            if dtype is None:
+                return dict(cols)
+            return {k: (v.astype(dtype, copy=False) if v.dtype.kind == "f" else v) for k, v in cols.items()}
+        return {"n": len(self), "config": self.base or {}, "inputs": cast(self.inputs), "outputs": cast(self.outputs)}
+
+    def validate(self) -> None:
+        """Vectorised version of configio._validate for the swept columns."""
+        c = self.inputs
+        checks = (
+            (c["l"] > 0, "l debe ser > 0"), (c["d"] > 0, "d debe ser > 0"),
+            (c["base_ratio"] >= 0, "base_ratio debe ser ≥ 0"),
+            (c["V"] > 0, "V debe ser > 0"), (c["rho"] > 0, "rho debe ser > 0"), (c["nu"] > 0, "nu debe ser > 0"),
+            ((c["cf_mode"] >= 0) & (c["cf_mode"] < len(MODES)), "cf_mode fuera de rango"),
+            (c["threeD_correction"] > 0, "threeD_correction debe ser > 0"),
+            ((c["Ln_frac"] > 0) & (c["Ln_frac"] < 1), "Ln_frac en (0,1)"),
+            ((c["Lt_frac"] > 0) & (c["Lt_frac"] < 1), "Lt_frac en (0,1)"),
+            ((c["Nn"] >= 10) & (c["Nt"] >= 10), "Nn/Nt deben ser ≥ 10"),
+            (c["alpha_max_deg"] > 0, "alpha_max_deg debe ser > 0"),
+            (c["g"] > 0, "g debe ser > 0"),
+        )
+        for ok, msg in checks:
+            if not np.all(ok):
+                bad = int(np.flatnonzero(~ok)[0])
+                raise ValueError(f"DesignBatch: fila {bad}: {msg}")
+
+
+# --- Batched stages (same formulas as build.py / calcs.py, one column at a time) ---
+
+def build_profiles(batch: DesignBatch) -> list:
+    """
+    Batched build_fuselage. Returns [(rows, X, Y), ...]: rows indexes the batch and
+    X, Y are (len(rows), M) profiles; rows sharing a station count share one group.
+    """
+    c = batch.inputs
+    l = c["l"]; R = c["d"] / 2.0
+    Ln = c["Ln_frac"] * l
+    Lt = c["Lt_frac"] * l
+    r_tip = c["r_tip"]
+    tan_a = np.tan(np.radians(c["alpha_max_deg"]))
+    with np.errstate(divide="ignore"):
+        Lt_min = np.where(tan_a > 0, 0.5 * np.pi * (R - r_tip) / tan_a, np.inf)
+    Lt = np.where(c["enforce_tail_angle"] & (Lt < Lt_min), Lt_min, Lt)
+    Lc = np.maximum(0.0, l - Ln - Lt)
+    has_cyl = Lc > 0
+
+    # Junction duplicates are dropped exactly as build.concat_no_duplicate does, so the
+    # end-of-nose value is needed per row before grouping.
+    th_end = np.pi
+    y_nose_end = (R / np.sqrt(np.pi)) * np.sqrt(th_end - 0.5 * np.sin(2 * th_end) + c["C_haack"] * (np.sin(th_end) ** 3))
+    x_nose_end = 0.5 * Ln * (1 - np.cos(th_end))
+    drop_nc = (x_nose_end == Ln) & (y_nose_end == R)        # cylinder start (Ln, R)
+    # Profile end before the tail: cylinder end, or the nose end if the 1-point "cylinder" was dropped
+    nose_is_end = ~has_cyl & drop_nc
+    x_end = np.where(nose_is_end, x_nose_end, Ln + Lc)
+    y_end = np.where(nose_is_end, y_nose_end, R)
+    x_tail0 = (Ln + Lc) + 0.0 * Lt
+    y_tail0 = r_tip + (R - r_tip) * 0.5 * (1.0 + np.cos(0.0))
+    drop_ct = (x_end == x_tail0) & (y_end == y_tail0)
+
+    groups = []
+    key = np.stack([c["Nn"], c["Nt"], has_cyl, drop_nc, drop_ct], axis=1)
+    uniq, inv = np.unique(key, axis=0, return_inverse=True)
+    for g, (Nn, Nt, cyl, dnc, dct) in enumerate(uniq):
+        rows = np.flatnonzero(inv.ravel() == g)
+        Ln_g = Ln[rows][:, None]; R_g = R[rows][:, None]; Lc_g = Lc[rows][:, None]
+        Lt_g = Lt[rows][:, None]; rt_g = r_tip[rows][:, None]
+
+        theta = np.linspace(0.0, np.pi, int(Nn))
+        x_n = 0.5 * Ln_g * (1 - np.cos(theta))
+        y_n = (R_g / np.sqrt(np.pi)) * np.sqrt(theta - 0.5 * np.sin(2 * theta) + c["C_haack"][rows][:, None] * (np.sin(theta) ** 3))
+        y_n[:, 0] = 0.0
+        if cyl:
+            x_c = np.linspace(Ln_g[:, 0], (Ln_g + Lc_g)[:, 0], _N_CYL, axis=1)
+            y_c = np.broadcast_to(R_g, x_c.shape)
+        else:
+            x_c = Ln_g; y_c = R_g
+        s = np.linspace(0.0, 1.0, int(Nt))
+        x_t = (Ln_g + Lc_g) + s * Lt_g
+        y_t = rt_g + (R_g - rt_g) * 0.5 * (1.0 + np.cos(np.pi * s))
+
+        X = np.concatenate([x_n, x_c[:, 1:] if dnc else x_c, x_t[:, 1:] if dct else x_t], axis=1)
+        Y = np.concatenate([y_n, y_c[:, 1:] if dnc else y_c, y_t[:, 1:] if dct else y_t], axis=1)
+        groups.append((rows, X, Y))
+    return groups
+
+
+def _gradient_rows(F: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """np.gradient(F[i], X[i]) for every row (second order inside, first order at the ends)."""
+    dx = np.diff(X, axis=1)
+    out = np.empty_like(F)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx1 = dx[:, :-1]; dx2 = dx[:, 1:]
+        a = -(dx2) / (dx1 * (dx1 + dx2))
+        b = (dx2 - dx1) / (dx1 * dx2)
+        cc = dx1 / (dx2 * (dx1 + dx2))
+        out[:, 1:-1] = a * F[:, :-2] + b * F[:, 1:-1] + cc * F[:, 2:]
+        out[:, 0] = (F[:, 1] - F[:, 0]) / dx[:, 0]
+        out[:, -1] = (F[:, -1] - F[:, -2]) / dx[:, -1]
+    return out
+
+
+def integrals_batch(batch: DesignBatch, groups: list) -> DesignBatch:
+    """Batched calcs.geom_integrals: fills S_lateral, S_total, V, x_cg_surface, x_cg_volume."""
+    n = len(batch)
+    out = {k: np.empty(n) for k in Results.SECTIONS["integrals"]}
+    inc = batch.inputs["include_base_disk_area"]
+    for rows, X, Y in groups:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ds = np.sqrt(1.0 + _gradient_rows(Y, X) ** 2)
+            A = np.pi * Y * Y
+            S_lat = 2.0 * np.pi * np.trapezoid(Y * ds, X, axis=1)
+            A_base = A[:, -1]
+            S_tot = S_lat + np.where(inc[rows], A_base, 0.0)
+            Vol = np.trapezoid(A, X, axis=1)
+            xS = 2.0 * np.pi * np.trapezoid(X * Y * ds, X, axis=1) + np.where(inc[rows], A_base * X[:, -1], 0.0)
+            xV = np.trapezoid(X * A, X, axis=1)
+            out["S_lateral"][rows] = S_lat
+            out["S_total"][rows] = S_tot
+            out["V"][rows] = Vol
+            out["x_cg_surface"][rows] = np.where(S_tot > 0, xS / S_tot, np.nan)
+            out["x_cg_volume"][rows] = np.where(Vol > 0, xV / Vol, np.nan)
+    batch.outputs.update(out)
+    return batch
+
+
+def aero_batch(batch: DesignBatch) -> DesignBatch:
+    """Batched calcs.aero_from_geometry: fills the aero columns."""
+    c = batch.inputs
+    l = c["l"]; d = c["d"]; V = c["V"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ReL = V * l / c["nu"]
+        pos = ReL > 0
+        turb = np.maximum(0.455 / (np.log10(ReL) ** 2.58) - 1700.0 / ReL, 0.0)
+        trans = np.maximum(turb - c["k_transition"] / np.sqrt(ReL), 0.0)
+        lam = 1.328 / np.sqrt(ReL)
+    Cf = np.choose(c["cf_mode"], (lam, trans, turb))
+    Cf = np.where(pos, Cf, np.nan)
+    Cf_eff = Cf * c["threeD_correction"]
+    l_over_d = l / d
+    d_over_l = 1.0 / l_over_d
+    F = 3.0 * l_over_d + 4.5 * np.sqrt(d_over_l) + 21.0 * (d_over_l ** 2)
+    CD_clean = Cf_eff * F
+    br = c["base_ratio"]
+    CD_base = np.where(br > 0, 0.029 * (br ** 2), 0.0)
+    CD_total = CD_clean + CD_base
+    S_f = 0.25 * np.pi * d ** 2
+    S_w = 0.75 * np.pi * d * l
+    q = 0.5 * c["rho"] * V * V
+    batch.outputs.update({
+        "ReL": ReL, "Cf": Cf, "Cf_eff": Cf_eff, "F": F,
+        "CD_clean": CD_clean, "CD_base": CD_base, "CD_total": CD_total,
+        "S_f": S_f, "S_w": S_w, "q": q,
+        "D_clean": q * CD_clean * S_f, "D_base": q * CD_base * S_f, "D_total": q * CD_total * S_f,
+    })
+    return batch
+
+
+def mass_batch(batch: DesignBatch) -> DesignBatch:
+    """Batched calcs.mass_from_surface (needs S_total from integrals_batch)."""
+    c = batch.inputs
+    sigma = np.where(c["use_surface_density"], c["sigma_surface"], c["rho_material"] * c["t_skin"])
+    m_shell = sigma * batch.outputs["S_total"]
+    batch.outputs.update({"sigma": sigma, "m_shell": m_shell, "W_shell": m_shell * c["g"]})
+    return batch
+
+
+def evaluate_batch(batch: DesignBatch, chunk: int = 0, token=None, progress=None) -> DesignBatch:
+    """
+    Run every stage on the batch (in place) and return it.
+
+    chunk > 0 evaluates that many rows at a time: token.check() is called before each
+    chunk (it raises to abandon the sweep) and progress(done, total) after each one.
+    """
+    batch.validate()
+    n = len(batch)
+    step = chunk if chunk > 0 else max(n, 1)
+    parts = []
+    for start in range(0, n, step):
+        if token is not None:
+            token.check()
+        part = batch if step >= n else batch[start:start + step]
+        groups = build_profiles(part)
+        integrals_batch(part, groups)
+        aero_batch(part)
+        mass_batch(part)
+        parts.append(part.outputs)
+        if progress is not None:
+            progress(min(start + step, n), n)
+    if len(parts) > 1:
+        batch.outputs.update({k: np.concatenate([p[k] for p in parts]) for k in parts[0]})
+    return batch
+
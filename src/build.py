@@ -1,4 +1,5 @@
 import numpy as np
+from .records import Profile
 
 def haack_nose(Ln, R, C=0.0, N=200):
     """Perfil Haack (LD/LV) paramétrico con longitud Ln y radio R (y(Ln)=R)."""
@@ -47,7 +48,7 @@ def concat_no_duplicate(xs, ys, x_add, y_add):
     
 def build_fuselage(cfg_geom: dict, cfg_builder: dict):
     """
-    Devuelve un dict con {x, y, L, R, l, d, ld, ...} usando tus funciones existentes.
+    Devuelve un Profile (se lee como dict: {x, y, L, R, l, d, ld, ...}) usando tus funciones existentes.
     """
     l = float(cfg_geom["l"]); d = float(cfg_geom["d"]); R = d/2.0
     Ln_frac = cfg_builder["Ln_frac"]; Lt_frac = cfg_builder["Lt_frac"]
@@ -77,8 +78,5 @@ def build_fuselage(cfg_geom: dict, cfg_builder: dict):
     x_prof, y_prof = concat_no_duplicate(x_prof, y_prof, x_c, y_c)
     x_prof, y_prof = concat_no_duplicate(x_prof, y_prof, x_t, y_t)
 
-    return {
-        "x": x_prof, "y": y_prof,
-        "L": l, "R": R, "l": l, "d": d, "ld": l/d,
-        "Ln": Ln, "Lc": Lc, "Lt": Lt, "r_tip": r_tip
-    }
+    return Profile(x_prof, y_prof, L=l, R=R, l=l, d=d, ld=l/d,
+                   Ln=Ln, Lc=Lc, Lt=Lt, r_tip=r_tip)
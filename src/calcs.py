@@ -1,4 +1,5 @@
 import numpy as np
+from .records import Profile
 
 def cf_laminar(ReL: float) -> float:
     """Cf laminar promedio en placa: Cf ≈ 1.328 / sqrt(Re_L)."""
@@ -67,16 +68,18 @@ def aero_from_geometry(geom: dict, op: dict, cf_model: dict) -> dict:
     }
 
 def geom_integrals(geom: dict, include_base: bool) -> dict:
-    x = geom["x"]; y = geom["y"]
-    dydx = np.gradient(y, x)
-    S_lateral = 2.0*np.pi*np.trapezoid(y*np.sqrt(1.0 + dydx**2), x)
-    A_base = np.pi*(y[-1]**2)
+    # Profile guarda dy/dx, ds y A(x) ya calculados; un dict se convierte una vez
+    prof = Profile.from_mapping(geom)
+    x = np.asarray(prof.x, dtype=float); y = np.asarray(prof.y, dtype=float)
+    ds = prof.ds; A = prof.area
+    S_lateral = 2.0*np.pi*np.trapezoid(y*ds, x)
+    A_base = A[-1]
     S_total = S_lateral + (A_base if include_base else 0.0)
-    V_solid = np.pi*np.trapezoid(y**2, x)
-    xS_lateral = 2.0*np.pi*np.trapezoid(x*y*np.sqrt(1.0 + dydx**2), x)
+    V_solid = np.trapezoid(A, x)
+    xS_lateral = 2.0*np.pi*np.trapezoid(x*y*ds, x)
     x_tail = float(x[-1]); xS_total = xS_lateral + (A_base*x_tail if include_base else 0.0)
     x_cg_surface = xS_total / S_total if S_total>0 else np.nan
-    xV = np.pi*np.trapezoid(x*y**2, x)
+    xV = np.trapezoid(x*A, x)
     x_cg_volume = xV / V_solid if V_solid>0 else np.nan
     return {"S_lateral": S_lateral, "S_total": S_total, "V": V_solid,
             "x_cg_surface": x_cg_surface, "x_cg_volume": x_cg_volume}
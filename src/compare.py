@@ -0,0 +1,124 @@
+# src/compare.py
+# Multi-design comparison data: metrics come straight from the run index, profiles from the stored
+# results (compact ones memory-mapped), decimated once per result file and cached for every overlay.
+from __future__ import annotations
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+import numpy as np
+
+from .mesh import decimate_profile
+from .resultsio import RunResult, sidecar_path
+from .runindex import INPUT_COLUMNS, OUTPUT_COLUMNS, shared_index
+
+COMPARE_STATIONS = 200   # profile stations kept per design (shared by overlays and silhouettes)
+MAX_DESIGNS = 50
+FIELDS = ("l", "d", "V", "cf_mode") + tuple(c for c, _, _ in OUTPUT_COLUMNS)
+
+_PROFILE_CACHE: "OrderedDict[tuple, tuple | None]" = OrderedDict()
+_PROFILE_CACHE_SIZE = 256
+_PROFILE_LOCK = threading.Lock()
+
+
+class Design(NamedTuple):
+    """One compared design: index metrics plus its decimated (x, r) profile (None if not stored)."""
+    label: str      # "#<index id>" or the label given to an in-memory design
+    metrics: dict
+    x: np.ndarray | None
+    r: np.ndarray | None
+    source: str | None
+
+
+def compare_profile(x, r, stations: int = COMPARE_STATIONS) -> tuple:
+    """(x, r) decimated to at most stations points where the meridian bends; read-only float64."""
+    x = np.asarray(x, dtype=float)
+    r = np.asarray(r, dtype=float)
+    idx = decimate_profile(x, r, stations)
+    xs, rs = x[idx], r[idx]
+    xs.flags.writeable = False
+    rs.flags.writeable = False
+    return xs, rs
+
+
+def _read_profile(path: str):
+    if os.path.exists(sidecar_path(path)):
+        run = RunResult(path)
+        if "geom.x" not in run.array_keys:
+            return None  # sweep result: columns only, no profile
+        return run.array("geom.x"), run.array("geom.y")
+    with open(path, "r", encoding="utf-8") as f:
+        geom = json.load(f).get("geom", {})
+    if "x" not in geom or "y" not in geom:
+        return None
+    return geom["x"], geom["y"]
+
+
+def stored_profile(results_path: str, stations: int = COMPARE_STATIONS):
+    """Decimated profile of a stored result (JSON or compact), cached per file version; None if unavailable."""
+    path = os.path.abspath(results_path)
+    try:
+        key = (path, os.stat(path).st_mtime_ns, stations)
+    except OSError:
+        return None
+    with _PROFILE_LOCK:
+        if key in _PROFILE_CACHE:
+            _PROFILE_CACHE.move_to_end(key)
+            return _PROFILE_CACHE[key]
+    try:
+        raw = _read_profile(path)
+    except (ValueError, KeyError, OSError, json.JSONDecodeError):
+        raw = None
+    prof = None if raw is None else compare_profile(raw[0], raw[1], stations)
+    with _PROFILE_LOCK:
+        _PROFILE_CACHE[key] = prof
+        while len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+            _PROFILE_CACHE.popitem(last=False)
+    return prof
+
+
+def load_designs(index_path: str, order_by: str = "stamp", desc: bool = True, limit: int = 10,
+                 where=(), token=None) -> list:
+    """
+    Designs from the run index (single runs with a stored result), one per configuration.
+
+    Metrics are read from the index columns; only the profile comes from each results file
+    (memory-mapped for compact results) and it is decimated once and cached, so reloading a
+    comparison does not touch the files again. A row whose file was rewritten by a later run
+    gets no profile. token.check() runs between files.
+    """
+    limit = max(1, min(int(limit), MAX_DESIGNS))
+    where = tuple(where) + (("results_path", "NOT LIKE", "%sweep_compact.json"),)
+    idx = shared_index(index_path)
+    # A few extra rows so repeated runs of the same configuration can be skipped
+    rows = idx.query(*where, order_by=order_by, desc=desc, limit=4 * limit)
+    writers = idx.latest_ids(row["results_path"] for row in rows)
+    designs = []
+    seen = set()
+    for row in rows:
+        if row["cfg_hash"] in seen:
+            continue
+        seen.add(row["cfg_hash"])
+        if token is not None:
+            token.check()
+        metrics = {c: row[c] for c in FIELDS}
+        # Older indexes may hold several rows on one shared file (io.run_dirs off): only the
+        # newest of them still matches what is on disk
+        stored = writers.get(row["results_path"]) == row["id"]
+        prof = stored_profile(row["results_path"]) if stored else None
+        x, r = prof if prof is not None else (None, None)
+        designs.append(Design(f"#{row['id']}", metrics, x, r, row["results_path"]))
+        if len(designs) == limit:
+            break
+    return designs
+
+
+def design_from_payload(cfg: dict, payload, label: str = "current") -> Design:
+    """A design from an in-memory payload (e.g. the last run or live result), without touching disk."""
+    ins = {c: cfg[sec][key] for c, _, (sec, key) in INPUT_COLUMNS}
+    outs = {c: float(payload[sec][key]) for c, _, (sec, key) in OUTPUT_COLUMNS}
+    metrics = {c: (ins | outs)[c] for c in FIELDS}
+    geom = payload["geom"]
+    x, r = compare_profile(geom["x"], geom["y"])
+    return Design(label, metrics, x, r, None)
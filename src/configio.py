@@ -1,5 +1,6 @@
 # src/configio.py
 from __future__ import annotations
+import copy
 import json
 import os
 
@@ -39,11 +40,22 @@ _DEF = {
     },
     "io": {
         "export_csv": True,
-        "csv_path": "results/data/fuselaje_xy.csv"
+        "csv_path": "results/data/fuselaje_xy.csv",
+        "results_format": "json",      # "json" | "compact" | "both"
+        "run_dirs": True,              # cada ejecución en results/runs/run_<stamp>/ (+ results/runs/LATEST)
+        "storage_dtype": "float64",    # "float32": geometría/mallas guardadas y transportadas en float32
+        "run_index": "results/runs.sqlite"  # índice SQLite de ejecuciones ("" = desactivado)
     },
     "plots": {
         "make_plots": True,
         "dpi": 140
+    },
+    "retention": {                     # limpieza de results/runs (0 = sin límite)
+        "auto": False,                 # aplicar tras cada ejecución
+        "keep_last": 0,
+        "max_mb": 0.0,
+        "max_age_days": 0.0,
+        "pinned": []                   # nombres de carpetas de ejecución a conservar siempre
     }
 }
 
@@ -93,23 +105,45 @@ def _validate(cfg: dict) -> None:
             raise ValueError("rho_material y t_skin deben ser > 0")
     if cfg["mass"]["g"] <= 0: raise ValueError("g debe ser > 0")
 
+    # I/O
+    if cfg["io"]["results_format"] not in ("json", "compact", "both"):
+        raise ValueError("io.results_format debe ser 'json' | 'compact' | 'both'")
+    if cfg["io"]["storage_dtype"] not in ("float64", "float32"):
+        raise ValueError("io.storage_dtype debe ser 'float64' | 'float32'")
+    if not isinstance(cfg["io"]["run_index"], str):
+        raise ValueError("io.run_index debe ser una ruta (o \"\" para desactivar)")
+
     # Plots
     if cfg["plots"]["dpi"] < 50: raise ValueError("plots.dpi muy bajo (<50)")
 
-def _ensure_dirs(cfg: dict) -> None:
-    os.makedirs("results/data", exist_ok=True)
-    os.makedirs("results/figs", exist_ok=True)
-    # Normaliza csv_path a results/data si sólo dieron un nombre
+    # Retención
+    ret = cfg["retention"]
+    if ret["keep_last"] < 0 or ret["max_mb"] < 0 or ret["max_age_days"] < 0:
+        raise ValueError("retention.keep_last/max_mb/max_age_days deben ser ≥ 0")
+    if not isinstance(ret["pinned"], list):
+        raise ValueError("retention.pinned debe ser una lista de carpetas")
+
+def _normalize_paths(cfg: dict) -> None:
+    # Normaliza csv_path a results/data si sólo dieron un nombre. Los directorios de salida
+    # los crean los escritores al guardar (utils.atomic_write / make_run_dir), no la carga.
     csv_path = cfg["io"]["csv_path"]
     if not os.path.isabs(csv_path) and not csv_path.startswith("results/"):
         cfg["io"]["csv_path"] = os.path.join("results", "data", csv_path)
 
-def load_config(path: str = "config.json") -> dict:
-    with open(path, "r") as f:
-        cfg = json.load(f)
-    _deep_default(cfg, _DEF)
+def normalize_config(cfg: dict) -> dict:
+    """
+    Versión en memoria de load_config: copia cfg, rellena defaults y valida (ValueError).
+    No lee ni escribe disco; pensada para el dict de ConfigForm.get_config().
+    """
+    cfg = copy.deepcopy(cfg)
+    _deep_default(cfg, copy.deepcopy(_DEF))
     # Arrastra base_ratio (puede vivir en geom o op según tu historia)
     cfg["op"]["base_ratio"] = cfg["geom"].get("base_ratio", cfg["op"].get("base_ratio", 0.0))
     _validate(cfg)
-    _ensure_dirs(cfg)
+    _normalize_paths(cfg)
     return cfg
+
+def load_config(path: str = "config.json") -> dict:
+    with open(path, "r") as f:
+        cfg = json.load(f)
+    return normalize_config(cfg)
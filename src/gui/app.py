@@ -2,47 +2,64 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
-import threading
-import traceback
+import time
 import json
 
-from src.configio import load_config
-from src.pipeline import run_case
-from src.utils import export_fuselage_stl, stamp_name
+from src.configio import load_config, normalize_config
+from src.pipeline import evaluate_case, run_case, storage_dtype
+from src.utils import export_fuselage_mesh, export_fuselage_stl, stamp_name
+from src.gui.executor import TkExecutor
+from src.gui.startup import TIMER
 from src.gui.views.config_form import ConfigForm
 from src.gui.views.results_panel import ResultsPanel
-from src.gui.viewers.matplotlib_viewer import MatplotlibViewer
 
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
+LIVE_DEBOUNCE_MS = 150  # recompute this long after the last edit in live mode
+
 class App(ctk.CTk):
     def __init__(self):
-        super().__init__()
+        with TIMER.timed("Tk root window"):
+            super().__init__()
         
         self.title("FuselageLab")
         self.geometry("1600x900")
         
         # State
         self.config_path = os.path.abspath("config.json")
-        self.running = False
-        self.worker = None
+        # Runs, sweeps and exports share one worker; live recomputes have their own
+        self.executor = TkExecutor(self, interactive=("live",))
         self._last_payload = None
+        self._last_cfg = None  # configuration of _last_payload (for the Compare tab)
+        # Live mode: pending after() id, geometry on screen
+        self._live_after = None
+        self._shown_geom = None
         
-        self._build_ui()
-        self._load_config(self.config_path)
+        with TIMER.timed("build UI"):
+            self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        with TIMER.timed("load config"):
+            self._load_config(self.config_path)
+        TIMER.window_shown(self)
 
     def _build_ui(self):
         self.grid_columnconfigure(0, weight=3) # 3D View
         self.grid_columnconfigure(1, weight=1) # Sidebar
         self.grid_rowconfigure(0, weight=1)
         
-        # --- Left: 3D View ---
-        self.view_frame = ctk.CTkFrame(self, corner_radius=0)
+        # --- Left: 3D View / Sweeps / Compare ---
+        # All are Matplotlib-based and built on first use (first geometry / first visit of the tab)
+        self.view_frame = ctk.CTkTabview(self, corner_radius=0, command=self._on_view_tab_changed)
         self.view_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 2), pady=0)
-        
-        self.view3d = MatplotlibViewer(self.view_frame)
-        self.view3d.pack(fill="both", expand=True)
+        self.view_frame.add("3D View")
+        self.view_frame.add("Sweeps")
+        self.view_frame.add("Compare")
+        self.view3d = None
+        self.sweep_view = None
+        self.compare_view = None
+        self._view3d_hint = ctk.CTkLabel(self.view_frame.tab("3D View"), text="Run a case (or turn on Live update) to see the fuselage.", text_color="gray60")
+        self._view3d_hint.pack(fill="both", expand=True)
         
         # --- Right: Sidebar ---
         self.sidebar = ctk.CTkFrame(self, corner_radius=0)
@@ -60,6 +77,7 @@ class App(ctk.CTk):
         # 2. Config Form
         self.config_form = ConfigForm(self.sidebar)
         self.config_form.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
+        self.config_form.set_on_change(self._schedule_live)
         
         # 3. Results Panel
         self.results_panel = ResultsPanel(self.sidebar)
@@ -70,11 +88,44 @@ class App(ctk.CTk):
         self.actions_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=20)
         
         self.btn_run = ctk.CTkButton(self.actions_frame, text="RUN PIPELINE", command=self._on_run_clicked, height=40, font=ctk.CTkFont(size=14, weight="bold"), fg_color="green", hover_color="darkgreen")
-        self.btn_run.pack(fill="x", pady=(0, 10))
+        self.btn_run.pack(fill="x", pady=(0, 5))
+        self.btn_cancel = ctk.CTkButton(self.actions_frame, text="Cancel", command=self._on_cancel_clicked, state="disabled", fg_color="gray30", hover_color="gray20")
+        self.btn_cancel.pack(fill="x", pady=(0, 10))
+
+        self.live_var = tk.BooleanVar(value=False)
+        ctk.CTkSwitch(self.actions_frame, text="Live update", variable=self.live_var, command=self._on_live_toggled).pack(anchor="w", pady=(0, 5))
+        self.status_var = tk.StringVar(value="")
+        ctk.CTkLabel(self.actions_frame, textvariable=self.status_var, text_color="gray70", anchor="w", justify="left").pack(fill="x", pady=(0, 5))
         
-        ctk.CTkButton(self.actions_frame, text="Export STL", command=self._export_stl).pack(fill="x", pady=5)
+        ctk.CTkButton(self.actions_frame, text="Export Mesh", command=self._export_stl).pack(fill="x", pady=5)
         ctk.CTkButton(self.actions_frame, text="Open Results", command=self._open_results).pack(fill="x", pady=5)
 
+    def _show_geometry(self, geom):
+        if self.view3d is None:
+            with TIMER.timed("3D viewer (Matplotlib)"):
+                from src.gui.viewers.matplotlib_viewer import MatplotlibViewer
+                self._view3d_hint.destroy()
+                self.view3d = MatplotlibViewer(self.view_frame.tab("3D View"))
+                self.view3d.pack(fill="both", expand=True)
+        self.view3d.update_geometry(geom)
+        self._shown_geom = geom
+
+    def _on_view_tab_changed(self):
+        if self.view_frame.get() == "Sweeps" and self.sweep_view is None:
+            with TIMER.timed("Sweeps view"):
+                from src.gui.views.sweep_view import SweepView
+                self.sweep_view = SweepView(self.view_frame.tab("Sweeps"), self.executor,
+                                            lambda: normalize_config(self.config_form.get_config()))
+                self.sweep_view.pack(fill="both", expand=True)
+        elif self.view_frame.get() == "Compare" and self.compare_view is None:
+            with TIMER.timed("Compare view"):
+                from src.gui.views.compare_view import CompareView
+                self.compare_view = CompareView(
+                    self.view_frame.tab("Compare"), self.executor,
+                    lambda: normalize_config(self.config_form.get_config()),
+                    lambda: (self._last_cfg, self._last_payload) if self._last_payload is not None else None)
+                self.compare_view.pack(fill="both", expand=True)
+
     def _load_config(self, path):
         self.config_path = path
         try:
@@ -89,6 +140,7 @@ class App(ctk.CTk):
             self.config_form.load_from_dict(data)
         except Exception as e:
             print(f"Error populating form: {e}")
+        self._schedule_live()
 
     def _on_load_clicked(self):
         path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
@@ -107,53 +159,139 @@ class App(ctk.CTk):
         self.config_path = path
 
     def _on_run_clicked(self):
-        if self.running: return
-        
-        # Save temp config
+        # Run straight from the form (validated in memory); the config file is only written on Save.
+        # Clicking again while a run is in progress restarts it with the current form values.
         try:
-            self._save_config(self.config_path)
+            cfg = normalize_config(self.config_form.get_config())
         except Exception as e:
-            messagebox.showerror("Error", f"Could not save config: {e}")
+            messagebox.showerror("Invalid configuration", str(e))
             return
 
-        self.running = True
-        self.btn_run.configure(state="disabled", text="Running...")
-        
-        def worker():
-            try:
-                cfg = load_config(self.config_path)
-                payload = run_case(cfg)
-                self._last_payload = payload
-                
-                # Update UI
-                self.after(0, lambda: self.results_panel.update_results(payload))
-                self.after(0, lambda: self.view3d.update_geometry(payload["geom"]))
-                self.after(0, lambda: messagebox.showinfo("Success", "Run completed successfully"))
-            except Exception:
-                err = traceback.format_exc()
-                self.after(0, lambda: messagebox.showerror("Run Failed", err))
-            finally:
-                self.after(0, lambda: self._reset_run_state())
-        
-        self.worker = threading.Thread(target=worker, daemon=True)
-        self.worker.start()
+        self.btn_run.configure(text="RESTART RUN")
+        self.btn_cancel.configure(state="normal")
+        self.status_var.set("Run: starting...")
+        self.executor.submit(
+            "run", lambda token, progress: run_case(cfg, token, progress),
+            on_done=lambda payload: self._on_run_done(cfg, payload), on_error=self._on_run_failed,
+            on_progress=lambda frac, stage: self.status_var.set(f"Run: {stage} ({frac:.0%})"),
+        )
+
+    def _on_run_done(self, cfg, payload):
+        self._reset_run_state()
+        self._last_payload = payload
+        self._last_cfg = cfg
+        self.results_panel.update_results(payload)
+        self._show_geometry(payload["geom"])
+        msg = "Run completed successfully"
+        if payload.get("run_dir"):
+            msg += f"\n\nOutputs: {payload['run_dir']}"
+        self.status_var.set("Run: done")
+        messagebox.showinfo("Success", msg)
+
+    def _on_run_failed(self, exc, err):
+        self._reset_run_state()
+        self.status_var.set("Run: failed")
+        messagebox.showerror("Run Failed", err)
+
+    def _on_cancel_clicked(self):
+        self.executor.cancel("run")
+        self.executor.cancel("export")
+        self.executor.cancel("sweep")
+        self.executor.cancel("save_sweep")
+        self.executor.cancel("compare")
+        self._reset_run_state()
+        self.status_var.set("Cancelled")
+
+    def _on_close(self):
+        self.executor.shutdown()
+        self.destroy()
+
+    # ---------- Live mode ----------
+
+    def _on_live_toggled(self):
+        if self.live_var.get():
+            self._schedule_live()
+        else:
+            if self._live_after is not None:
+                self.after_cancel(self._live_after)
+                self._live_after = None
+            self.executor.cancel("live")  # drop anything still in flight
+            self.status_var.set("")
+
+    def _schedule_live(self):
+        """Debounce: (re)start the timer on every edit; only the last edit triggers a recompute."""
+        if not self.live_var.get():
+            return
+        if self._live_after is not None:
+            self.after_cancel(self._live_after)
+        self._live_after = self.after(LIVE_DEBOUNCE_MS, self._live_recompute)
+
+    def _live_recompute(self):
+        self._live_after = None
+        try:
+            cfg = normalize_config(self.config_form.get_config())
+        except (ValueError, KeyError, TypeError) as e:
+            self.status_var.set(f"Live: {e}")
+            return
+        # Latest edit wins: a newer request cancels this one between stages. The view gets the
+        # geometry in io.storage_dtype, as after a full run.
+        self.executor.submit(
+            "live", lambda token, progress: evaluate_case(cfg, token, dtype=storage_dtype(cfg)),
+            on_done=lambda result: self._apply_live(cfg, *result),
+            on_error=lambda exc, err: self.status_var.set(f"Live: {exc}"),
+        )
+
+    def _apply_live(self, cfg, payload, timings):
+        self._last_payload = payload
+        self._last_cfg = cfg
+        self.results_panel.update_results(payload)
+        view_ms = 0.0
+        if payload["geom"] is not self._shown_geom:  # op/Cf/mass edits reuse the cached geometry
+            t0 = time.perf_counter()
+            self._show_geometry(payload["geom"])
+            view_ms = (time.perf_counter() - t0) * 1e3
+        cache = "geometry cached" if timings["geom_cached"] else f"build {timings['build_ms']:.1f} ms"
+        self.status_var.set(
+            f"Live: compute {timings['total_ms']:.1f} ms ({cache}, integrals {timings['integrals_ms']:.1f} ms)"
+            f" · view {view_ms:.0f} ms"
+        )
 
     def _reset_run_state(self):
-        self.running = False
-        self.btn_run.configure(state="normal", text="RUN PIPELINE")
+        self.btn_run.configure(text="RUN PIPELINE")
+        self.btn_cancel.configure(state="disabled")
 
     def _export_stl(self):
         if not self._last_payload or "geom" not in self._last_payload:
             messagebox.showwarning("Warning", "Run a case first.")
             return
             
-        path = filedialog.asksaveasfilename(defaultextension=".stl", filetypes=[("STL files", "*.stl")])
-        if path:
-            try:
-                export_fuselage_stl(self._last_payload["geom"], path)
-                messagebox.showinfo("Success", f"Exported to {path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Export failed: {e}")
+        path = filedialog.asksaveasfilename(
+            defaultextension=".stl",
+            filetypes=[("STL files", "*.stl"), ("PLY files", "*.ply"), ("OBJ files", "*.obj"), ("glTF binary", "*.glb")],
+        )
+        if not path:
+            return
+        geom = self._last_payload["geom"]
+        if path.lower().endswith(".stl"):
+            job = lambda token, progress: export_fuselage_stl(geom, path, token=token)
+        else:
+            job = lambda token, progress: export_fuselage_mesh(geom, path, token=token)
+        self.btn_cancel.configure(state="normal")
+        self.status_var.set(f"Exporting {os.path.basename(path)}...")
+        self.executor.submit("export", job, on_done=lambda _: self._on_export_done(path),
+                             on_error=lambda exc, err: self._on_export_failed(exc))
+
+    def _on_export_done(self, path):
+        if not self.executor.busy("run"):
+            self.btn_cancel.configure(state="disabled")
+        self.status_var.set(f"Exported {os.path.basename(path)}")
+        messagebox.showinfo("Success", f"Exported to {path}")
+
+    def _on_export_failed(self, exc):
+        if not self.executor.busy("run"):
+            self.btn_cancel.configure(state="disabled")
+        self.status_var.set("Export failed")
+        messagebox.showerror("Error", f"Export failed: {exc}")
 
     def _open_results(self):
         results_dir = os.path.abspath("results")
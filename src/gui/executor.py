@@ -0,0 +1,124 @@
+# src/gui/executor.py
+# Background job runner shared by both GUIs: one worker thread, cooperative cancellation,
+# progress marshalled to the Tk thread and "latest request wins" per job key.
+from __future__ import annotations
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from src.pipeline import CancelToken, Cancelled
+
+
+class _Job:
+    __slots__ = ("key", "token", "on_done", "on_error", "on_progress", "pending")
+
+    def __init__(self, key, on_done, on_error, on_progress):
+        self.key = key
+        self.token = CancelToken()
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.pending = None  # newest (fraction, message) not yet shown
+
+
+class TkExecutor:
+    """
+    Runs jobs one at a time on a background thread and reports back through widget.after.
+
+    submit("run", fn, ...) cancels the job previously submitted under "run" (queued or running),
+    so only the latest request per key delivers a result. fn is called as fn(token, progress):
+    it should call token.check() between stages (run_case / run_batch / evaluate_case do) and
+    may call progress(fraction, message) as often as it likes; the Tk side sees at most one
+    pending update per job. Callbacks always run on the Tk thread.
+
+    Keys in `interactive` (short, latency-sensitive jobs such as live recomputes) run on a
+    second worker of their own, so they never queue behind a long run, sweep or export.
+    """
+
+    def __init__(self, widget, interactive=()):
+        self.widget = widget
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fuselagelab-worker")
+        self._interactive = frozenset(interactive)
+        self._fast_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fuselagelab-interactive")
+        self._jobs: dict = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, fn, on_done=None, on_error=None, on_progress=None) -> CancelToken:
+        job = _Job(key, on_done, on_error, on_progress)
+        with self._lock:
+            prev = self._jobs.get(key)
+            self._jobs[key] = job
+        if prev is not None:
+            prev.token.cancel()
+        pool = self._fast_pool if key in self._interactive else self._pool
+        pool.submit(self._run, job, fn)
+        return job.token
+
+    def cancel(self, key: str | None = None) -> None:
+        """Cancel the job under key (all jobs if None); its callbacks will not fire."""
+        with self._lock:
+            jobs = list(self._jobs.values()) if key is None else [self._jobs.get(key)]
+            for job in jobs:
+                if job is not None:
+                    self._jobs.pop(job.key, None)
+        for job in jobs:
+            if job is not None:
+                job.token.cancel()
+
+    def busy(self, key: str) -> bool:
+        with self._lock:
+            return key in self._jobs
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._fast_pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- worker side ---
+
+    def _run(self, job: _Job, fn) -> None:
+        if job.token.cancelled:
+            return  # superseded while queued: never starts
+        try:
+            result = fn(job.token, lambda fraction, message="": self._progress(job, fraction, message))
+        except Cancelled:
+            return
+        except Exception as e:
+            err = traceback.format_exc()
+            self._post(self._finish, job, job.on_error, e, err)
+            return
+        self._post(self._finish, job, job.on_done, result)
+
+    def _progress(self, job: _Job, fraction: float, message: str) -> None:
+        if job.on_progress is None or job.token.cancelled:
+            return
+        with self._lock:
+            scheduled = job.pending is not None
+            job.pending = (fraction, message)
+        if not scheduled:
+            self._post(self._flush_progress, job)
+
+    def _post(self, fn, *args) -> None:
+        try:
+            self.widget.after(0, fn, *args)
+        except Exception:
+            pass  # window already destroyed (TclError / RuntimeError)
+
+    # --- Tk side ---
+
+    def _current(self, job: _Job) -> bool:
+        return not job.token.cancelled and self._jobs.get(job.key) is job
+
+    def _flush_progress(self, job: _Job) -> None:
+        with self._lock:
+            pending, job.pending = job.pending, None
+        if pending is not None and self._current(job):
+            job.on_progress(*pending)
+
+    def _finish(self, job: _Job, callback, *args) -> None:
+        with self._lock:
+            if not self._current(job):
+                return
+            del self._jobs[job.key]
+        if callback is not None:
+            callback(*args)
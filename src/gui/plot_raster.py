@@ -0,0 +1,50 @@
+# src/gui/plot_raster.py
+# Off-thread 2D plot rendering: draw a Matplotlib figure with the Agg backend on a worker
+# thread and hand the Tk thread a ready-to-blit PPM image (tk.PhotoImage(data=..., format="PPM")).
+from __future__ import annotations
+import base64
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def _style_axes(fig, ax, style: dict) -> None:
+    """Dark-theme colors (surface / fg / border) applied after drawing, so titles and legends pick them up."""
+    surface, fg, border = style["surface"], style["fg"], style["border"]
+    fig.patch.set_facecolor(surface)
+    ax.set_facecolor(surface)
+    ax.tick_params(colors=fg)
+    for spine in ax.spines.values():
+        spine.set_color(border)
+    ax.title.set_color(fg)
+    ax.xaxis.label.set_color(fg)
+    ax.yaxis.label.set_color(fg)
+    legend = ax.get_legend()
+    if legend is not None:
+        legend.get_frame().set_facecolor(surface)
+        legend.get_frame().set_edgecolor(border)
+        for text in legend.get_texts():
+            text.set_color(fg)
+
+
+def render_ppm(draw, width_px: int, height_px: int, dpi: int = 100, style: dict | None = None) -> str:
+    """
+    Render draw(ax) into a width x height pixel figure with Agg and return base64 PPM data.
+
+    Thread-safe (no pyplot, one Figure per call), so it can run on the GUI worker; the
+    Tk thread only builds the PhotoImage from the returned string.
+    """
+    width_px = max(int(width_px), 50)
+    height_px = max(int(height_px), 50)
+    fig = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.grid(True, alpha=0.3)
+    draw(ax)
+    if style:
+        _style_axes(fig, ax, style)
+    canvas.draw()
+    rgba = np.asarray(canvas.buffer_rgba())
+    h, w = rgba.shape[:2]
+    header = f"P6 {w} {h} 255\n".encode("ascii")
+    return base64.b64encode(header + np.ascontiguousarray(rgba[..., :3]).tobytes()).decode("ascii")
@@ -0,0 +1,111 @@
+# src/gui/plotly_shell.py
+# Lightweight Plotly output: plotly.js is written once to a local cache file, the page is a small
+# HTML shell referencing it, and each update only carries the mesh as base64 float32 data.
+from __future__ import annotations
+import base64
+import json
+import os
+from pathlib import Path
+import numpy as np
+
+from src.utils import atomic_write
+
+PLOTLY_CACHE_DIR = os.path.join("results", ".cache")
+
+_SHELL = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>html,body,#plot{{margin:0;width:100%;height:100%;background:{bg};}}</style>
+<script src="{plotly_src}"></script>
+{data_tag}
+</head><body><div id="plot"></div>
+<script>
+(function () {{
+  var P = window.FUSELAGE_PLOT;
+  function f32(b64) {{
+    var s = atob(b64), u = new Uint8Array(s.length);
+    for (var i = 0; i < s.length; i++) u[i] = s.charCodeAt(i);
+    return new Float32Array(u.buffer);
+  }}
+  function rows(a, ny, nx) {{
+    var out = new Array(ny);
+    for (var i = 0; i < ny; i++) out[i] = Array.from(a.subarray(i * nx, (i + 1) * nx));
+    return out;
+  }}
+  var g = P.grid, trace = P.trace;
+  trace.x = rows(f32(g.x), g.shape[0], g.shape[1]);
+  trace.y = rows(f32(g.y), g.shape[0], g.shape[1]);
+  trace.z = rows(f32(g.z), g.shape[0], g.shape[1]);
+  Plotly.react("plot", [trace], P.layout, P.config);
+}})();
+</script></body></html>
+"""
+
+
+def plotly_js_path(cache_dir: str = PLOTLY_CACHE_DIR) -> str:
+    """Absolute path of the cached plotly.js bundle (written from the installed plotly once per version)."""
+    import plotly
+    path = os.path.abspath(os.path.join(cache_dir, f"plotly-{plotly.__version__}.min.js"))
+    if not os.path.exists(path):
+        from plotly.offline import get_plotlyjs
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_write(path, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+    return path
+
+
+def encode_f32(a) -> str:
+    """Array as base64 of its little-endian float32 bytes."""
+    return base64.b64encode(np.ascontiguousarray(a, dtype="<f4").tobytes()).decode("ascii")
+
+
+def grid_payload(X, Y, Z) -> dict:
+    X, Y, Z = (np.asarray(a) for a in (X, Y, Z))
+    return {"shape": list(Z.shape), "x": encode_f32(X), "y": encode_f32(Y), "z": encode_f32(Z)}
+
+
+def shell_html(plotly_src: str, data_js: str | None = None, data_src: str | None = None,
+               title: str = "Fuselage 3D", bg: str = "#1e1e1e") -> str:
+    """The HTML shell, with the data either inline (data_js) or from a sibling script (data_src)."""
+    if data_js is not None:
+        data_tag = f"<script>{data_js}</script>"
+    else:
+        data_tag = f'<script src="{data_src}"></script>'
+    return _SHELL.format(title=title, bg=bg, plotly_src=plotly_src, data_tag=data_tag)
+
+
+def publish_surface(fig, X, Y, Z, config: dict, html_path: str) -> str:
+    """
+    Write a single-surface figure as shell + data and return the inline HTML for an embedded view.
+
+    fig holds the trace style (e.g. go.Surface(colorscale=...)) and the layout, without the
+    x/y/z arrays. html_path gets a shell (rewritten only if it changes) that loads plotly.js from
+    the cache and the mesh from <html_path stem>_data.js, which is the only file rewritten per update.
+    """
+    spec = json.loads(fig.to_json())
+    trace = spec["data"][0] if spec.get("data") else {"type": "surface"}
+    data_js = "window.FUSELAGE_PLOT = " + json.dumps(
+        {"trace": trace, "layout": spec.get("layout", {}), "config": config, "grid": grid_payload(X, Y, Z)},
+        separators=(",", ":"),
+    ) + ";"
+
+    js = plotly_js_path()
+    out_dir = os.path.dirname(os.path.abspath(html_path))
+    os.makedirs(out_dir, exist_ok=True)
+    data_path = os.path.splitext(html_path)[0] + "_data.js"
+    with atomic_write(data_path, "w", encoding="utf-8") as f:
+        f.write(data_js)
+
+    try:
+        js_src = os.path.relpath(js, out_dir).replace(os.sep, "/")
+    except ValueError:  # Windows: html_path on another drive than the cache, no relative path
+        js_src = Path(js).as_uri()
+    shell = shell_html(js_src, data_src=os.path.basename(data_path))
+    try:
+        with open(html_path, "r", encoding="utf-8") as f:
+            current = f.read()
+    except OSError:
+        current = None
+    if current != shell:
+        with atomic_write(html_path, "w", encoding="utf-8") as f:
+            f.write(shell)
+    return shell_html(Path(js).as_uri(), data_js=data_js)
@@ -0,0 +1,68 @@
+# src/gui/startup.py
+# Startup-time measurement for both GUIs: run with --startup-timing (or FUSELAGELAB_STARTUP_TIMING=1)
+# to print import and construction time per component, and when the window is first shown.
+from __future__ import annotations
+import importlib
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+FLAG = "--startup-timing"
+ENV_VAR = "FUSELAGELAB_STARTUP_TIMING"
+
+
+class StartupTimer:
+    """
+    Prints "[startup] <component>: <ms>" lines; disabled unless the flag / env var is set.
+
+    Components built lazily after the window appears (3D backends, tabs) are reported when
+    they are first built, so the log also shows what was moved off the startup path.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.t0 = time.perf_counter()
+        self._shown = False
+
+    def _print(self, name: str, ms: float, note: str = "") -> None:
+        print(f"[startup] {name}: {ms:.1f} ms{note}", file=sys.stderr, flush=True)
+
+    @contextmanager
+    def timed(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            note = " (deferred)" if self._shown else ""
+            self._print(name, (time.perf_counter() - t) * 1e3, note)
+
+    def import_modules(self, names) -> None:
+        """Import names in order, timing each (a module's time includes what it pulls in first)."""
+        if not self.enabled:
+            return
+        for name in names:
+            with self.timed(f"import {name}"):
+                importlib.import_module(name)
+
+    def mark(self, name: str) -> None:
+        """Elapsed time since this module was imported (about process start for the GUIs)."""
+        if self.enabled:
+            self._print(name, (time.perf_counter() - self.t0) * 1e3, " since start")
+
+    def window_shown(self, widget) -> None:
+        """Report once the Tk event loop is idle with the window mapped (first frame on screen)."""
+        if not self.enabled:
+            return
+
+        def done():
+            self._shown = True
+            self.mark("window shown")
+
+        widget.after_idle(done)
+
+
+TIMER = StartupTimer(FLAG in sys.argv or os.environ.get(ENV_VAR, "") not in ("", "0"))
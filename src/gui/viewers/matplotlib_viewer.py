@@ -3,6 +3,38 @@ import tkinter as tk
 import numpy as np
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+from src.mesh import wireframe_lines
+
+WIRE_STYLE = dict(colors="#00aaff", linewidths=0.6, alpha=0.8)
+LIMITS_TOL = 0.05  # refit the axes only if the bounding box moves/grows by more than this fraction
+
+# Pixel-aware decimation: target on-screen spacing of the drawn lines, and (min, max) counts
+RING_SPACING_PX = 10.0      # between rings along the body
+MERIDIAN_SPACING_PX = 12.0  # between meridians around the widest ring
+SEGMENT_PX = 4.0            # polyline segment length
+AXES_FILL = 0.75            # fraction of the canvas the 3D axes box spans at the default view
+WIRE_LIMITS = {"rings": (8, 200), "meridians": (8, 64), "ring_pts": (16, 128), "stations": (16, 600)}
+REDECIMATE_MS = 60          # resize/zoom events are coalesced this long before re-decimating
+
+
+def wire_counts(width_px: int, height_px: int, length: float, diameter: float, view_half: float) -> tuple:
+    """
+    (rings, meridians, points per ring, stations per meridian) for a body of the given size
+    drawn in a width x height canvas whose axes currently span 2 * view_half data units.
+    """
+    px_per_unit = AXES_FILL * max(min(width_px, height_px), 1) / max(2.0 * view_half, 1e-12)
+    length_px = length * px_per_unit
+    circ_px = np.pi * diameter * px_per_unit
+
+    def clip(value, key):
+        lo, hi = WIRE_LIMITS[key]
+        return int(np.clip(round(value), lo, hi))
+
+    return (clip(length_px / RING_SPACING_PX, "rings"), clip(circ_px / MERIDIAN_SPACING_PX, "meridians"),
+            clip(circ_px / SEGMENT_PX, "ring_pts"), clip(length_px / SEGMENT_PX, "stations"))
+
 
 class MatplotlibViewer(ctk.CTkFrame):
     def __init__(self, parent, *args, **kwargs):
@@ -27,6 +59,16 @@ class MatplotlibViewer(ctk.CTkFrame):
         
         # Hide axes initially
         self.ax.set_axis_off()
+
+        # Persistent wireframe artists: updates only swap their segments (no ax.clear/re-layout)
+        self._rings = Line3DCollection([], **WIRE_STYLE)
+        self._meridians = Line3DCollection([], **WIRE_STYLE)
+        self.ax.add_collection(self._rings, autolim=False)  # limits are set by _fit_limits
+        self.ax.add_collection(self._meridians, autolim=False)
+        self._bbox = None  # (center, half-range) the axes were last fitted to
+        self._profile = None  # (x, r) on screen, re-decimated on resize/zoom
+        self._counts = None  # wire_counts() the current segments were built with
+        self._redecimate_after = None
         
         # Canvas
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
@@ -36,6 +78,8 @@ class MatplotlibViewer(ctk.CTkFrame):
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.grid(row=0, column=0, sticky="nsew")
         self.canvas_widget.configure(highlightthickness=0, bd=0)
+        self.canvas_widget.bind("<Configure>", self._on_view_changed, add="+")
+        self.ax.callbacks.connect("xlim_changed", self._on_view_changed)  # toolbar / right-drag zoom
         
         # Toolbar (optional, maybe hide it or style it)
         # For now, let's skip the toolbar or put it in a separate frame if needed.
@@ -54,45 +98,63 @@ class MatplotlibViewer(ctk.CTkFrame):
             except: pass
 
     def update_geometry(self, geom):
-        x = np.asarray(geom.get("x"))
-        y = np.asarray(geom.get("y"))
-        if x is None or y is None or x.size == 0:
+        if geom.get("x") is None or geom.get("y") is None or np.asarray(geom.get("x")).size == 0:
             return
 
-        # Revolve
-        n_theta = 64
-        theta = np.linspace(0.0, 2*np.pi, n_theta)
-        X = np.repeat(x[:, None], n_theta, axis=1)
-        R = np.repeat(y[:, None], n_theta, axis=1)
-        Y = R * np.cos(theta)
-        Z = R * np.sin(theta)
-        
-        self.ax.clear()
-        self.ax.plot_wireframe(X, Y, Z, 
-                               rstride=max(1, X.shape[0] // 60),
-                               cstride=max(1, X.shape[1] // 32),
-                               color="#00aaff", linewidth=0.6, alpha=0.8)
-        
-        self._set_axes_equal(self.ax, X, Y, Z)
-        self.ax.set_axis_off() # Keep clean look
-        self.canvas.draw()
+        x, r = geom["x"], geom["y"]
+        self._profile = (x, r)
+        self._counts = None
+        rmax = float(np.nanmax(np.abs(r)))
+        self._fit_limits(float(np.nanmin(x)), float(np.nanmax(x)), rmax)
+        self._update_wire()
 
-    def _set_axes_equal(self, ax, X, Y, Z):
-        x_min, x_max = np.nanmin(X), np.nanmax(X)
-        y_min, y_max = np.nanmin(Y), np.nanmax(Y)
-        z_min, z_max = np.nanmin(Z), np.nanmax(Z)
-        max_range = max(x_max-x_min, y_max-y_min, z_max-z_min)
-        
-        x_mid = 0.5 * (x_max + x_min)
-        y_mid = 0.5 * (y_max + y_min)
-        z_mid = 0.5 * (z_max + z_min)
-        
-        half = 0.5 * max_range
-        ax.set_xlim(x_mid - half, x_mid + half)
-        ax.set_ylim(y_mid - half, y_mid + half)
-        ax.set_zlim(z_mid - half, z_mid + half)
+    def _update_wire(self):
+        """(Re)build the wireframe with as many lines as the canvas can show; no-op if unchanged."""
+        self._redecimate_after = None
+        if self._profile is None:
+            return
+        x, r = self._profile
+        x0, x1 = self.ax.get_xlim()
+        length = float(np.nanmax(x) - np.nanmin(x))
+        diameter = 2.0 * float(np.nanmax(np.abs(r)))
+        counts = wire_counts(self.canvas_widget.winfo_width(), self.canvas_widget.winfo_height(),
+                             length, diameter, 0.5 * abs(x1 - x0))
+        if counts == self._counts:
+            return
+        n_rings, n_meridians, ring_pts, stations = counts
+        rings, meridians = wireframe_lines(x, r, n_rings, n_meridians, ring_pts, stations)
+        self._rings.set_segments(rings)
+        self._meridians.set_segments(meridians)
+        self._counts = counts
+        self.canvas.draw_idle()
+
+    def _on_view_changed(self, *_):
+        if self._profile is None:
+            return
+        if self._redecimate_after is not None:
+            self.after_cancel(self._redecimate_after)
+        self._redecimate_after = self.after(REDECIMATE_MS, self._update_wire)
+
+    def _fit_limits(self, x_min, x_max, rmax):
+        """Equal-aspect limits around the geometry, kept unless the bounding box changes materially."""
+        lo = np.array([x_min, -rmax, -rmax])
+        hi = np.array([x_max, rmax, rmax])
+        center = 0.5 * (lo + hi)
+        half = 0.5 * float(np.max(hi - lo))
+        if self._bbox is not None:
+            c0, h0 = self._bbox
+            tol = LIMITS_TOL * h0
+            if abs(half - h0) <= tol and np.all(np.abs(center - c0) <= tol):
+                return
+        self._bbox = (center, half)
+        self.ax.set_xlim(center[0] - half, center[0] + half)
+        self.ax.set_ylim(center[1] - half, center[1] + half)
+        self.ax.set_zlim(center[2] - half, center[2] + half)
 
     def clear(self):
-        self.ax.clear()
-        self.ax.set_axis_off()
-        self.canvas.draw()
+        self._rings.set_segments([])
+        self._meridians.set_segments([])
+        self._bbox = None
+        self._profile = None
+        self._counts = None
+        self.canvas.draw_idle()
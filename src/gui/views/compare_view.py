@@ -0,0 +1,238 @@
+# src/gui/views/compare_view.py
+# Side-by-side comparison of stored designs for the CustomTkinter app: profile overlay, silhouettes
+# and a metrics table, loaded from the run index and the stored results (no recomputation).
+from __future__ import annotations
+import time
+import tkinter as tk
+from tkinter import ttk
+import customtkinter as ctk
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection, PolyCollection
+
+from src.compare import FIELDS, MAX_DESIGNS, design_from_payload, load_designs
+
+# Selection -> (index column, descending)
+SELECTIONS = {
+    "Latest": ("stamp", True),
+    "Lowest CD": ("CD_total", False),
+    "Lowest drag": ("D_total", False),
+    "Lightest shell": ("m_shell", False),
+    "Largest volume": ("volume", True),
+}
+DEFAULT_DESIGNS = 10
+SILHOUETTE_GAP = 0.3  # vertical gap between stacked silhouettes, as a fraction of the largest diameter
+BG = "#1a1a1a"
+
+
+def _fmt(v) -> str:
+    if v is None:
+        return "-"
+    if isinstance(v, str):
+        return v
+    return "-" if not np.isfinite(v) else f"{v:.5g}"
+
+
+class CompareView(ctk.CTkFrame):
+    """
+    Comparison panel: "Load" picks designs from the run index (get_config()["io"]["run_index"]),
+    "Add current" appends the design on screen (get_current() -> (cfg, payload) or None).
+
+    Loading runs on executor under the "compare" key; profiles are decimated once per stored
+    result (src.compare) and the same arrays feed the overlay and the silhouettes.
+    """
+
+    def __init__(self, parent, executor, get_config, get_current, *args, **kwargs):
+        super().__init__(parent, *args, **kwargs)
+        self._executor = executor
+        self._get_config = get_config
+        self._get_current = get_current
+        self._designs = []
+        self._sort = (None, False)
+
+        self.grid_rowconfigure(2, weight=3)
+        self.grid_rowconfigure(3, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self._build_controls()
+        self._build_plot()
+        self._build_table()
+
+    def _build_controls(self):
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 0))
+
+        self.select_var = tk.StringVar(value="Latest")
+        self.count_var = tk.StringVar(value=str(DEFAULT_DESIGNS))
+        ctk.CTkLabel(bar, text="Compare").pack(side="left", padx=(0, 5))
+        ctk.CTkComboBox(bar, values=list(SELECTIONS), variable=self.select_var, width=140).pack(side="left", padx=5)
+        ctk.CTkLabel(bar, text="designs").pack(side="left", padx=(5, 2))
+        ctk.CTkEntry(bar, textvariable=self.count_var, width=50).pack(side="left")
+        ctk.CTkButton(bar, text="Load", width=80, command=self._on_load_clicked).pack(side="left", padx=5)
+        ctk.CTkButton(bar, text="Add current", width=100, command=self._on_add_current).pack(side="left", padx=5)
+        ctk.CTkButton(bar, text="Clear", width=70, command=self._on_clear).pack(side="left", padx=5)
+
+        self.status_var = tk.StringVar(value="")
+        ctk.CTkLabel(self, textvariable=self.status_var, text_color="gray70", anchor="w").grid(
+            row=1, column=0, sticky="ew", padx=10, pady=(2, 0))
+
+    def _build_plot(self):
+        self.fig = Figure(figsize=(6, 4), dpi=100)
+        self.fig.patch.set_facecolor(BG)
+        self.ax_profile = self.fig.add_subplot(121)
+        self.ax_silhouette = self.fig.add_subplot(122)
+        for ax in (self.ax_profile, self.ax_silhouette):
+            ax.set_facecolor(BG)
+            ax.tick_params(colors="white")
+            for spine in ax.spines.values():
+                spine.set_color("gray")
+            ax.xaxis.label.set_color("white")
+            ax.yaxis.label.set_color("white")
+            ax.title.set_color("white")
+        self.ax_profile.grid(True, alpha=0.3)
+        self.ax_profile.set_title("Profiles r(x)")
+        self.ax_profile.set_xlabel("x [m]")
+        self.ax_profile.set_ylabel("r [m]")
+        self.ax_silhouette.set_title("Silhouettes")
+        self.ax_silhouette.set_xlabel("x [m]")
+        self.ax_silhouette.set_yticks([])
+
+        # One collection per panel, updated in place on every load
+        self._profiles = LineCollection([], linewidths=1.4)
+        self._silhouettes = PolyCollection([], linewidths=0.8, alpha=0.85)
+        self.ax_profile.add_collection(self._profiles, autolim=False)
+        self.ax_silhouette.add_collection(self._silhouettes, autolim=False)
+        self._labels = []
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().grid(row=2, column=0, sticky="nsew")
+        self.canvas.get_tk_widget().configure(highlightthickness=0, bd=0)
+
+    def _build_table(self):
+        style = ttk.Style(self)
+        style.configure("Compare.Treeview", background=BG, fieldbackground=BG, foreground="white", rowheight=22)
+        style.configure("Compare.Treeview.Heading", background="#2b2b2b", foreground="white")
+        columns = ("design",) + FIELDS
+        self.table = ttk.Treeview(self, columns=columns, show="headings", style="Compare.Treeview", height=6)
+        for c in columns:
+            self.table.heading(c, text=c, command=lambda c=c: self._sort_by(c))
+            self.table.column(c, width=160 if c == "design" else 90, anchor="w" if c == "design" else "e")
+        self.table.grid(row=3, column=0, sticky="nsew", padx=10, pady=(5, 10))
+
+    # --- loading ---
+
+    def _on_load_clicked(self):
+        try:
+            index_path = self._get_config()["io"].get("run_index", "")
+            if not index_path:
+                raise ValueError("the run index is off (I/O tab)")
+            n = int(self.count_var.get())
+            if not 1 <= n <= MAX_DESIGNS:
+                raise ValueError(f"designs must be between 1 and {MAX_DESIGNS}")
+        except Exception as e:
+            self.status_var.set(f"Compare: {e}")
+            return
+        order_by, desc = SELECTIONS.get(self.select_var.get(), SELECTIONS["Latest"])
+        self.status_var.set("Compare: loading...")
+        t0 = time.perf_counter()
+        self._executor.submit(
+            "compare", lambda token, progress: load_designs(index_path, order_by, desc, n, token=token),
+            on_done=lambda designs: self._on_loaded(designs, t0),
+            on_error=lambda exc, err: self.status_var.set(f"Compare: {exc}"),
+        )
+
+    def _on_loaded(self, designs, t0):
+        self._designs = list(designs)
+        self._refresh()
+        missing = sum(1 for d in designs if d.x is None)
+        note = f", {missing} without stored profile" if missing else ""
+        self.status_var.set(f"Compare: {len(designs)} designs in {(time.perf_counter() - t0) * 1e3:.0f} ms{note}")
+
+    def _on_add_current(self):
+        current = self._get_current()
+        if current is None:
+            self.status_var.set("Compare: run a case (or use Live update) first")
+            return
+        cfg, payload = current
+        self._designs.append(design_from_payload(cfg, payload, f"current {sum(d.source is None for d in self._designs) + 1}"))
+        self._refresh()
+
+    def _on_clear(self):
+        self._executor.cancel("compare")
+        self._designs = []
+        self._refresh()
+        self.status_var.set("")
+
+    # --- drawing ---
+
+    def _refresh(self):
+        self._redraw()
+        self._fill_table()
+
+    def _redraw(self):
+        """Update both collections from the shared decimated profiles and draw once."""
+        shown = [d for d in self._designs if d.x is not None]
+        colors = [self._color(i) for i in range(len(shown))]
+        for text in self._labels:
+            text.remove()
+        self._labels = []
+
+        self._profiles.set_segments([np.column_stack([d.x, d.r]) for d in shown])
+        self._profiles.set_color(colors)
+
+        d_max = max((2.0 * float(np.max(d.r)) for d in shown), default=1.0)
+        step = d_max * (1.0 + SILHOUETTE_GAP)
+        polys = []
+        for k, d in enumerate(shown):
+            y0 = -k * step
+            polys.append(np.column_stack([np.r_[d.x, d.x[::-1]], np.r_[y0 + d.r, y0 - d.r[::-1]]]))
+            self._labels.append(self.ax_silhouette.text(
+                float(d.x[-1]), y0, " " + d.label, color=colors[k], fontsize=8, va="center"))
+        self._silhouettes.set_verts(polys)
+        self._silhouettes.set_facecolor(colors)
+        self._silhouettes.set_edgecolor(colors)
+
+        if shown:
+            x_lo = min(float(d.x[0]) for d in shown)
+            x_hi = max(float(d.x[-1]) for d in shown)
+            pad = 0.03 * (x_hi - x_lo or 1.0)
+            self.ax_profile.set_xlim(x_lo - pad, x_hi + pad)
+            self.ax_profile.set_ylim(0.0, 0.6 * d_max)
+            self.ax_silhouette.set_xlim(x_lo - pad, x_hi + 6 * pad)  # room for the labels
+            self.ax_silhouette.set_ylim(-(len(shown) - 1) * step - 0.6 * d_max, 0.6 * d_max)
+        self.canvas.draw_idle()
+
+    @staticmethod
+    def _color(i: int) -> str:
+        return to_hex(colormaps["tab20"](i % 20))
+
+    def _fill_table(self):
+        """Rows in the current sort order, each in the color of its curve (gray without a profile)."""
+        self.table.delete(*self.table.get_children())
+        rows = []
+        k = 0
+        for d in self._designs:
+            color = "gray60" if d.x is None else self._color(k)
+            k += d.x is not None
+            rows.append((d, color))
+        col, desc = self._sort
+        if col is not None:
+            def value(row):
+                return row[0].label if col == "design" else row[0].metrics.get(col)
+
+            def known(v):
+                return v is not None and (isinstance(v, str) or np.isfinite(v))
+
+            present = sorted((r for r in rows if known(value(r))), key=value, reverse=desc)
+            rows = present + [r for r in rows if not known(value(r))]  # missing values always last
+        for i, (d, color) in enumerate(rows):
+            tag = f"c{i}"
+            self.table.tag_configure(tag, foreground=color)
+            self.table.insert("", "end", values=(d.label,) + tuple(_fmt(d.metrics.get(c)) for c in FIELDS), tags=(tag,))
+
+    def _sort_by(self, col):
+        prev, desc = self._sort
+        self._sort = (col, not desc if prev == col else False)
+        self._fill_table()
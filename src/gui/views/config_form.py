@@ -8,8 +8,22 @@ class ConfigForm(ctk.CTkFrame):
         super().__init__(parent, *args, **kwargs)
         
         self.cfg_vars = {}
+        self._extra_sections = {}  # config sections without form fields (e.g. "retention"), kept on save
+        self._on_change = None
+        self._loading = False
         self._init_vars()
         self._build_ui()
+        for section in self.cfg_vars.values():
+            for var in section.values():
+                var.trace_add("write", self._var_changed)
+
+    def set_on_change(self, callback):
+        """callback() is called after any user edit of a form field (not while loading a config)."""
+        self._on_change = callback
+
+    def _var_changed(self, *_):
+        if self._on_change is not None and not self._loading:
+            self._on_change()
         
     def _init_vars(self):
         self.cfg_vars = {
@@ -49,6 +63,10 @@ class ConfigForm(ctk.CTkFrame):
             "io": {
                 "export_csv": tk.BooleanVar(),
                 "csv_path": tk.StringVar(),
+                "results_format": tk.StringVar(),
+                "run_index": tk.StringVar(),
+                "run_dirs": tk.BooleanVar(),
+                "storage_dtype": tk.StringVar(),
             },
             "plots": {
                 "make_plots": tk.BooleanVar(),
@@ -60,37 +78,50 @@ class ConfigForm(ctk.CTkFrame):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
         
-        # Tabview (replaces Notebook)
-        self.tabview = ctk.CTkTabview(self)
+        # Tabview (replaces Notebook); tab contents are built the first time a tab is shown
+        self.tabview = ctk.CTkTabview(self, command=self._on_tab_changed)
         self.tabview.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
         
-        # Create tabs
-        self.tabview.add("Geometry")
-        self.tabview.add("Operation")
-        self.tabview.add("CF Model")
-        self.tabview.add("Builder")
-        self.tabview.add("Mass")
-        self.tabview.add("I/O")
-        self.tabview.add("Plots")
+        self._tab_builders = {
+            "Geometry": self._build_geometry_tab,
+            "Operation": self._build_operation_tab,
+            "CF Model": self._build_cf_tab,
+            "Builder": self._build_builder_tab,
+            "Mass": self._build_mass_tab,
+            "I/O": self._build_io_tab,
+            "Plots": self._build_plots_tab,
+        }
+        for name in self._tab_builders:
+            self.tabview.add(name)
+        self.mass_sigma_entry = None
+        self.mass_rho_entry = None
+        self.mass_tskin_entry = None
+        self._ensure_tab(self.tabview.get())
 
-        # Geometry
-        tab_geom = self.tabview.tab("Geometry")
+    def _on_tab_changed(self):
+        self._ensure_tab(self.tabview.get())
+
+    def _ensure_tab(self, name):
+        """Build the widgets of tab name once (the Tk variables exist from the start)."""
+        build = self._tab_builders.pop(name, None)
+        if build is not None:
+            build(self.tabview.tab(name))
+
+    def _build_geometry_tab(self, tab_geom):
         self._form_grid(tab_geom, [
             ("Length [m]", self.cfg_vars["geom"]["l"]),
             ("Diameter [m]", self.cfg_vars["geom"]["d"]),
             ("Base ratio", self.cfg_vars["geom"]["base_ratio"]),
         ])
 
-        # Operation
-        tab_op = self.tabview.tab("Operation")
+    def _build_operation_tab(self, tab_op):
         self._form_grid(tab_op, [
             ("Velocity V [m/s]", self.cfg_vars["op"]["V"]),
             ("Density rho [kg/m³]", self.cfg_vars["op"]["rho"]),
             ("Kinematic viscosity nu [m²/s]", self.cfg_vars["op"]["nu"]),
         ])
 
-        # Cf Model
-        tab_cf = self.tabview.tab("CF Model")
+    def _build_cf_tab(self, tab_cf):
         ctk.CTkLabel(tab_cf, text="Mode").grid(row=0, column=0, sticky="w", padx=10, pady=5)
         mode_cb = ctk.CTkComboBox(tab_cf, variable=self.cfg_vars["cf_model"]["mode"], values=["laminar", "transition", "turbulent"], state="readonly")
         mode_cb.grid(row=0, column=1, sticky="ew", padx=10, pady=5)
@@ -98,8 +129,7 @@ class ConfigForm(ctk.CTkFrame):
         self._form_row(tab_cf, 1, "Transition k", self.cfg_vars["cf_model"]["k_transition"])
         self._form_row(tab_cf, 2, "3D correction", self.cfg_vars["cf_model"]["threeD_correction"])
 
-        # Builder
-        tab_bld = self.tabview.tab("Builder")
+    def _build_builder_tab(self, tab_bld):
         rows = [
             ("Nose length fraction", self.cfg_vars["builder"]["Ln_frac"]),
             ("Haack C", self.cfg_vars["builder"]["C_haack"]),
@@ -113,12 +143,8 @@ class ConfigForm(ctk.CTkFrame):
         cb = ctk.CTkCheckBox(tab_bld, text="Limit tail angle", variable=self.cfg_vars["builder"]["enforce_tail_angle"])
         cb.grid(row=len(rows), column=0, columnspan=2, sticky="w", padx=10, pady=5)
 
-        # Mass
-        tab_mass = self.tabview.tab("Mass")
+    def _build_mass_tab(self, tab_mass):
         tab_mass.grid_columnconfigure(1, weight=1)
-        self.mass_sigma_entry = None
-        self.mass_rho_entry = None
-        self.mass_tskin_entry = None
         cb_usd = ctk.CTkCheckBox(tab_mass, text="Use surface density", variable=self.cfg_vars["mass"]["use_surface_density"], command=self._toggle_mass_mode)
         cb_usd.grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
         self._form_row(tab_mass, 1, "Surface density sigma [kg/m²]", self.cfg_vars["mass"]["sigma_surface"], entry_ref_attr="mass_sigma_entry")
@@ -127,9 +153,9 @@ class ConfigForm(ctk.CTkFrame):
         cb_base = ctk.CTkCheckBox(tab_mass, text="Include base disk area", variable=self.cfg_vars["mass"]["include_base_disk_area"])
         cb_base.grid(row=4, column=0, columnspan=2, sticky="w", padx=10, pady=5)
         self._form_row(tab_mass, 5, "Gravity g [m/s²]", self.cfg_vars["mass"]["g"])
+        self._toggle_mass_mode()
 
-        # I/O
-        tab_io = self.tabview.tab("I/O")
+    def _build_io_tab(self, tab_io):
         tab_io.grid_columnconfigure(1, weight=1)
         cb_csv = ctk.CTkCheckBox(tab_io, text="Export CSV", variable=self.cfg_vars["io"]["export_csv"])
         cb_csv.grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
@@ -137,9 +163,17 @@ class ConfigForm(ctk.CTkFrame):
         e_csv = ctk.CTkEntry(tab_io, textvariable=self.cfg_vars["io"]["csv_path"])
         e_csv.grid(row=1, column=1, sticky="ew", padx=10, pady=5)
         ctk.CTkButton(tab_io, text="Browse…", command=self._browse_csv_path, width=80).grid(row=1, column=2, sticky="w", padx=(0,10), pady=5)
+        ctk.CTkLabel(tab_io, text="Results format").grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        fmt_cb = ctk.CTkComboBox(tab_io, variable=self.cfg_vars["io"]["results_format"], values=["json", "compact", "both"], state="readonly")
+        fmt_cb.grid(row=2, column=1, sticky="ew", padx=10, pady=5)
+        ctk.CTkLabel(tab_io, text="Run index (empty = off)").grid(row=3, column=0, sticky="w", padx=10, pady=5)
+        ctk.CTkEntry(tab_io, textvariable=self.cfg_vars["io"]["run_index"]).grid(row=3, column=1, sticky="ew", padx=10, pady=5)
+        cb_rundirs = ctk.CTkCheckBox(tab_io, text="Per-run output folders (results/runs)", variable=self.cfg_vars["io"]["run_dirs"])
+        cb_rundirs.grid(row=4, column=0, columnspan=2, sticky="w", padx=10, pady=5)
+        ctk.CTkLabel(tab_io, text="Storage dtype").grid(row=5, column=0, sticky="w", padx=10, pady=5)
+        ctk.CTkComboBox(tab_io, variable=self.cfg_vars["io"]["storage_dtype"], values=["float64", "float32"], state="readonly").grid(row=5, column=1, sticky="ew", padx=10, pady=5)
 
-        # Plots
-        tab_plots = self.tabview.tab("Plots")
+    def _build_plots_tab(self, tab_plots):
         tab_plots.grid_columnconfigure(1, weight=1)
         cb_plots = ctk.CTkCheckBox(tab_plots, text="Make plots", variable=self.cfg_vars["plots"]["make_plots"])
         cb_plots.grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
@@ -189,6 +223,8 @@ class ConfigForm(ctk.CTkFrame):
     def load_from_dict(self, cfg):
         def s(v):
             return "" if v is None else (str(v))
+        self._extra_sections = {k: v for k, v in cfg.items() if k not in self.cfg_vars}
+        self._loading = True
         try:
             g = cfg.get("geom", {})
             self.cfg_vars["geom"]["l"].set(s(g.get("l", "")))
@@ -226,11 +262,16 @@ class ConfigForm(ctk.CTkFrame):
             io = cfg.get("io", {})
             self.cfg_vars["io"]["export_csv"].set(bool(io.get("export_csv", True)))
             self.cfg_vars["io"]["csv_path"].set(io.get("csv_path", "results/data/fuselaje_xy.csv"))
+            self.cfg_vars["io"]["results_format"].set(io.get("results_format", "json"))
+            self.cfg_vars["io"]["run_index"].set(io.get("run_index", "results/runs.sqlite"))
+            self.cfg_vars["io"]["run_dirs"].set(bool(io.get("run_dirs", True)))
+            self.cfg_vars["io"]["storage_dtype"].set(io.get("storage_dtype", "float64"))
 
             pl = cfg.get("plots", {})
             self.cfg_vars["plots"]["make_plots"].set(bool(pl.get("make_plots", True)))
             self.cfg_vars["plots"]["dpi"].set(s(pl.get("dpi", 140)))
         finally:
+            self._loading = False
             self._toggle_mass_mode()
 
     def get_config(self):
@@ -283,10 +324,16 @@ class ConfigForm(ctk.CTkFrame):
             "io": {
                 "export_csv": bool(self.cfg_vars["io"]["export_csv"].get()),
                 "csv_path": self.cfg_vars["io"]["csv_path"].get() or "results/data/fuselaje_xy.csv",
+                "results_format": (self.cfg_vars["io"]["results_format"].get() or "json"),
+                "run_index": self.cfg_vars["io"]["run_index"].get().strip(),
+                "run_dirs": bool(self.cfg_vars["io"]["run_dirs"].get()),
+                "storage_dtype": (self.cfg_vars["io"]["storage_dtype"].get() or "float64"),
             },
             "plots": {
                 "make_plots": bool(self.cfg_vars["plots"]["make_plots"].get()),
                 "dpi": to_int("DPI", self.cfg_vars["plots"]["dpi"].get()),
             },
         }
+        for k, v in self._extra_sections.items():
+            cfg.setdefault(k, v)
         return cfg
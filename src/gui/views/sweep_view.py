@@ -0,0 +1,265 @@
+# src/gui/views/sweep_view.py
+# Sweep plots for the CustomTkinter app: any numeric input (geometry, operating point, Cf model,
+# builder, mass) swept with the batch engine on the GUI worker, coarse curve first, then dense.
+from __future__ import annotations
+import time
+import tkinter as tk
+import customtkinter as ctk
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from src.batch import INPUT_SPEC, MODES, OUTPUTS, DesignBatch, evaluate_batch
+from src.pipeline import run_batch
+
+LD = "l/d"  # derived sweep variable: l = (l/d) * d with d fixed (as the legacy l/d sweep)
+SWEEP_VARS = (LD,) + tuple(k for k, (_, _, dt) in INPUT_SPEC.items() if dt in (np.float64, np.int64))
+COARSE_POINTS = 48       # first pass, drawn as soon as it is ready
+DEFAULT_POINTS = 2000
+MAX_POINTS = 200_000
+MODE_COLORS = {"laminar": "#22c55e", "transition": "#f59e0b", "turbulent": "#00aaff"}
+
+
+def default_range(var: str, cfg: dict) -> tuple:
+    """Initial (from, to) for a sweep variable around the current configuration."""
+    if var == LD:
+        return 1.5, 12.0
+    if var == "base_ratio":
+        return 0.0, 0.8
+    if var == "r_tip":
+        return 0.0, 0.25 * float(cfg["geom"]["d"])
+    sec, key, dt = INPUT_SPEC[var]
+    v = float(cfg[sec][key])
+    if var == "V":
+        return max(0.1, 0.25 * v), 2.5 * v
+    if var == "threeD_correction":
+        return 0.8 * v, 1.3 * v
+    if var in ("Ln_frac", "Lt_frac"):
+        return 0.5 * v, min(1.5 * v, 0.95)
+    if dt is np.int64:
+        return max(10, int(0.5 * v)), max(20, int(1.5 * v))
+    if v == 0.0:
+        return 0.0, 1.0
+    return 0.5 * v, 1.5 * v
+
+
+def sweep_axis(var: str, lo: float, hi: float, n: int) -> np.ndarray:
+    """n equally spaced values (integer inputs are rounded and de-duplicated)."""
+    grid = np.linspace(lo, hi, int(n))
+    if var != LD and INPUT_SPEC[var][2] is np.int64:
+        grid = np.unique(np.round(grid))
+    return grid
+
+
+def sweep_batch(cfg: dict, var: str, grid: np.ndarray, modes=None) -> DesignBatch:
+    """The (unevaluated) DesignBatch of cfg swept over grid, one block of rows per Cf mode in modes."""
+    axes = {"cf_mode": list(modes)} if modes else {}
+    if var == LD:
+        axes["l"] = grid * float(cfg["geom"]["d"])
+    else:
+        axes[var] = grid
+    return DesignBatch.from_grid(cfg, axes)  # cf_mode first: rows are grouped per mode
+
+
+def evaluate_sweep(cfg: dict, var: str, grid: np.ndarray, modes=None, token=None, progress=None,
+                   chunk: int = 0) -> dict:
+    """
+    Evaluate cfg swept over grid in one batch; returns {curve label: {output: array}}.
+
+    modes (e.g. MODES) adds one curve per Cf mode; otherwise the single curve is labelled
+    with the configured mode. token / progress / chunk are passed to evaluate_batch.
+    """
+    batch = sweep_batch(cfg, var, grid, modes)
+    evaluate_batch(batch, chunk=chunk, token=token, progress=progress)
+    n = len(grid)
+    labels = tuple(modes) if modes else (cfg["cf_model"]["mode"],)
+    return {m: {k: v[i * n:(i + 1) * n] for k, v in batch.outputs.items()} for i, m in enumerate(labels)}
+
+
+class SweepView(ctk.CTkFrame):
+    """
+    Sweep panel: variable, range, resolution and output are chosen in the toolbar.
+
+    get_config() must return a validated configuration (the form, through normalize_config);
+    sweeps run on executor under the "sweep" key, so a new sweep replaces a running one.
+    "Save sweep" stores the sweep on screen with pipeline.run_batch (one compact result,
+    indexed) under the "save_sweep" key.
+    """
+
+    def __init__(self, parent, executor, get_config, *args, **kwargs):
+        super().__init__(parent, *args, **kwargs)
+        self._executor = executor
+        self._get_config = get_config
+        self._result = None  # (variable, x, curves, dense) on screen
+        self._request = None  # (cfg, variable, grid, modes) of the full-resolution sweep on screen
+        self._lines = {}
+
+        self.grid_rowconfigure(2, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self._build_controls()
+        self._build_plot()
+
+    def _build_controls(self):
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 0))
+
+        self.var_var = tk.StringVar(value="V")
+        self.from_var = tk.StringVar()
+        self.to_var = tk.StringVar()
+        self.points_var = tk.StringVar(value=str(DEFAULT_POINTS))
+        self.output_var = tk.StringVar(value="CD_total")
+        self.modes_var = tk.BooleanVar(value=False)
+
+        ctk.CTkLabel(bar, text="Sweep").pack(side="left", padx=(0, 5))
+        ctk.CTkComboBox(bar, values=list(SWEEP_VARS), variable=self.var_var, width=150,
+                        command=lambda _: self._reset_range()).pack(side="left", padx=5)
+        ctk.CTkLabel(bar, text="from").pack(side="left", padx=(5, 2))
+        ctk.CTkEntry(bar, textvariable=self.from_var, width=80).pack(side="left")
+        ctk.CTkLabel(bar, text="to").pack(side="left", padx=(5, 2))
+        ctk.CTkEntry(bar, textvariable=self.to_var, width=80).pack(side="left")
+        ctk.CTkLabel(bar, text="points").pack(side="left", padx=(5, 2))
+        ctk.CTkEntry(bar, textvariable=self.points_var, width=70).pack(side="left")
+        ctk.CTkLabel(bar, text="plot").pack(side="left", padx=(10, 2))
+        ctk.CTkComboBox(bar, values=list(OUTPUTS), variable=self.output_var, width=120,
+                        command=lambda _: self._redraw()).pack(side="left")
+        ctk.CTkCheckBox(bar, text="All Cf modes", variable=self.modes_var).pack(side="left", padx=10)
+        ctk.CTkButton(bar, text="Run sweep", width=100, command=self._on_sweep_clicked).pack(side="left", padx=5)
+        self.btn_save = ctk.CTkButton(bar, text="Save sweep", width=100, state="disabled",
+                                      command=self._on_save_clicked)
+        self.btn_save.pack(side="left", padx=5)
+
+        self.status_var = tk.StringVar(value="")
+        ctk.CTkLabel(self, textvariable=self.status_var, text_color="gray70", anchor="w").grid(
+            row=1, column=0, sticky="ew", padx=10, pady=(2, 0))
+
+    def _build_plot(self):
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.fig.patch.set_facecolor("#1a1a1a")
+        self.ax.set_facecolor("#1a1a1a")
+        self.ax.tick_params(colors="white")
+        for spine in self.ax.spines.values():
+            spine.set_color("gray")
+        self.ax.xaxis.label.set_color("white")
+        self.ax.yaxis.label.set_color("white")
+        self.ax.grid(True, alpha=0.3)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().grid(row=2, column=0, sticky="nsew")
+        self.canvas.get_tk_widget().configure(highlightthickness=0, bd=0)
+
+    def _reset_range(self):
+        """Fill from/to with the default range of the chosen variable around the form values."""
+        try:
+            lo, hi = default_range(self.var_var.get(), self._get_config())
+        except Exception:
+            return
+        self.from_var.set(f"{lo:.6g}")
+        self.to_var.set(f"{hi:.6g}")
+
+    def _on_sweep_clicked(self):
+        if not self.from_var.get() or not self.to_var.get():
+            self._reset_range()
+        try:
+            cfg = self._get_config()
+            var = self.var_var.get()
+            if var not in SWEEP_VARS:
+                raise ValueError(f"unknown sweep variable '{var}'")
+            lo, hi = float(self.from_var.get()), float(self.to_var.get())
+            n = int(self.points_var.get())
+            if not 2 <= n <= MAX_POINTS:
+                raise ValueError(f"points must be between 2 and {MAX_POINTS}")
+            if lo == hi:
+                raise ValueError("empty range")
+        except Exception as e:
+            self.status_var.set(f"Sweep: {e}")
+            return
+
+        modes = MODES if self.modes_var.get() else None
+        grid = sweep_axis(var, lo, hi, n)
+        self._request = None
+        self.btn_save.configure(state="disabled")
+        coarse = grid if grid.size <= COARSE_POINTS else sweep_axis(var, lo, hi, COARSE_POINTS)
+        self.status_var.set(f"Sweep: {coarse.size} points...")
+        t0 = time.perf_counter()
+        self._executor.submit(
+            "sweep", lambda token, progress: evaluate_sweep(cfg, var, coarse, modes, token),
+            on_done=lambda curves: self._on_coarse_done(cfg, var, grid, coarse, modes, curves, t0),
+            on_error=self._on_sweep_failed,
+        )
+
+    def _on_coarse_done(self, cfg, var, grid, coarse, modes, curves, t0):
+        dense = coarse is grid
+        self._show(var, coarse, curves, dense)
+        if dense:
+            self._set_request(cfg, var, grid, modes)
+            self.status_var.set(f"Sweep: {grid.size} points in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+            return
+        # Refine: same request at full resolution, in chunks (cancellable, with progress)
+        rows = grid.size * (len(modes) if modes else 1)
+        chunk = max(256, rows // 20)
+        self._executor.submit(
+            "sweep",
+            lambda token, progress: evaluate_sweep(
+                cfg, var, grid, modes, token, lambda done, total: progress(done / total, f"{done}/{total}"), chunk),
+            on_done=lambda curves: self._on_dense_done(cfg, var, grid, modes, curves, t0),
+            on_error=self._on_sweep_failed,
+            on_progress=lambda frac, msg: self.status_var.set(f"Sweep: refining {msg} ({frac:.0%})"),
+        )
+
+    def _on_dense_done(self, cfg, var, grid, modes, curves, t0):
+        self._show(var, grid, curves, True)
+        self._set_request(cfg, var, grid, modes)
+        self.status_var.set(f"Sweep: {grid.size} points in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+    def _set_request(self, cfg, var, grid, modes):
+        self._request = (cfg, var, grid, modes)
+        self.btn_save.configure(state="normal")
+
+    def _on_save_clicked(self):
+        """Store the sweep on screen as one compact result (run folder, run index, retention)."""
+        if self._request is None:
+            return
+        cfg, var, grid, modes = self._request
+        rows = grid.size * (len(modes) if modes else 1)
+        self.status_var.set(f"Sweep: saving {rows} rows...")
+        self._executor.submit(
+            "save_sweep",
+            lambda token, progress: run_batch(cfg, sweep_batch(cfg, var, grid, modes), token, progress,
+                                              chunk=max(256, rows // 20)),
+            on_done=lambda path: self.status_var.set(f"Sweep: saved {rows} rows to {path}"),
+            on_error=lambda exc, err: self.status_var.set(f"Sweep: save failed: {exc}"),
+            on_progress=lambda frac, msg: self.status_var.set(f"Sweep: saving {msg} ({frac:.0%})"),
+        )
+
+    def _on_sweep_failed(self, exc, err):
+        self.status_var.set(f"Sweep: {exc}")
+
+    def _show(self, var, x, curves, dense):
+        self._result = (var, x, curves, dense)
+        self._redraw()
+
+    def _redraw(self):
+        """Update the persistent lines for the selected output (no recompute)."""
+        if self._result is None:
+            return
+        var, x, curves, dense = self._result
+        out = self.output_var.get()
+        for label in list(self._lines):
+            if label not in curves:
+                self._lines.pop(label).remove()
+        for label, cols in curves.items():
+            line = self._lines.get(label)
+            if line is None:
+                (line,) = self.ax.plot([], [], lw=1.6, label=label, color=MODE_COLORS.get(label))
+                self._lines[label] = line
+            line.set_data(x, cols.get(out, np.full(len(x), np.nan)))
+            line.set_linestyle("-" if dense else "--")
+        self.ax.set_xlabel(var)
+        self.ax.set_ylabel(out)
+        if len(curves) > 1:
+            self.ax.legend(facecolor="#1a1a1a", edgecolor="gray", labelcolor="white")
+        elif self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
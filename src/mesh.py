@@ -0,0 +1,393 @@
+# src/mesh.py
+# Revolution kernel shared by the mesh exporters, the viewers and the legacy 3D paths.
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+import numpy as np
+
+
+def _ring_counts(r: np.ndarray, n_theta: int, chord_tol: float | None, max_edge: float | None, n_min: int) -> np.ndarray:
+    """Angular segments per ring: n_theta, or the fewest meeting chord_tol / max_edge (clipped to [n_min, n_theta])."""
+    r = np.abs(r)
+    if chord_tol is None and max_edge is None:
+        return np.full(r.size, n_theta, dtype=np.int64)
+    need = np.zeros(r.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if chord_tol is not None:
+            # Sagitta of one segment: r * (1 - cos(pi/n)) <= chord_tol
+            c = np.clip(1.0 - chord_tol / np.maximum(r, 1e-300), -1.0, 1.0)
+            need = np.maximum(need, np.where(c > -1.0, np.pi / np.arccos(c), 0.0))
+        if max_edge is not None:
+            # Chord length: 2 r sin(pi/n) <= max_edge
+            s = np.clip(max_edge / np.maximum(2.0 * r, 1e-300), 0.0, 1.0)
+            need = np.maximum(need, np.where(s < 1.0, np.pi / np.arcsin(s), 0.0))
+    need = np.nan_to_num(need, nan=0.0, posinf=float(n_theta))
+    return np.clip(np.ceil(need - 1e-9), max(3, n_min), n_theta).astype(np.int64)
+
+
+def _strip_pattern(ca: int, cb: int) -> np.ndarray:
+    """
+    Triangles joining a ring of ca vertices to the next ring of cb vertices (both start at theta=0).
+
+    Local indices: [0, ca) on ring A, [ca, ca + cb) on ring B. The two rings are merged by
+    angle, advancing whichever has the smaller next angle, which gives ca + cb triangles for
+    any pair of counts (rings of one vertex are poles and produce a plain fan).
+    """
+    if ca == 1 and cb == 1:
+        return np.empty((0, 3), dtype=np.int64)
+    key_a = np.arange(1, ca + 1) * cb
+    key_b = np.arange(1, cb + 1) * ca
+    order = np.argsort(np.concatenate([key_a, key_b]), kind="stable")  # ties: A first
+    is_a = order < ca
+    ia = np.cumsum(is_a) - is_a
+    ib = np.cumsum(~is_a) - ~is_a
+    tri = np.where(
+        is_a[:, None],
+        np.stack([ia % ca, (ia + 1) % ca, ca + ib % cb], axis=-1),
+        np.stack([ia % ca, ca + (ib + 1) % cb, ca + ib % cb], axis=-1),
+    )
+    # A pole (one vertex) cannot advance without producing a zero-area triangle
+    if ca == 1:
+        tri = tri[~is_a]
+    elif cb == 1:
+        tri = tri[is_a]
+    return tri
+
+
+@lru_cache(maxsize=32)
+def trig_table(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """cos/sin of n equally spaced angles in [0, 2pi), shared by every mesh built with n segments."""
+    theta = np.linspace(0.0, 2.0*np.pi, num=n, endpoint=False)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    cos_t.flags.writeable = False
+    sin_t.flags.writeable = False
+    return cos_t, sin_t
+
+
+def _revolve(x, r, n_theta: int, collapse_poles: bool, cap_ends: bool, with_normals: bool, fname: str,
+             chord_tol: float | None = None, max_edge: float | None = None, n_min: int = 8,
+             dtype=np.float64):
+    """
+    Shared layout for revolve_profile_to_mesh / revolve_profile_normals.
+
+    Vertex order: rings in station order (a collapsed pole is a ring of one vertex) + [cap centres].
+    Zero-radius end stations collapse to one pole vertex joined by a triangle fan;
+    with cap_ends, non-zero end rings are closed with a flat fan around a centre vertex.
+    Computed in float64; V and N are returned as `dtype`.
+    """
+    x = np.asarray(x, dtype=float)
+    r = np.asarray(r, dtype=float)
+    if x.ndim != 1 or r.ndim != 1 or x.size != r.size or x.size < 2:
+        raise ValueError(f"{fname}: x and r must be 1D arrays with same length >= 2")
+    if n_theta < 3:
+        raise ValueError(f"{fname}: n_theta must be >= 3")
+    if (chord_tol is not None and chord_tol <= 0) or (max_edge is not None and max_edge <= 0):
+        raise ValueError(f"{fname}: chord_tol and max_edge must be > 0")
+
+    # Drop repeated stations (segment joins can repeat a point) to avoid zero-area strips
+    scale = max(float(np.ptp(x)), float(np.max(np.abs(r))), 1e-300)
+    tol = 1e-12 * scale
+    keep = np.ones(x.size, dtype=bool)
+    keep[1:] = (np.abs(np.diff(x)) > tol) | (np.abs(np.diff(r)) > tol)
+    if not keep.all():
+        x = x[keep]; r = r[keep]
+        if x.size < 2:
+            raise ValueError(f"{fname}: profile collapses to a single station")
+
+    counts = _ring_counts(r, n_theta, chord_tol, max_edge, n_min)
+    pole0 = collapse_poles and abs(r[0]) <= tol
+    pole1 = collapse_poles and abs(r[-1]) <= tol
+    if pole0:
+        counts[0] = 1
+    if pole1:
+        counts[-1] = 1
+    cap0 = cap_ends and not pole0
+    cap1 = cap_ends and not pole1
+
+    offsets = np.zeros(x.size + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    n_ring_v = int(offsets[-1])
+    cap0_id = n_ring_v
+    cap1_id = cap0_id + (1 if cap0 else 0)
+    n_vert = cap1_id + (1 if cap1 else 0)
+
+    # Per-vertex station index and angle table, filled one ring-count group at a time
+    station = np.repeat(np.arange(x.size), counts)
+    cos_v = np.empty(n_ring_v)
+    sin_v = np.empty(n_ring_v)
+    for c in np.unique(counts):
+        rings = np.flatnonzero(counts == c)
+        cos_t, sin_t = trig_table(int(c))
+        idx = (offsets[rings][:, None] + np.arange(c)).ravel()
+        cos_v[idx] = np.tile(cos_t, rings.size)
+        sin_v[idx] = np.tile(sin_t, rings.size)
+
+    V = np.zeros((n_vert, 3), dtype=float)
+    V[:n_ring_v, 0] = x[station]
+    V[:n_ring_v, 1] = r[station] * cos_v
+    V[:n_ring_v, 2] = r[station] * sin_v
+    if cap0:
+        V[cap0_id, 0] = x[0]
+    if cap1:
+        V[cap1_id, 0] = x[-1]
+
+    # Faces, counter-clockwise seen from outside (outward normals). Strips sharing the same
+    # pair of ring counts share one local pattern, offset per strip.
+    blocks = []
+    pair = counts[:-1] * (n_theta + 1) + counts[1:]
+    for p in np.unique(pair):
+        strips = np.flatnonzero(pair == p)
+        ca, cb = int(counts[strips[0]]), int(counts[strips[0] + 1])
+        pat = _strip_pattern(ca, cb)  # ring B directly follows ring A, so local == offset from A
+        blocks.append((offsets[strips][:, None, None] + pat[None, :, :]).reshape(-1, 3))
+    if cap0:
+        c = int(counts[0])
+        pat = _strip_pattern(1, c)
+        blocks.append(np.where(pat < 1, cap0_id, pat - 1 + offsets[0]))
+    if cap1:
+        c = int(counts[-1])
+        pat = _strip_pattern(c, 1)
+        blocks.append(np.where(pat < c, pat + offsets[-2], cap1_id))
+    F = np.concatenate(blocks, axis=0).astype(np.int32) if blocks else np.empty((0, 3), dtype=np.int32)
+
+    if not with_normals:
+        return V.astype(dtype, copy=False), F, None
+
+    # Analytic normals n = (-dr/dx, cos, sin)/sqrt(1 + (dr/dx)^2), written with the
+    # meridian tangent (dx, dr) so vertical segments (nose) stay finite.
+    dx = np.gradient(x)
+    dr = np.gradient(r)
+    t = np.hypot(dx, dr)
+    t[t == 0.0] = 1.0
+    nx = -dr / t
+    nr = dx / t
+    N = np.zeros_like(V)
+    N[:n_ring_v, 0] = nx[station]
+    N[:n_ring_v, 1] = nr[station] * cos_v
+    N[:n_ring_v, 2] = nr[station] * sin_v
+    if pole0:
+        N[0] = (-1.0, 0.0, 0.0)
+    if pole1:
+        N[n_ring_v - 1] = (1.0, 0.0, 0.0)
+    if cap0:
+        N[cap0_id, 0] = -1.0
+    if cap1:
+        N[cap1_id, 0] = 1.0
+    return V.astype(dtype, copy=False), F, N.astype(dtype, copy=False)
+
+
+def revolve_mesh(x: np.ndarray, r: np.ndarray, n_theta: int = 128, collapse_poles: bool = True,
+                 cap_ends: bool = False, normals: bool = False,
+                 chord_tol: float | None = None, max_edge: float | None = None, dtype=np.float64):
+    """
+    Revolution kernel: indexed mesh of the profile (x, r) around the x-axis.
+
+    Returns (V, F, N) with N the analytic per-vertex normals, or None if normals=False.
+    V/N are `dtype` (float32 halves viewer/export buffers). See revolve_profile_to_mesh
+    for the meaning of the options.
+    """
+    return _revolve(x, r, n_theta, collapse_poles, cap_ends, normals, "revolve_mesh",
+                    chord_tol=chord_tol, max_edge=max_edge, dtype=dtype)
+
+
+def revolve_grid(x: np.ndarray, r: np.ndarray, n_theta: int = 64, closed: bool = True, dtype=np.float64):
+    """
+    Structured (stations x angles) X, Y, Z grids of the revolved profile, for wireframes/surfaces.
+
+    closed=True repeats the theta=0 column at the end so plotted rings close.
+    """
+    x = np.asarray(x, dtype=float)
+    r = np.asarray(r, dtype=float)
+    cos_t, sin_t = trig_table(int(n_theta))
+    if closed:
+        cos_t = np.append(cos_t, cos_t[0])
+        sin_t = np.append(sin_t, sin_t[0])
+    X = np.broadcast_to(x.astype(dtype, copy=False)[:, None], (x.size, cos_t.size))
+    Y = (r[:, None] * cos_t[None, :]).astype(dtype, copy=False)
+    Z = (r[:, None] * sin_t[None, :]).astype(dtype, copy=False)
+    return X, Y, Z
+
+
+def wireframe_lines(x: np.ndarray, r: np.ndarray, n_rings: int, n_meridians: int, ring_pts: int = 64,
+                    max_stations: int | None = None, dtype=None):
+    """
+    Only the polylines a wireframe draws, without building the stations x angles grid.
+
+    Rings (constant x, closed, ring_pts segments) sit at n_rings stations and meridians
+    (n_meridians equally spaced angles) follow at most max_stations stations, both picked
+    by decimate_profile. Returns (rings (n, ring_pts + 1, 3), meridians (n_meridians, m, 3)).
+    """
+    dtype = _lod_dtype(x) if dtype is None else np.dtype(dtype)
+    x = np.asarray(x, dtype=float)
+    r = np.asarray(r, dtype=float)
+
+    ir = decimate_profile(x, r, max(2, int(n_rings)))
+    cos_t, sin_t = trig_table(int(ring_pts))
+    cos_t = np.append(cos_t, cos_t[0])
+    sin_t = np.append(sin_t, sin_t[0])
+    rings = np.empty((ir.size, cos_t.size, 3), dtype=dtype)
+    rings[..., 0] = x[ir, None]
+    rings[..., 1] = r[ir, None] * cos_t
+    rings[..., 2] = r[ir, None] * sin_t
+
+    im = decimate_profile(x, r, max_stations)
+    cos_m, sin_m = trig_table(int(n_meridians))
+    meridians = np.empty((cos_m.size, im.size, 3), dtype=dtype)
+    meridians[..., 0] = x[im]
+    meridians[..., 1] = cos_m[:, None] * r[im]
+    meridians[..., 2] = sin_m[:, None] * r[im]
+    return rings, meridians
+
+
+def revolve_profile_to_mesh(x: np.ndarray, r: np.ndarray, n_theta: int = 128,
+                            collapse_poles: bool = True, cap_ends: bool = False,
+                            chord_tol: float | None = None, max_edge: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Create a triangular surface mesh by revolving the profile (x, r) around the x-axis.
+
+    Zero-radius end stations (nose, sharp tail) become a single pole vertex with a
+    triangle fan instead of a ring of coincident vertices. cap_ends closes non-zero
+    end radii (e.g. r_tip > 0) with flat discs so the mesh is watertight.
+
+    Radius-adaptive mode: with chord_tol (max distance between chord and circle) and/or
+    max_edge (max ring edge length), each ring gets the fewest segments meeting the
+    target, capped at n_theta; rings of different counts are stitched by angle.
+
+    Returns (V, F):
+    - V: float64 array (N, 3) of vertices
+    - F: int32 array (M, 3) of triangle vertex indices
+    """
+    V, F, _ = _revolve(x, r, n_theta, collapse_poles, cap_ends, False, "revolve_profile_to_mesh",
+                       chord_tol=chord_tol, max_edge=max_edge)
+    return V, F
+
+
+def revolve_profile_normals(x: np.ndarray, r: np.ndarray, n_theta: int = 128,
+                            collapse_poles: bool = True, cap_ends: bool = False,
+                            chord_tol: float | None = None, max_edge: float | None = None) -> np.ndarray:
+    """
+    Per-vertex unit normals for the revolve_profile_to_mesh layout (same arguments).
+
+    Computed analytically from the meridian slope dr/dx and theta; poles and cap
+    centres get the axial normal (-x at the nose, +x at the tail).
+    """
+    _, _, N = _revolve(x, r, n_theta, collapse_poles, cap_ends, True, "revolve_profile_normals",
+                       chord_tol=chord_tol, max_edge=max_edge)
+    return N
+
+
+# --- Level-of-detail meshes ---
+
+class MeshLOD(NamedTuple):
+    """
+    One level of detail of a revolved profile.
+
+    x, r: decimated profile stations; X, Y, Z: closed-seam grid (len(x), n_theta + 1)
+    for wireframe/surface plots; V, F: indexed triangle mesh with collapsed poles.
+    """
+    name: str
+    n_theta: int
+    x: np.ndarray
+    r: np.ndarray
+    X: np.ndarray
+    Y: np.ndarray
+    Z: np.ndarray
+    V: np.ndarray
+    F: np.ndarray
+
+
+# name -> (n_theta, max_stations); None keeps every profile station
+LOD_LEVELS = {
+    "viewer": (64, 160),
+    "export": (128, None),
+}
+
+_LOD_CACHE: "OrderedDict[str, MeshLOD]" = OrderedDict()  # one entry per (profile, level)
+_LOD_CACHE_SIZE = 16
+_LOD_LOCK = threading.Lock()
+
+
+def profile_hash(x: np.ndarray, r: np.ndarray) -> str:
+    """Content hash of a profile, used as cache key for derived geometry."""
+    h = hashlib.blake2b(digest_size=16)
+    for a in (x, r):
+        a = np.ascontiguousarray(a, dtype=float)
+        h.update(str(a.shape).encode("ascii"))
+        h.update(a.tobytes())
+    return h.hexdigest()
+
+
+def decimate_profile(x: np.ndarray, r: np.ndarray, max_stations: int | None) -> np.ndarray:
+    """
+    Indices of at most max_stations profile stations, spent where the meridian bends.
+
+    Each segment is weighted half by its length and half by the turning angle at its
+    ends; stations are placed at equal steps of the cumulative weight. Ends are kept.
+    """
+    x = np.asarray(x, dtype=float)
+    r = np.asarray(r, dtype=float)
+    n = x.size
+    if max_stations is None or n <= max_stations:
+        return np.arange(n)
+    if max_stations < 2:
+        raise ValueError("decimate_profile: max_stations must be >= 2")
+
+    dx = np.diff(x); dr = np.diff(r)
+    seg = np.hypot(dx, dr)
+    phi = np.arctan2(dr, dx)
+    turn = np.abs(np.diff(phi))
+    turn_seg = np.zeros(n - 1)
+    turn_seg[:-1] += 0.5 * turn
+    turn_seg[1:] += 0.5 * turn
+    w = 0.5 * seg / max(seg.sum(), 1e-300)
+    if turn_seg.sum() > 0:
+        w += 0.5 * turn_seg / turn_seg.sum()
+    W = np.concatenate([[0.0], np.cumsum(w)])
+    idx = np.searchsorted(W, np.linspace(0.0, W[-1], max_stations))
+    idx = np.unique(np.clip(idx, 0, n - 1))
+    idx[0] = 0; idx[-1] = n - 1
+    return np.unique(idx)
+
+
+def _lod_dtype(x) -> np.dtype:
+    """float32 profiles (io.storage_dtype = "float32") give float32 LOD buffers; anything else float64."""
+    return np.dtype(np.float32) if np.asarray(x).dtype == np.float32 else np.dtype(np.float64)
+
+
+def _build_lod(name: str, x: np.ndarray, r: np.ndarray, n_theta: int, max_stations: int | None, dtype) -> MeshLOD:
+    idx = decimate_profile(x, r, max_stations)
+    xs, rs = x[idx], r[idx]
+    V, F, _ = _revolve(xs, rs, n_theta, True, False, False, "fuselage_lod", dtype=dtype)
+    X, Y, Z = revolve_grid(xs, rs, n_theta, closed=True, dtype=dtype)
+    X = np.ascontiguousarray(X)
+    xs = xs.astype(dtype, copy=False); rs = rs.astype(dtype, copy=False)
+    for a in (xs, rs, X, Y, Z, V, F):
+        a.flags.writeable = False  # shared through the cache
+    return MeshLOD(name, int(n_theta), xs, rs, X, Y, Z, V, F)
+
+
+def fuselage_lod(geom: dict, level: str = "viewer") -> MeshLOD:
+    """
+    One cached level of detail of the revolved fuselage (see LOD_LEVELS); only that level is built.
+
+    Buffers are float32 when the profile is float32 (io.storage_dtype), else float64.
+    """
+    n_theta, max_stations = LOD_LEVELS[level]
+    dtype = _lod_dtype(geom["x"])
+    key = f"{profile_hash(geom['x'], geom['y'])}:{level}:{n_theta}:{max_stations}:{dtype.str}"
+    with _LOD_LOCK:
+        lod = _LOD_CACHE.get(key)
+        if lod is not None:
+            _LOD_CACHE.move_to_end(key)
+            return lod
+    x = np.asarray(geom["x"], dtype=float)
+    r = np.asarray(geom["y"], dtype=float)
+    lod = _build_lod(level, x, r, n_theta, max_stations, dtype)
+    with _LOD_LOCK:
+        _LOD_CACHE[key] = lod
+        while len(_LOD_CACHE) > _LOD_CACHE_SIZE:
+            _LOD_CACHE.popitem(last=False)
+    return lod
@@ -1,30 +1,212 @@
 import os
 import json
+import threading
+import time
+from collections import OrderedDict
 import numpy as np
-from . import build, calcs, plots
-from .utils import save_profile_csv, save_results_json
+from . import build, calcs
+from .utils import STORAGE_DTYPES, make_run_dir, save_profile_csv, save_results_json, set_latest_run
+from .records import Payload, Results
+from .batch import DesignBatch, evaluate_batch
+from .resultsio import save_results_compact
+from .runindex import batch_rows, shared_index
+from .retention import apply_retention_cfg
 
 
-def run_case(cfg: dict) -> dict:
-       # 1) Geometría
-    geom = build.build_fuselage(cfg["geom"], cfg["builder"])   # devuelve x,y,R,L,...
+# Caché de geometría para el recálculo interactivo: (l, d, builder) -> {"geom": Profile, "integrals": {...}}
+_GEOM_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+_GEOM_CACHE_SIZE = 16
+_GEOM_LOCK = threading.Lock()
+
+SWEEP_CHUNK = 4096  # filas por bloque en run_batch (puntos de cancelación / progreso)
+_DEFAULT_CSV_DIR = os.path.join("results", "data")  # directorio de io.csv_path por defecto
+
+
+class Cancelled(Exception):
+    """El trabajo se abandonó: su CancelToken se activó entre dos etapas."""
+
+
+class CancelToken:
+    """Cancelación cooperativa: quien ejecuta llama a check() entre etapas; cancel() desde otro hilo."""
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+
+def _check(token) -> None:
+    if token is not None:
+        token.check()
+
+
+def _report(progress, fraction: float, stage: str) -> None:
+    if progress is not None:
+        progress(fraction, stage)
+
+
+def _geom_key(cfg: dict) -> str:
+    return json.dumps([cfg["geom"]["l"], cfg["geom"]["d"], cfg["builder"]], sort_keys=True)
+
+
+def storage_dtype(cfg: dict):
+    """dtype de io.storage_dtype (geometría guardada y enviada a la GUI)."""
+    return STORAGE_DTYPES[cfg["io"].get("storage_dtype", "float64")]
+
+
+def evaluate_case(cfg: dict, token: CancelToken | None = None, dtype=None) -> tuple:
+    """
+    Sólo cálculo (sin E/S): geometría, aerodinámica, integrales y masa de una cfg ya validada.
+
+    Reutiliza la geometría y sus integrales si sólo cambian op / cf_model / masa.
+    Devuelve (Payload, timings) con los tiempos por etapa en ms y si hubo acierto de caché.
+    Con token, lanza Cancelled entre etapas si se canceló. Todo se calcula en float64; con
+    dtype (p. ej. storage_dtype(cfg) en el modo en vivo) la geometría del Payload se entrega
+    convertida, y la conversión se cachea junto a la geometría.
+    """
+    t0 = time.perf_counter()
+    key = _geom_key(cfg)
+    with _GEOM_LOCK:
+        entry = _GEOM_CACHE.get(key)
+        if entry is not None:
+            _GEOM_CACHE.move_to_end(key)
+    cached = entry is not None
+
+    # 1) Geometría
+    if entry is None:
+        entry = {"geom": build.build_fuselage(cfg["geom"], cfg["builder"]), "integrals": {}, "stored": {}}
+        with _GEOM_LOCK:
+            _GEOM_CACHE[key] = entry
+            while len(_GEOM_CACHE) > _GEOM_CACHE_SIZE:
+                _GEOM_CACHE.popitem(last=False)
+    geom = entry["geom"]
+    t1 = time.perf_counter()
+    _check(token)
 
     # 2) Aerodinámica
     aero = calcs.aero_from_geometry(geom, cfg["op"], cfg["cf_model"])
+    t2 = time.perf_counter()
+    _check(token)
 
-    # 3) Integrales geométricas + masa
-    integrals = calcs.geom_integrals(geom, cfg["mass"]["include_base_disk_area"])
+    # 3) Integrales geométricas (por geometría y base incluida o no) + masa
+    include_base = bool(cfg["mass"]["include_base_disk_area"])
+    integrals = entry["integrals"].get(include_base)
+    if integrals is None:
+        integrals = entry["integrals"][include_base] = calcs.geom_integrals(geom, include_base)
+    t3 = time.perf_counter()
     mass = calcs.mass_from_surface(integrals["S_total"], cfg["mass"])
+    t4 = time.perf_counter()
+
+    timings = {
+        "build_ms": (t1 - t0) * 1e3, "aero_ms": (t2 - t1) * 1e3,
+        "integrals_ms": (t3 - t2) * 1e3, "mass_ms": (t4 - t3) * 1e3,
+        "total_ms": (t4 - t0) * 1e3, "geom_cached": cached,
+    }
+    if dtype is not None and np.dtype(dtype) != np.float64:
+        stored = entry["stored"].get(np.dtype(dtype).str)
+        if stored is None:
+            stored = entry["stored"][np.dtype(dtype).str] = geom.astype(dtype)
+        geom = stored
+    return Payload(geom, Results.from_sections(aero, integrals, mass)), timings
+
+
+def run_case(cfg: dict, token: CancelToken | None = None, progress=None) -> Payload:
+    """
+    Caso completo: cálculo, exportación, índice y retención.
 
-    # 4) Exportación
+    token se comprueba entre etapas de cálculo y justo antes de escribir a disco; una vez
+    empezada la E/S el caso se completa (nunca queda un directorio de ejecución a medias).
+    progress(fracción, etapa) informa del avance.
+    """
+    # 1-3) Geometría, aerodinámica, integrales + masa (etapas compartidas con el modo en vivo)
+    _report(progress, 0.0, "compute")
+    payload, _ = evaluate_case(cfg, token)
+    geom = payload.geom
+    _check(token)
+    _report(progress, 0.5, "export")
+
+    # 4) Exportación (cada ejecución en su propio directorio si io.run_dirs)
+    run_dir = make_run_dir() if cfg["io"].get("run_dirs", True) else None
+    data_dir = run_dir or "results/data"
     if cfg["io"]["export_csv"]:
-        save_profile_csv(geom, cfg["io"]["csv_path"])
+        # Con run_dirs el CSV acompaña a la ejecución, salvo que csv_path apunte a un
+        # directorio propio (distinto del results/data por defecto): ése se respeta.
+        csv_path = cfg["io"]["csv_path"]
+        if run_dir and os.path.normpath(os.path.dirname(csv_path)) == os.path.normpath(_DEFAULT_CSV_DIR):
+            csv_path = os.path.join(run_dir, os.path.basename(csv_path))
+        save_profile_csv(geom, csv_path)
 
     # 5) Gráficas (dashboard eliminado para interfaz en vivo en la GUI)
     # Se deja de generar la figura de "dashboard" en disco. La GUI ahora
     # muestra gráficos 2D interactivos bajo demanda.
 
-    # 6) Empaquetar resultados
-    payload = {"geom": geom, "aero": aero, "integrals": integrals, "mass": mass}
-    save_results_json(payload, "results/data/resultados.json")
+    # 6) Empaquetar resultados. Integrales y aerodinámica ya se calcularon en float64;
+    # io.storage_dtype sólo afecta a los arrays de geometría guardados y enviados a la GUI.
+    dtype = storage_dtype(cfg)
+    if dtype is not np.float64:
+        payload = Payload(geom.astype(dtype), payload.results)
+    fmt = cfg["io"].get("results_format", "json")
+    results_path = None
+    if fmt in ("json", "both"):
+        results_path = os.path.join(data_dir, "resultados.json")
+        save_results_json(payload, results_path)
+    if fmt in ("compact", "both"):
+        results_path = os.path.join(data_dir, "resultados_compact.json")
+        save_results_compact(payload, results_path)
+
+    # 7) Índice de ejecuciones
+    _report(progress, 0.9, "index")
+    index_path = cfg["io"].get("run_index", "")
+    if index_path:
+        # Sin run_dir el fichero de resultados es compartido y la próxima ejecución lo
+        # sobrescribe: se indexan los escalares pero no la ruta
+        shared_index(index_path).add(cfg, payload, results_path if run_dir else None, run_dir=run_dir)
+    if run_dir:
+        set_latest_run(run_dir)
+        payload.run_dir = run_dir
+        if cfg["retention"]["auto"]:
+            apply_retention_cfg(cfg)
+    _report(progress, 1.0, "done")
     return payload
+
+
+def run_batch(cfg: dict, batch: DesignBatch, token: CancelToken | None = None, progress=None,
+              chunk: int = SWEEP_CHUNK) -> str:
+    """
+    Evalúa un DesignBatch (barrido) sin crear un dict por caso y guarda todas las columnas
+    en un único resultado compacto (results/runs/sweep_<stamp>/sweep_compact.json + .bin).
+    Devuelve la ruta de ese resultado.
+
+    Se evalúa por bloques de `chunk` filas; token se comprueba entre bloques y antes de la E/S.
+    """
+    def chunk_done(done, total):
+        _report(progress, 0.9 * done / total, f"{done}/{total} cases")
+
+    evaluate_batch(batch, chunk=chunk, token=token, progress=chunk_done)
+    _check(token)
+    _report(progress, 0.9, "export")
+
+    run_dir = make_run_dir(basename="sweep") if cfg["io"].get("run_dirs", True) else None
+    results_path = os.path.join(run_dir or "results/data", "sweep_compact.json")
+    dtype = storage_dtype(cfg)
+    save_results_compact(batch.as_payload(None if dtype is np.float64 else dtype), results_path)
+
+    index_path = cfg["io"].get("run_index", "")
+    if index_path:
+        shared_index(index_path).add_many(batch_rows(batch, results_path if run_dir else None, run_dir))
+    if run_dir:
+        set_latest_run(run_dir)
+        if cfg["retention"]["auto"]:
+            apply_retention_cfg(cfg)
+    _report(progress, 1.0, "done")
+    return results_path
@@ -0,0 +1,152 @@
+# src/records.py
+# Compact typed containers for one case: Profile (geometry), Results (flat scalars) and
+# Payload (what run_case returns). All read like the old dicts (Mapping), so the GUI,
+# the JSON/compact writers and the run index keep working unchanged.
+from __future__ import annotations
+from collections.abc import Mapping
+import numpy as np
+
+
+def _frozen(a, dtype=np.float64) -> np.ndarray:
+    out = np.ascontiguousarray(a, dtype=dtype)
+    if out is a and out.flags.writeable:
+        out = out.copy()  # never freeze the caller's own buffer
+    out.flags.writeable = False
+    return out
+
+
+class Profile(Mapping):
+    """
+    Revolved-body profile: contiguous read-only x/y buffers plus the builder scalars.
+
+    Derived arrays (dydx, ds = sqrt(1 + dydx^2), area = pi y^2) are computed on first
+    use and kept, so repeated integrals/plots on the same profile reuse them.
+    """
+    SCALARS = ("L", "R", "l", "d", "ld", "Ln", "Lc", "Lt", "r_tip")
+    KEYS = ("x", "y") + SCALARS
+    __slots__ = KEYS + ("_dydx", "_ds", "_area")
+
+    def __init__(self, x, y, L, R, l, d, ld, Ln, Lc, Lt, r_tip, dtype=np.float64):
+        self.x = _frozen(x, dtype)
+        self.y = _frozen(y, dtype)
+        if self.x.ndim != 1 or self.x.shape != self.y.shape:
+            raise ValueError("Profile: x and y must be 1D arrays of the same length")
+        self.L = float(L); self.R = float(R); self.l = float(l); self.d = float(d); self.ld = float(ld)
+        self.Ln = float(Ln); self.Lc = float(Lc); self.Lt = float(Lt); self.r_tip = float(r_tip)
+        self._dydx = self._ds = self._area = None
+
+    @classmethod
+    def from_mapping(cls, geom, dtype=None) -> "Profile":
+        """Profile from a geometry dict (e.g. an old resultados.json); missing scalars become nan."""
+        if isinstance(geom, Profile) and (dtype is None or geom.x.dtype == dtype):
+            return geom
+        x = np.asarray(geom["x"])
+        dtype = (np.float32 if x.dtype == np.float32 else np.float64) if dtype is None else dtype
+        return cls(x, geom["y"], *(geom.get(k, np.nan) for k in cls.SCALARS), dtype=dtype)
+
+    def astype(self, dtype) -> "Profile":
+        """Same profile with x/y stored as dtype (see io.storage_dtype); derived arrays stay float64."""
+        return Profile.from_mapping(self, dtype=dtype)
+
+    @property
+    def dydx(self) -> np.ndarray:
+        if self._dydx is None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._dydx = _frozen(np.gradient(self.y.astype(float), self.x.astype(float)))
+        return self._dydx
+
+    @property
+    def ds(self) -> np.ndarray:
+        """Arc-length element per unit x, sqrt(1 + (dy/dx)^2)."""
+        if self._ds is None:
+            self._ds = _frozen(np.sqrt(1.0 + self.dydx ** 2))
+        return self._ds
+
+    @property
+    def area(self) -> np.ndarray:
+        """Cross-section area A(x) = pi y^2."""
+        if self._area is None:
+            y = self.y.astype(float)
+            self._area = _frozen(np.pi * y * y)
+        return self._area
+
+    def __getitem__(self, key):
+        if key in Profile.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(Profile.KEYS)
+
+    def __len__(self):
+        return len(Profile.KEYS)
+
+    def __repr__(self):
+        return f"Profile(n={self.x.size}, l={self.l:g}, d={self.d:g}, dtype={self.x.dtype})"
+
+
+class Results(Mapping):
+    """Flat record of every scalar output of one case (aero + integrals + mass), as floats."""
+    SECTIONS = {
+        "aero": ("ReL", "Cf", "Cf_eff", "F", "CD_clean", "CD_base", "CD_total",
+                 "S_f", "S_w", "q", "D_clean", "D_base", "D_total"),
+        "integrals": ("S_lateral", "S_total", "V", "x_cg_surface", "x_cg_volume"),
+        "mass": ("sigma", "m_shell", "W_shell"),
+    }
+    KEYS = SECTIONS["aero"] + SECTIONS["integrals"] + SECTIONS["mass"]
+    __slots__ = KEYS
+
+    def __init__(self, **values):
+        for k in Results.KEYS:
+            setattr(self, k, float(values.get(k, np.nan)))
+
+    @classmethod
+    def from_sections(cls, aero: dict, integrals: dict, mass: dict) -> "Results":
+        return cls(**aero, **integrals, **mass)
+
+    def section(self, name: str) -> dict:
+        """Nested view used by the payload ("aero", "integrals" or "mass")."""
+        return {k: getattr(self, k) for k in Results.SECTIONS[name]}
+
+    def __getitem__(self, key):
+        if key in Results.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(Results.KEYS)
+
+    def __len__(self):
+        return len(Results.KEYS)
+
+
+class Payload(Mapping):
+    """
+    What run_case returns: payload["geom"] is the Profile and payload["aero"/"integrals"/"mass"]
+    are dicts built from the flat Results; run_dir is set when the run wrote a results folder.
+    """
+    __slots__ = ("geom", "results", "run_dir")
+
+    def __init__(self, geom: Profile, results: Results, run_dir: str | None = None):
+        self.geom = geom
+        self.results = results
+        self.run_dir = run_dir
+
+    def _keys(self) -> tuple:
+        keys = ("geom",) + tuple(Results.SECTIONS)
+        return keys + ("run_dir",) if self.run_dir else keys
+
+    def __getitem__(self, key):
+        if key == "geom":
+            return self.geom
+        if key in Results.SECTIONS:
+            return self.results.section(key)
+        if key == "run_dir" and self.run_dir:
+            return self.run_dir
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
@@ -0,0 +1,283 @@
+# src/resultsio.py
+# Compact results storage: scalar metrics in a small JSON header, arrays in a raw
+# little-endian sidecar that can be memory-mapped back without parsing text.
+from __future__ import annotations
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from collections.abc import Mapping
+from datetime import datetime, timezone
+import numpy as np
+from .utils import atomic_write
+
+COMPACT_FORMAT = "fuselagelab-compact"
+COMPACT_VERSION = 1
+_ALIGN = 64  # byte alignment of each array in the sidecar
+_EAGER_BYTES = 1 << 20  # sidecars up to this size are read whole (no file handle kept open)
+
+
+def sidecar_path(header_path: str) -> str:
+    """Sidecar (.bin) path paired with a compact header (.json)."""
+    return os.path.splitext(header_path)[0] + ".bin"
+
+
+def _split(obj, prefix: str, scalars: dict, arrays: list) -> None:
+    """Walk a (nested) payload: arrays go to `arrays` as (dotted key, array), the rest to `scalars`."""
+    for k, v in obj.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, np.ndarray):
+            arrays.append((key, v))
+        elif isinstance(v, Mapping):
+            scalars[k] = {}
+            _split(v, key + ".", scalars[k], arrays)
+        elif isinstance(v, (np.floating, np.integer, np.bool_)):
+            scalars[k] = v.item()
+        else:
+            scalars[k] = v
+
+
+def save_results_compact(payload: dict, path: str) -> None:
+    """
+    Save results as a JSON header (scalars + array manifest) plus a raw .bin sidecar.
+
+    Arrays are written little-endian and 64-byte aligned, straight from their buffers.
+    """
+    scalars: dict = {}
+    arrays: list = []
+    _split(payload, "", scalars, arrays)
+
+    manifest = {}
+    offset = 0
+    blocks = []
+    for key, a in arrays:
+        a = np.ascontiguousarray(a, dtype=a.dtype.newbyteorder("<"))
+        pad = -offset % _ALIGN
+        offset += pad
+        manifest[key] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        blocks.append((pad, a))
+        offset += a.nbytes
+
+    # Sidecar first, header last: a header on disk always points at a complete sidecar.
+    bin_path = sidecar_path(path)
+    with atomic_write(bin_path, "wb") as f:
+        for pad, a in blocks:
+            if pad:
+                f.write(b"\x00" * pad)
+            if a.size:  # memoryview cannot cast empty arrays; they have no bytes anyway
+                f.write(memoryview(a).cast("B"))
+
+    header = {
+        "format": COMPACT_FORMAT,
+        "version": COMPACT_VERSION,
+        "sidecar": os.path.basename(bin_path),
+        "scalars": scalars,
+        "arrays": manifest,
+    }
+    with atomic_write(path, "w", encoding="utf-8") as f:
+        json.dump(header, f, separators=(",", ":"))
+    print(f"[OK] Compact results: {path} (+ {os.path.basename(bin_path)})")
+
+
+def read_compact_header(path: str) -> dict:
+    """Parse only the JSON header of a compact result (no array data is touched)."""
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"{path}: not a compact results header")
+    if header.get("version", 0) > COMPACT_VERSION:
+        raise ValueError(f"{path}: compact results version {header['version']} is newer than supported")
+    return header
+
+
+def _sidecar_buffer(bin_path: str):
+    """
+    The whole sidecar as one read-only buffer: bytes for small files, else a single mmap.
+
+    Arrays are views of this buffer, so a result costs at most one mapping however many
+    arrays are read (on Python 3.13+ the mapping keeps no file descriptor either).
+    """
+    with open(bin_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= _EAGER_BYTES:
+            return f.read()
+        kwargs = {"trackfd": False} if sys.version_info >= (3, 13) else {}
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ, **kwargs)
+
+
+def _array_view(buf, spec: dict) -> np.ndarray:
+    dtype = np.dtype(spec["dtype"])
+    shape = tuple(spec["shape"])
+    count = int(np.prod(shape))
+    if count == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.frombuffer(buf, dtype=dtype, count=count, offset=spec["offset"]).reshape(shape)
+
+
+def _bin_path(path: str, header: dict) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path)), header["sidecar"])
+
+
+# --- Lazy readers for stored runs ---
+
+_STAMP_RE = re.compile(r"(\d{4}-\d{2}-\d{2}_\d{6})Z")
+
+
+def parse_stamp(name: str) -> datetime | None:
+    """UTC timestamp embedded by utils.stamp_name (foo_2025-09-06_121530Z...), or None."""
+    m = _STAMP_RE.search(name)
+    if not m:
+        return None
+    return datetime.strptime(m.group(1), "%Y-%m-%d_%H%M%S").replace(tzinfo=timezone.utc)
+
+
+class _LazySection(Mapping):
+    """One payload section of a RunResult: scalars from the header, arrays mapped on first access."""
+    __slots__ = ("_run", "_prefix", "_scalars", "_array_keys")
+
+    def __init__(self, run: "RunResult", name: str, scalars: dict, array_keys: tuple):
+        self._run = run
+        self._prefix = name + "."
+        self._scalars = scalars
+        self._array_keys = array_keys
+
+    def __getitem__(self, key):
+        if key in self._scalars:
+            return self._scalars[key]
+        if key in self._array_keys:
+            return self._run.array(self._prefix + key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self._scalars
+        yield from self._array_keys
+
+    def __len__(self):
+        return len(self._scalars) + len(self._array_keys)
+
+
+class RunResult(Mapping):
+    """
+    A stored compact result opened lazily.
+
+    Only the JSON header is parsed on open; run["geom"]["x"] (or run.array("geom.x"))
+    loads the sidecar the first time an array is used (read whole if small, else one
+    memory map) and every array is a view of that single buffer. close() drops it.
+    Reads like a payload dict, so it can be handed to the results panel or the viewers.
+    """
+    __slots__ = ("path", "stamp", "_header", "_arrays", "_buffer")
+
+    def __init__(self, path: str, header: dict | None = None):
+        self.path = os.path.abspath(path)
+        self._header = read_compact_header(path) if header is None else header
+        parent = os.path.basename(os.path.dirname(self.path))
+        self.stamp = parse_stamp(os.path.basename(self.path)) or parse_stamp(parent)
+        self._arrays: dict = {}
+        self._buffer = None
+
+    @property
+    def scalars(self) -> dict:
+        return self._header["scalars"]
+
+    @property
+    def array_keys(self) -> tuple:
+        return tuple(self._header["arrays"])
+
+    def array(self, key: str) -> np.ndarray:
+        a = self._arrays.get(key)
+        if a is None:
+            spec = self._header["arrays"][key]
+            if self._buffer is None:
+                self._buffer = _sidecar_buffer(_bin_path(self.path, self._header))
+            a = self._arrays[key] = _array_view(self._buffer, spec)
+        return a
+
+    def close(self) -> None:
+        """Release the sidecar buffer (arrays already handed out keep their own reference)."""
+        self._arrays.clear()
+        self._buffer = None
+
+    def _sections(self) -> list:
+        names = [k for k, v in self.scalars.items() if isinstance(v, dict)]
+        for key in self._header["arrays"]:
+            name = key.split(".", 1)[0]
+            if "." in key and name not in names:
+                names.append(name)
+        return names
+
+    def __getitem__(self, name):
+        if name in self._sections():
+            prefix = name + "."
+            arrays = tuple(k[len(prefix):] for k in self._header["arrays"] if k.startswith(prefix))
+            return _LazySection(self, name, self.scalars.get(name, {}), arrays)
+        if name in self.scalars:
+            return self.scalars[name]
+        raise KeyError(name)
+
+    def __iter__(self):
+        seen = self._sections()
+        yield from seen
+        yield from (k for k in self.scalars if k not in seen)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"RunResult({self.path!r})"
+
+
+def _scan_compact(root: str):
+    """Yield compact header paths under root: *.json files with a same-stem *.bin sibling."""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        bins = {e.name[:-4] for e in entries if e.name.endswith(".bin")}
+        for e in entries:
+            if e.is_dir(follow_symlinks=False):
+                stack.append(e.path)
+            elif e.name.endswith(".json") and e.name[:-5] in bins:
+                yield e.path
+
+
+def iter_runs(root: str = "results"):
+    """Iterate every compact result under root as a lazily loaded RunResult (headers only)."""
+    for path in _scan_compact(root):
+        try:
+            yield RunResult(path)
+        except (ValueError, OSError, json.JSONDecodeError):
+            continue  # foreign JSON/BIN pair or unreadable file
+
+
+def open_runs(root: str = "results") -> list:
+    """All compact results under root, oldest first (by embedded stamp, then path)."""
+    runs = list(iter_runs(root))
+    floor = datetime.min.replace(tzinfo=timezone.utc)
+    runs.sort(key=lambda r: (r.stamp or floor, len(r.path), r.path))
+    return runs
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="List stored compact results (headers only, no array data read).")
+    p.add_argument("root", nargs="?", default="results")
+    p.add_argument("--key", action="append", default=[],
+                   help="scalar to show as section.name, e.g. aero.CD_total (repeatable)")
+    a = p.parse_args(argv)
+    keys = a.key or ["aero.CD_total", "integrals.V", "mass.m_shell"]
+    for run in open_runs(a.root):
+        cols = []
+        for key in keys:
+            section, _, name = key.partition(".")
+            val = run.scalars.get(section, {}).get(name) if name else run.scalars.get(section)
+            cols.append(f"{key}={val:.6g}" if isinstance(val, (int, float)) else f"{key}={'-' if val is None else val}")
+        stamp = run.stamp.strftime("%Y-%m-%d %H:%M:%S") if run.stamp else "-"
+        print(f"{stamp}  {run.path}  " + "  ".join(cols))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# src/retention.py
+# Retention / disk-quota manager for per-run output folders (results/runs/run_<stamp>/).
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import time
+from typing import NamedTuple
+
+from .resultsio import parse_stamp
+from .runindex import shared_index
+from .utils import latest_run_dir
+
+PIN_FILE = "PINNED"        # marker file: a run folder containing it is never deleted
+_STALE_TMP_S = 3600.0      # leftovers of interrupted atomic writes older than this are removed
+_GRACE_S = 600.0           # runs touched more recently than this may still be written to
+
+
+class RunDir(NamedTuple):
+    path: str
+    mtime: float           # stamp from the folder name (UTC epoch), mtime as fallback
+    nbytes: int            # 0 unless scanned with sizes=True
+    pinned: bool
+    busy: bool = False     # touched within _GRACE_S (another writer may be filling it): never deleted
+    stale: tuple = ()      # stale temp files left by interrupted atomic writes
+
+
+def _walk(path: str, sizes: bool, now: float) -> tuple:
+    """
+    (bytes, stale temp files) under path in one os.scandir pass.
+
+    Only temp files are stat'ed unless sizes is set (bytes is then 0).
+    """
+    total = 0
+    stale = []
+    stack = [path]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                        continue
+                    is_tmp = e.name.endswith(".tmp") and e.name.startswith(".")
+                    if not (sizes or is_tmp):
+                        continue
+                    try:
+                        st = e.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    total += st.st_size
+                    if is_tmp and now - st.st_mtime > _STALE_TMP_S:
+                        stale.append(e.path)
+        except FileNotFoundError:
+            continue
+    return total, tuple(stale)
+
+
+def scan_run_dirs(root: str = "results/runs", pinned_dirs=(), sizes: bool = True,
+                  now: float | None = None) -> list:
+    """
+    Run folders directly under root, oldest first; each folder is walked once.
+
+    sizes=False skips sizing the files (only needed for a byte quota).
+    """
+    now = time.time() if now is None else now
+    pinned_dirs = {os.path.abspath(p) for p in pinned_dirs}
+    runs = []
+    try:
+        with os.scandir(root) as it:
+            entries = [e for e in it if e.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return runs
+    for e in entries:
+        try:
+            touched = e.stat(follow_symlinks=False).st_mtime
+        except FileNotFoundError:
+            continue
+        stamp = parse_stamp(e.name)
+        t = stamp.timestamp() if stamp else touched
+        nbytes, stale = _walk(e.path, sizes, now)
+        pinned = os.path.abspath(e.path) in pinned_dirs or os.path.exists(os.path.join(e.path, PIN_FILE))
+        # Writers add files with atomic renames, which touch the folder; an unfinished run
+        # older than the grace period was interrupted and is pruned like any other
+        busy = now - touched < _GRACE_S
+        runs.append(RunDir(e.path, t, nbytes, pinned, busy, stale))
+    runs.sort(key=lambda r: (r.mtime, len(r.path), r.path))  # run_<stamp>_2 before run_<stamp>_10
+    return runs
+
+
+def plan_retention(runs: list, keep_last: int = 0, max_bytes: int = 0, max_age_days: float = 0.0,
+                   protect=(), now: float | None = None) -> list:
+    """
+    Run folders to delete (oldest first). 0 disables a limit.
+
+    Pinned, protected and busy runs (possibly still being written) are always kept and are not
+    counted against keep_last; they do count towards max_bytes, so the quota may be exceeded
+    by them alone.
+    """
+    now = time.time() if now is None else now
+    protect = {os.path.abspath(p) for p in protect}
+    kept = [r for r in runs if r.pinned or r.busy or os.path.abspath(r.path) in protect]
+    cand = [r for r in runs if r not in kept]          # oldest first
+    drop = []
+
+    if max_age_days > 0:
+        cutoff = now - max_age_days * 86400.0
+        drop += [r for r in cand if r.mtime < cutoff]
+        cand = [r for r in cand if r.mtime >= cutoff]
+    if keep_last > 0 and len(cand) > keep_last:
+        drop += cand[:-keep_last]
+        cand = cand[-keep_last:]
+    if max_bytes > 0:
+        used = sum(r.nbytes for r in kept) + sum(r.nbytes for r in cand)
+        while cand and used > max_bytes:
+            r = cand.pop(0)
+            drop.append(r)
+            used -= r.nbytes
+    drop.sort(key=lambda r: (r.mtime, len(r.path), r.path))
+    return drop
+
+
+def apply_retention(root: str = "results/runs", keep_last: int = 0, max_bytes: int = 0,
+                    max_age_days: float = 0.0, pinned=(), index_path: str = "",
+                    dry_run: bool = False) -> list:
+    """
+    Enforce the policy on root and return the run folders removed (or that would be, if dry_run).
+
+    Pinned runs come from `pinned` (paths), PINNED marker files and, if index_path is
+    given, the index's pinned flag. The folder named in root/LATEST is never removed, nor
+    are runs touched in the last _GRACE_S seconds. Only root is managed: mesh exports
+    (results/meshes, saved where the user chose) and results/.cache are left alone.
+    Index rows of removed folders keep their scalars but lose their results path.
+    """
+    idx = shared_index(index_path) if index_path and os.path.exists(index_path) else None
+    pins = set(pinned) | (idx.pinned_dirs() if idx else set())
+    runs = scan_run_dirs(root, pins, sizes=max_bytes > 0)
+    latest = latest_run_dir(root)
+    drop = plan_retention(runs, keep_last, max_bytes, max_age_days,
+                          protect=[latest] if latest else ())
+    if dry_run:
+        return [r.path for r in drop]
+
+    removed = []
+    for r in drop:
+        shutil.rmtree(r.path, ignore_errors=True)
+        if not os.path.exists(r.path):
+            removed.append(r.path)
+    for r in runs:
+        if r not in drop:
+            for tmp in r.stale:
+                try:
+                    os.remove(tmp)
+                except FileNotFoundError:
+                    pass
+    if idx and removed:
+        idx.mark_pruned(removed)
+    if removed:
+        freed = sum(r.nbytes for r in drop if r.path in removed)
+        note = f", {freed / 1e6:.1f} MB freed" if max_bytes > 0 else ""
+        print(f"[OK] Retention: removed {len(removed)} run(s){note} in {root}")
+    return removed
+
+
+def apply_retention_cfg(cfg: dict, dry_run: bool = False) -> list:
+    """apply_retention with the limits from cfg["retention"] and the index from cfg["io"]."""
+    ret = cfg["retention"]
+    return apply_retention(
+        ret.get("root", "results/runs"),
+        keep_last=int(ret.get("keep_last", 0)),
+        max_bytes=int(float(ret.get("max_mb", 0.0)) * 1e6),
+        max_age_days=float(ret.get("max_age_days", 0.0)),
+        pinned=[os.path.join(ret.get("root", "results/runs"), p) for p in ret.get("pinned", [])],
+        index_path=cfg["io"].get("run_index", ""),
+        dry_run=dry_run,
+    )
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Prune per-run result folders.")
+    p.add_argument("--root", default="results/runs")
+    p.add_argument("--keep-last", type=int, default=0)
+    p.add_argument("--max-mb", type=float, default=0.0)
+    p.add_argument("--max-age-days", type=float, default=0.0)
+    p.add_argument("--pin", action="append", default=[], help="run folder to keep (repeatable)")
+    p.add_argument("--index", default="results/runs.sqlite")
+    p.add_argument("--dry-run", action="store_true")
+    a = p.parse_args(argv)
+    out = apply_retention(a.root, a.keep_last, int(a.max_mb * 1e6), a.max_age_days,
+                          pinned=a.pin, index_path=a.index, dry_run=a.dry_run)
+    if a.dry_run:
+        print("\n".join(out) if out else "(nothing to remove)")
+
+
+if __name__ == "__main__":
+    main()
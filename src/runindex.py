@@ -0,0 +1,278 @@
+# src/runindex.py
+# Local SQLite index of runs: config hash, key inputs, scalar outputs and a pointer
+# to the stored results, so past cases can be filtered/sorted without opening files.
+from __future__ import annotations
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from itertools import repeat
+import numpy as np
+
+from .batch import INPUT_SPEC, MODES
+
+SCHEMA_VERSION = 1
+
+# (column, SQL type, source) — source is (section, key) in cfg for inputs, in payload for outputs
+INPUT_COLUMNS = (
+    ("l", "REAL", ("geom", "l")),
+    ("d", "REAL", ("geom", "d")),
+    ("base_ratio", "REAL", ("geom", "base_ratio")),
+    ("V", "REAL", ("op", "V")),
+    ("rho", "REAL", ("op", "rho")),
+    ("nu", "REAL", ("op", "nu")),
+    ("cf_mode", "TEXT", ("cf_model", "mode")),
+    ("Ln_frac", "REAL", ("builder", "Ln_frac")),
+    ("Lt_frac", "REAL", ("builder", "Lt_frac")),
+)
+OUTPUT_COLUMNS = (
+    ("CD_total", "REAL", ("aero", "CD_total")),
+    ("D_total", "REAL", ("aero", "D_total")),
+    ("S_total", "REAL", ("integrals", "S_total")),
+    ("volume", "REAL", ("integrals", "V")),
+    ("m_shell", "REAL", ("mass", "m_shell")),
+)
+COLUMNS = ("id", "stamp", "cfg_hash") + tuple(c for c, _, _ in INPUT_COLUMNS + OUTPUT_COLUMNS) + (
+    "results_path", "run_dir", "pinned")
+INDEXED = ("cfg_hash", "stamp", "V", "CD_total", "D_total", "volume", "m_shell", "run_dir")
+_OPS = ("<", "<=", ">", ">=", "=", "!=", "LIKE", "NOT LIKE")
+# Microseconds keep runs started within the same second in order ("latest" in compare)
+STAMP_FORMAT = "%Y-%m-%d_%H%M%S.%fZ"
+
+
+# Sections that define a design; io / plots / retention settings never change its hash
+HASHED_SECTIONS = ("geom", "op", "cf_model", "builder", "mass")
+_COLUMN_KEYS = {(sec, key): name for name, (sec, key, _) in INPUT_SPEC.items()}
+_DERIVED_KEYS = {("op", "base_ratio")}  # copy of geom.base_ratio made by normalize_config
+
+
+def _hash_seed(cfg: dict):
+    """blake2b state over the physics keys that are not batch input columns (stray/extra keys)."""
+    fixed = {s: {k: v for k, v in cfg[s].items() if (s, k) not in _COLUMN_KEYS and (s, k) not in _DERIVED_KEYS}
+             for s in HASHED_SECTIONS if s in cfg}
+    blob = json.dumps(fixed, sort_keys=True, separators=(",", ":"), default=float)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16)
+
+
+def _input_vector(cfg: dict) -> np.ndarray:
+    """INPUT_SPEC values of cfg as float64 (cf_mode as its MODES index, missing keys as nan)."""
+    out = np.full(len(INPUT_SPEC), np.nan)
+    for i, (name, (sec, key, _)) in enumerate(INPUT_SPEC.items()):
+        v = cfg.get(sec, {}).get(key)
+        if v is not None:
+            out[i] = MODES.index(v) if name == "cf_mode" else float(v)
+    return out
+
+
+def config_hash(cfg: dict) -> str:
+    """
+    Stable hash of the physics of a configuration: the INPUT_SPEC values as float64 plus the
+    remaining physics keys. batch_rows hashes sweep rows the same way, so one design has one
+    key whether it was run on its own or as part of a sweep.
+    """
+    h = _hash_seed(cfg)
+    h.update(_input_vector(cfg).tobytes())
+    return h.hexdigest()
+
+
+def _pick(src, section: str, key: str):
+    val = src.get(section, {}).get(key)
+    if val is None or isinstance(val, str):
+        return val
+    return float(val)
+
+
+def run_row(cfg: dict, payload, results_path: str | None = None, stamp: str | None = None,
+            run_dir: str | None = None, pinned: bool = False) -> tuple:
+    """Row tuple (in COLUMNS order, without id) for one evaluated case."""
+    if stamp is None:
+        stamp = datetime.now(timezone.utc).strftime(STAMP_FORMAT)
+    ins = tuple(_pick(cfg, *src) for _, _, src in INPUT_COLUMNS)
+    outs = tuple(_pick(payload, *src) for _, _, src in OUTPUT_COLUMNS)
+    if results_path is not None:
+        results_path = os.path.abspath(results_path)
+    if run_dir is not None:
+        run_dir = os.path.abspath(run_dir)
+    return (stamp, config_hash(cfg)) + ins + outs + (results_path, run_dir, int(pinned))
+
+
+def batch_rows(batch, results_path: str | None = None, run_dir: str | None = None, stamp: str | None = None):
+    """
+    run_row() tuples for every row of an evaluated DesignBatch, built column-wise (no config per row).
+
+    cfg_hash is config_hash of each row's configuration: the hash state of the base config's
+    fixed keys is computed once and extended with the row's input vector.
+    """
+    if stamp is None:
+        stamp = datetime.now(timezone.utc).strftime(STAMP_FORMAT)
+    if results_path is not None:
+        results_path = os.path.abspath(results_path)
+    if run_dir is not None:
+        run_dir = os.path.abspath(run_dir)
+    n = len(batch)
+    seed = _hash_seed(batch.base or {})
+    values = np.column_stack([batch.inputs[name].astype(np.float64) for name in INPUT_SPEC])
+    hashes = []
+    for row in values:
+        h = seed.copy()
+        h.update(row.tobytes())
+        hashes.append(h.hexdigest())
+
+    ins = []
+    for _, _, src in INPUT_COLUMNS:
+        col = batch.inputs[_COLUMN_KEYS[src]]
+        ins.append(np.asarray(MODES)[col].tolist() if src == ("cf_model", "mode") else col.tolist())
+    outs = [batch.outputs[key].astype(np.float64).tolist() for _, _, (_, key) in OUTPUT_COLUMNS]
+    return zip(repeat(stamp, n), hashes, *ins, *outs, repeat(results_path, n), repeat(run_dir, n), repeat(0, n))
+
+
+class RunIndex:
+    """
+    SQLite index of runs.
+
+    idx.query(("V", ">", 10), ("volume", ">", 0.02), order_by="D_total", limit=1)
+    returns rows (sqlite3.Row) answered from the column indexes.
+    """
+
+    def __init__(self, path: str = "results/runs.sqlite", check_same_thread: bool = True):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
+        self.con = sqlite3.connect(path, timeout=30.0, check_same_thread=check_same_thread)
+        self.con.row_factory = sqlite3.Row
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        version = self.con.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        cols = ", ".join(f"{c} {t}" for c, t, _ in INPUT_COLUMNS + OUTPUT_COLUMNS)
+        with self.con:
+            self.con.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "id INTEGER PRIMARY KEY, stamp TEXT NOT NULL, cfg_hash TEXT NOT NULL, "
+                f"{cols}, results_path TEXT, run_dir TEXT, pinned INTEGER NOT NULL DEFAULT 0)"
+            )
+            for c in INDEXED:
+                self.con.execute(f"CREATE INDEX IF NOT EXISTS idx_runs_{c} ON runs({c})")
+            self.con.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, cfg: dict, payload, results_path: str | None = None, stamp: str | None = None,
+            run_dir: str | None = None) -> int:
+        """Record one run; returns its id."""
+        with self.con:
+            cur = self.con.execute(self._insert_sql(), run_row(cfg, payload, results_path, stamp, run_dir))
+        return cur.lastrowid
+
+    def add_many(self, rows) -> int:
+        """Bulk-insert rows from run_row() in a single transaction; returns the number inserted."""
+        with self.con:
+            cur = self.con.executemany(self._insert_sql(), rows)
+        return cur.rowcount
+
+    @staticmethod
+    def _insert_sql() -> str:
+        cols = COLUMNS[1:]
+        return f"INSERT INTO runs ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+
+    def query(self, *where, order_by: str | None = None, desc: bool = False,
+              limit: int | None = None, columns=None) -> list:
+        """Rows matching all (column, op, value) conditions, optionally sorted and limited."""
+        cols = tuple(columns) if columns else COLUMNS
+        for c in cols:
+            if c not in COLUMNS:
+                raise ValueError(f"query: unknown column '{c}'")
+        sql = f"SELECT {', '.join(cols)} FROM runs"
+        args = []
+        if where:
+            terms = []
+            for col, op, val in where:
+                if col not in COLUMNS:
+                    raise ValueError(f"query: unknown column '{col}'")
+                if op not in _OPS:
+                    raise ValueError(f"query: unsupported operator '{op}'")
+                terms.append(f"{col} {op} ?")
+                args.append(val)
+            sql += " WHERE " + " AND ".join(terms)
+        if order_by is not None:
+            if order_by not in COLUMNS:
+                raise ValueError(f"query: unknown column '{order_by}'")
+            # Ties (equal stamps from older second-resolution rows, equal metrics) by insertion order
+            sql += f" ORDER BY {order_by}{' DESC' if desc else ''}, id{' DESC' if desc else ''}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        return self.con.execute(sql, args).fetchall()
+
+    def latest_ids(self, results_paths) -> dict:
+        """results_path -> id of the newest row pointing at it (the run that wrote the file last)."""
+        paths = sorted(set(results_paths))
+        if not paths:
+            return {}
+        rows = self.con.execute(
+            f"SELECT results_path, MAX(id) FROM runs WHERE results_path IN ({', '.join('?' * len(paths))}) "
+            "GROUP BY results_path", paths)
+        return {r[0]: r[1] for r in rows}
+
+    def count(self) -> int:
+        return self.con.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def pin(self, run_dir: str, pinned: bool = True) -> int:
+        """(Un)pin every row stored in run_dir so retention never deletes it; returns rows changed."""
+        with self.con:
+            cur = self.con.execute("UPDATE runs SET pinned = ? WHERE run_dir = ?",
+                                   (int(pinned), os.path.abspath(run_dir)))
+        return cur.rowcount
+
+    def pinned_dirs(self) -> set:
+        rows = self.con.execute("SELECT DISTINCT run_dir FROM runs WHERE pinned = 1 AND run_dir IS NOT NULL")
+        return {r[0] for r in rows}
+
+    def mark_pruned(self, run_dirs) -> int:
+        """Detach rows from deleted run folders (scalars stay queryable, results_path becomes NULL)."""
+        with self.con:
+            cur = self.con.executemany(
+                "UPDATE runs SET results_path = NULL, run_dir = NULL WHERE run_dir = ?",
+                [(os.path.abspath(d),) for d in run_dirs],
+            )
+        return cur.rowcount
+
+
+_SHARED: dict = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_index(path: str) -> RunIndex:
+    """
+    One open RunIndex per database file for the whole process (a GUI session), so every run,
+    sweep and comparison reuses the connection instead of reconnecting and re-issuing the
+    PRAGMAs. Callers must not close it; close_shared_indexes() runs at interpreter exit.
+    """
+    key = os.path.abspath(path)
+    with _SHARED_LOCK:
+        idx = _SHARED.get(key)
+        if idx is None:
+            idx = _SHARED[key] = RunIndex(path, check_same_thread=False)
+        return idx
+
+
+@atexit.register
+def close_shared_indexes() -> None:
+    with _SHARED_LOCK:
+        for idx in _SHARED.values():
+            idx.close()
+        _SHARED.clear()
@@ -2,30 +2,63 @@
 from __future__ import annotations
 import json
 import os
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 import struct
+from collections.abc import Mapping
 from typing import Tuple
 import numpy as np
 
+from .mesh import (  # noqa: F401  (re-exported for existing callers)
+    LOD_LEVELS, MeshLOD, decimate_profile, fuselage_lod,
+    profile_hash, revolve_grid, revolve_mesh, revolve_profile_normals, revolve_profile_to_mesh,
+)
+
+STORAGE_DTYPES = {"float64": np.float64, "float32": np.float32}
+
 def _default_np(o):
     if isinstance(o, np.ndarray):
+        # float32 -> float de Python exacto (tolist en C); al leer, astype(float32) lo recupera sin pérdida
         return o.tolist()
+    if isinstance(o, Mapping):  # Profile / Payload
+        return dict(o)
     if isinstance(o, (np.floating, np.integer)):
         return o.item()
     return str(o)
 
+@contextmanager
+def atomic_write(path: str, mode: str = "w", **kwargs):
+    """
+    Abre un temporal en el mismo directorio que `path` y lo renombra sobre `path`
+    (os.replace) al cerrar sin errores: los lectores ven el fichero viejo o el nuevo, nunca uno a medias.
+    """
+    d = os.path.dirname(os.path.abspath(path))
+    os.makedirs(d, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=d, prefix="." + os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.chmod(tmp, 0o644)  # mkstemp crea con 0600
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
 def save_profile_csv(geom: dict, path: str) -> None:
     """Guarda columnas x,y en CSV (perfil superior)."""
     x = np.asarray(geom["x"]); y = np.asarray(geom["y"])
-    os.makedirs(os.path.dirname(path), exist_ok=True)
     header = "x_m,y_m  # Perfil superior (revolución eje x)."
-    np.savetxt(path, np.column_stack([x, y]), delimiter=",", header=header, comments="")
+    with atomic_write(path, "w") as f:
+        np.savetxt(f, np.column_stack([x, y]), delimiter=",", header=header, comments="")
     print(f"[OK] CSV perfil: {path}")
 
 def save_results_json(payload: dict, path: str, pretty: bool = True) -> None:
     """Guarda resultados en JSON (compatible con numpy)."""
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
+    with atomic_write(path, "w") as f:
         if pretty:
             json.dump(payload, f, indent=2, default=_default_np)
         else:
@@ -42,60 +75,42 @@ def stamp_name(basename: str, suffix: str = "", ext: str = "") -> str:
         ext = "." + ext
     return name + ext
 
-# --- STL / mesh utilities ---
+# --- Per-run output directories ---
 
-def revolve_profile_to_mesh(x: np.ndarray, r: np.ndarray, n_theta: int = 128) -> Tuple[np.ndarray, np.ndarray]:
-    """
-    Create a triangular surface mesh by revolving the profile (x, r) around the x-axis.
+LATEST_FILE = "LATEST"
 
-    Returns (V, F):
-    - V: float64 array (N, 3) of vertices
-    - F: int32 array (M, 3) of triangle vertex indices
+def make_run_dir(root: str = "results/runs", basename: str = "run") -> str:
     """
-    x = np.asarray(x, dtype=float)
-    r = np.asarray(r, dtype=float)
-    if x.ndim != 1 or r.ndim != 1 or x.size != r.size or x.size < 2:
-        raise ValueError("revolve_profile_to_mesh: x and r must be 1D arrays with same length >= 2")
-    if n_theta < 3:
-        raise ValueError("revolve_profile_to_mesh: n_theta must be >= 3")
-
-    theta = np.linspace(0.0, 2.0*np.pi, num=n_theta, endpoint=False)
-    cos_t = np.cos(theta)
-    sin_t = np.sin(theta)
-
-    n_ax = x.size
-    n_ang = n_theta
-
-    # Build grid vertices
-    V = np.empty((n_ax * n_ang, 3), dtype=float)
-    idx = 0
-    for i in range(n_ax):
-        xi = float(x[i])
-        ri = float(r[i])
-        V[idx:idx+n_ang, 0] = xi
-        V[idx:idx+n_ang, 1] = ri * cos_t
-        V[idx:idx+n_ang, 2] = ri * sin_t
-        idx += n_ang
-
-    # Triangles (two per quad), wrap around in angular direction
-    def vid(i: int, j: int) -> int:
-        return i * n_ang + j
-
-    faces = []
-    for i in range(n_ax - 1):
-        for j in range(n_ang):
-            jn = (j + 1) % n_ang
-            p0 = vid(i, j)
-            p1 = vid(i + 1, j)
-            p2 = vid(i + 1, jn)
-            p3 = vid(i, jn)
-            # Consistent winding
-            faces.append((p0, p1, p2))
-            faces.append((p0, p2, p3))
-
-    F = np.asarray(faces, dtype=np.int32)
-    return V, F
+    Crea un directorio nuevo y único root/run_2025-09-06_121530Z[_n].
+    os.mkdir es atómico, así que procesos en paralelo nunca comparten directorio.
+    """
+    os.makedirs(root, exist_ok=True)
+    for n in range(1000):
+        path = os.path.join(root, stamp_name(basename, suffix=str(n) if n else ""))
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            continue
+    raise RuntimeError(f"make_run_dir: no free run directory under {root}")
+
+def set_latest_run(run_dir: str) -> None:
+    """Apunta root/LATEST (fichero de texto, reemplazo atómico) al directorio de ejecución dado."""
+    root = os.path.dirname(os.path.abspath(run_dir))
+    with atomic_write(os.path.join(root, LATEST_FILE), "w", encoding="utf-8") as f:
+        f.write(os.path.basename(run_dir) + "\n")
 
+def latest_run_dir(root: str = "results/runs") -> str | None:
+    """Directorio apuntado por root/LATEST, o None si no hay ninguno."""
+    try:
+        with open(os.path.join(root, LATEST_FILE), "r", encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    path = os.path.join(root, name)
+    return path if name and os.path.isdir(path) else None
+
+# --- STL / mesh utilities ---
 
 def _facet_normals(V: np.ndarray, F: np.ndarray) -> np.ndarray:
     """Compute per-facet normals (unnormalized)."""
@@ -111,53 +126,221 @@ def _facet_normals(V: np.ndarray, F: np.ndarray) -> np.ndarray:
     return n_norm
 
 
-def save_stl_ascii(path: str, V: np.ndarray, F: np.ndarray, solid_name: str = "fuselage") -> None:
-    """Write an ASCII STL file from vertices and triangle indices."""
-    os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
+_WRITE_CHUNK = 1 << 16  # facets / vertices per block in the text and STL writers (cancel points)
+_STL_ASCII_FACET = (
+    "  facet normal %.6e %.6e %.6e\n"
+    "    outer loop\n"
+    "      vertex %.6e %.6e %.6e\n"
+    "      vertex %.6e %.6e %.6e\n"
+    "      vertex %.6e %.6e %.6e\n"
+    "    endloop\n"
+    "  endfacet\n"
+)
+
+
+def _check(token) -> None:
+    if token is not None:
+        token.check()
+
+
+def save_stl_ascii(path: str, V: np.ndarray, F: np.ndarray, solid_name: str = "fuselage", token=None) -> None:
+    """
+    Write an ASCII STL file from vertices and triangle indices.
+
+    Facets are formatted in blocks of _WRITE_CHUNK; token.check() runs between blocks and a
+    cancelled write leaves no file behind (atomic_write).
+    """
+    F = np.asarray(F)
+    V = np.asarray(V, dtype=float)
     N = _facet_normals(V, F)
-    with open(path, "w", encoding="utf-8") as f:
+    with atomic_write(path, "w", encoding="utf-8") as f:
         f.write(f"solid {solid_name}\n")
-        for (i0, i1, i2), (nx, ny, nz) in zip(F, N):
-            f.write(f"  facet normal {nx:.6e} {ny:.6e} {nz:.6e}\n")
-            f.write("    outer loop\n")
-            x0, y0, z0 = V[i0]
-            x1, y1, z1 = V[i1]
-            x2, y2, z2 = V[i2]
-            f.write(f"      vertex {x0:.6e} {y0:.6e} {z0:.6e}\n")
-            f.write(f"      vertex {x1:.6e} {y1:.6e} {z1:.6e}\n")
-            f.write(f"      vertex {x2:.6e} {y2:.6e} {z2:.6e}\n")
-            f.write("    endloop\n")
-            f.write("  endfacet\n")
+        for i in range(0, F.shape[0], _WRITE_CHUNK):
+            _check(token)
+            j = min(i + _WRITE_CHUNK, F.shape[0])
+            block = np.hstack([N[i:j], V[F[i:j]].reshape(j - i, 9)])
+            f.write((_STL_ASCII_FACET * (j - i)) % tuple(block.ravel().tolist()))
         f.write(f"endsolid {solid_name}\n")
 
 
-def save_stl_binary(path: str, V: np.ndarray, F: np.ndarray, solid_name: str = "fuselage") -> None:
-    """Write a binary STL file from vertices and triangle indices (little-endian)."""
-    os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
-    N = _facet_normals(V, F)
+# Binary STL facet: normal, 3 vertices (float32) and the attribute byte count, 50 bytes packed
+_STL_FACET = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+
+
+def save_stl_binary(path: str, V: np.ndarray, F: np.ndarray, solid_name: str = "fuselage", token=None) -> None:
+    """
+    Write a binary STL file from vertices and triangle indices (little-endian).
+
+    Records are built as one packed array per block of _WRITE_CHUNK facets; token.check()
+    runs between blocks and a cancelled write leaves no file behind.
+    """
+    F = np.asarray(F)
+    V = np.asarray(V)
     header = (solid_name[:79]).ljust(80, " ").encode("ascii", errors="ignore")
-    tri_count = F.shape[0]
-    with open(path, "wb") as f:
+    with atomic_write(path, "wb") as f:
         f.write(header)
-        f.write(struct.pack("<I", tri_count))
-        for (i0, i1, i2), (nx, ny, nz) in zip(F, N):
-            # normal + v0 + v1 + v2 + attribute count
-            rec = struct.pack(
-                "<12fH",
-                float(nx), float(ny), float(nz),
-                float(V[i0, 0]), float(V[i0, 1]), float(V[i0, 2]),
-                float(V[i1, 0]), float(V[i1, 1]), float(V[i1, 2]),
-                float(V[i2, 0]), float(V[i2, 1]), float(V[i2, 2]),
-                0,
-            )
-            f.write(rec)
-
-
-def export_fuselage_stl(geom: dict, path: str, ascii: bool = True, n_theta: int = 128, name: str = "fuselage") -> None:
-    """Convenience: revolve fuselage and save STL (ASCII or binary)."""
-    V, F = revolve_profile_to_mesh(geom["x"], geom["y"], n_theta=n_theta)
+        f.write(struct.pack("<I", F.shape[0]))
+        for i in range(0, F.shape[0], _WRITE_CHUNK):
+            _check(token)
+            Fi = F[i:i + _WRITE_CHUNK]
+            facets = np.empty(Fi.shape[0], dtype=_STL_FACET)
+            facets["normal"] = _facet_normals(V, Fi)
+            facets["vertices"] = V[Fi]
+            facets["attr"] = 0
+            f.write(facets.tobytes())
+
+
+def save_ply_binary(path: str, V: np.ndarray, F: np.ndarray, comment: str = "fuselage") -> None:
+    """Write a binary little-endian PLY file with shared vertices (V written once, F indexed)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
+    V = np.ascontiguousarray(V, dtype="<f4")
+    F = np.asarray(F)
+    header = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        f"comment {comment}\n"
+        f"element vertex {V.shape[0]}\n"
+        "property float x\n"
+        "property float y\n"
+        "property float z\n"
+        f"element face {F.shape[0]}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    )
+    # One record per face: uchar count + 3 int32 indices, packed without padding
+    faces = np.empty(F.shape[0], dtype=[("n", "u1"), ("idx", "<i4", (3,))])
+    faces["n"] = 3
+    faces["idx"] = F
+    with open(path, "wb") as f:
+        f.write(header.encode("ascii"))
+        f.write(V.tobytes())
+        f.write(faces.tobytes())
+
+
+def save_obj(path: str, V: np.ndarray, F: np.ndarray, name: str = "fuselage", token=None) -> None:
+    """Write a Wavefront OBJ file with shared vertices (1-based face indices); token as in save_stl_ascii."""
+    V = np.asarray(V, dtype=float)
+    F = np.asarray(F, dtype=np.int64) + 1
+    with atomic_write(path, "w", encoding="utf-8") as f:
+        f.write(f"# {name}: {V.shape[0]} vertices, {F.shape[0]} faces\n")
+        f.write(f"o {name}\n")
+        # Format whole blocks at once instead of one write per vertex/face
+        for rows, line in ((V, "v %.6e %.6e %.6e\n"), (F, "f %d %d %d\n")):
+            for i in range(0, rows.shape[0], _WRITE_CHUNK):
+                _check(token)
+                block = rows[i:i + _WRITE_CHUNK]
+                f.write((line * block.shape[0]) % tuple(block.ravel().tolist()))
+
+
+def save_glb(path: str, V: np.ndarray, F: np.ndarray, N: np.ndarray | None = None, name: str = "fuselage") -> None:
+    """
+    Write a binary glTF 2.0 (GLB) file with one indexed triangle mesh.
+
+    Positions/normals are stored as float32; indices as uint16 when the vertex
+    count allows it, else uint32. The BIN chunk is written straight from the arrays.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
+    pos = np.ascontiguousarray(V, dtype="<f4")
+    nrm = None if N is None else np.ascontiguousarray(N, dtype="<f4")
+    if nrm is not None and nrm.shape != pos.shape:
+        raise ValueError("save_glb: N must have the same shape as V")
+    n_vert = pos.shape[0]
+    if n_vert < 0xFFFF:
+        idx, idx_ctype = np.ascontiguousarray(F, dtype="<u2").ravel(), 5123  # UNSIGNED_SHORT
+    else:
+        idx, idx_ctype = np.ascontiguousarray(F, dtype="<u4").ravel(), 5125  # UNSIGNED_INT
+
+    # Lay out buffer views back to back, each aligned to 4 bytes
+    blocks = [pos] + ([nrm] if nrm is not None else []) + [idx]
+    views, offset = [], 0
+    for arr in blocks:
+        views.append({"buffer": 0, "byteOffset": offset, "byteLength": arr.nbytes})
+        offset += arr.nbytes + (-arr.nbytes % 4)
+    bin_len = offset
+    for view in views[:-1]:
+        view["target"] = 34962  # ARRAY_BUFFER
+    views[-1]["target"] = 34963  # ELEMENT_ARRAY_BUFFER
+
+    accessors = [{
+        "bufferView": 0, "componentType": 5126, "count": n_vert, "type": "VEC3",
+        "min": pos.min(axis=0).tolist(), "max": pos.max(axis=0).tolist(),
+    }]
+    attributes = {"POSITION": 0}
+    if nrm is not None:
+        accessors.append({"bufferView": 1, "componentType": 5126, "count": n_vert, "type": "VEC3"})
+        attributes["NORMAL"] = 1
+    accessors.append({"bufferView": len(views) - 1, "componentType": idx_ctype, "count": int(idx.size), "type": "SCALAR"})
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "FuselageLab"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "name": name}],
+        "meshes": [{"name": name, "primitives": [{
+            "attributes": attributes, "indices": len(accessors) - 1, "mode": 4,
+        }]}],
+        "buffers": [{"byteLength": bin_len}],
+        "bufferViews": views,
+        "accessors": accessors,
+    }
+    js = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    js += b" " * (-len(js) % 4)
+    total = 12 + 8 + len(js) + 8 + bin_len
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", b"glTF", 2, total))
+        f.write(struct.pack("<I4s", len(js), b"JSON"))
+        f.write(js)
+        f.write(struct.pack("<I4s", bin_len, b"BIN\x00"))
+        for arr in blocks:
+            f.write(memoryview(arr).cast("B"))
+            f.write(b"\x00" * (-arr.nbytes % 4))
+
+
+def _mesh_for_export(geom: dict, n_theta: int, cap_ends: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Reuse the cached "export" LOD when the request matches it, else revolve directly."""
+    lod_n, lod_stations = LOD_LEVELS["export"]
+    if n_theta == lod_n and lod_stations is None and not cap_ends:
+        lod = fuselage_lod(geom, "export")
+        return lod.V, lod.F
+    return revolve_profile_to_mesh(geom["x"], geom["y"], n_theta=n_theta, cap_ends=cap_ends)
+
+
+def export_fuselage_stl(geom: dict, path: str, ascii: bool = True, n_theta: int = 128, name: str = "fuselage",
+                        cap_ends: bool = False, token=None) -> None:
+    """Convenience: revolve fuselage and save STL (ASCII or binary); token.check() runs between write blocks."""
+    V, F = _mesh_for_export(geom, n_theta, cap_ends)
     if ascii:
-        save_stl_ascii(path, V, F, solid_name=name)
+        save_stl_ascii(path, V, F, solid_name=name, token=token)
     else:
-        save_stl_binary(path, V, F, solid_name=name)
+        save_stl_binary(path, V, F, solid_name=name, token=token)
     print(f"[OK] STL saved: {path} ({'ASCII' if ascii else 'binary'})")
+
+
+def export_fuselage_mesh(geom: dict, path: str, n_theta: int = 128, name: str = "fuselage", cap_ends: bool = False,
+                         chord_tol: float | None = None, max_edge: float | None = None, token=None) -> None:
+    """
+    Revolve fuselage and save the mesh in the format given by the file extension.
+
+    Supported: .stl (binary), .ply (binary, indexed), .obj (indexed), .glb (glTF binary).
+    chord_tol / max_edge switch on radius-adaptive ring resolution (n_theta is the cap).
+    token.check() runs after the mesh is built and between the STL/OBJ write blocks.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".stl", ".ply", ".obj", ".glb"):
+        raise ValueError(f"export_fuselage_mesh: unsupported mesh format '{ext}'")
+    if ext != ".glb" and chord_tol is None and max_edge is None:
+        V, F = _mesh_for_export(geom, n_theta, cap_ends)
+        N = None
+    else:
+        V, F, N = revolve_mesh(geom["x"], geom["y"], n_theta, cap_ends=cap_ends, normals=(ext == ".glb"),
+                               chord_tol=chord_tol, max_edge=max_edge)
+    _check(token)
+    if ext == ".stl":
+        save_stl_binary(path, V, F, solid_name=name, token=token)
+    elif ext == ".ply":
+        save_ply_binary(path, V, F, comment=name)
+    elif ext == ".obj":
+        save_obj(path, V, F, name=name, token=token)
+    else:
+        save_glb(path, V, F, N, name=name)
+    print(f"[OK] Mesh saved: {path} ({ext[1:].upper()}, {V.shape[0]} vertices, {F.shape[0]} faces)")
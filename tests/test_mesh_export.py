@@ -0,0 +1,65 @@
+# tests/test_mesh_export.py
+# Mesh writers: what is written reads back as the mesh that was passed in.
+import numpy as np
+import pytest
+
+from src.mesh import revolve_profile_to_mesh
+from src.pipeline import Cancelled, CancelToken
+from src.utils import save_obj, save_stl_ascii, save_stl_binary
+
+
+@pytest.fixture(scope="module")
+def mesh():
+    x = np.linspace(0.0, 1.0, 60)
+    r = 0.1 * np.sin(np.pi * x)
+    return revolve_profile_to_mesh(x, r, n_theta=32)
+
+
+def test_binary_stl_round_trip(tmp_path, mesh):
+    V, F = mesh
+    path = tmp_path / "m.stl"
+    save_stl_binary(str(path), V, F, solid_name="test")
+    raw = path.read_bytes()
+    assert raw[:4] == b"test" and len(raw) == 84 + 50 * F.shape[0]
+    assert int(np.frombuffer(raw, "<u4", count=1, offset=80)[0]) == F.shape[0]
+    rec = np.frombuffer(raw, dtype=[("n", "<f4", (3,)), ("v", "<f4", (3, 3)), ("a", "<u2")], offset=84)
+    np.testing.assert_array_equal(rec["v"], V[F].astype(np.float32))
+    assert not rec["a"].any()
+    lens = np.linalg.norm(rec["n"], axis=1)
+    assert np.all((np.abs(lens - 1) < 1e-6) | (lens == 0))
+
+
+def test_ascii_stl_round_trip(tmp_path, mesh):
+    V, F = mesh
+    path = tmp_path / "m.stl"
+    save_stl_ascii(str(path), V, F, solid_name="test")
+    lines = path.read_text().splitlines()
+    assert lines[0] == "solid test" and lines[-1] == "endsolid test"
+    verts = np.array([ln.split()[1:] for ln in lines if ln.strip().startswith("vertex")], dtype=float)
+    np.testing.assert_allclose(verts.reshape(-1, 3, 3), V[F], rtol=1e-6, atol=1e-7)
+
+
+@pytest.mark.parametrize("writer", [save_stl_ascii, save_stl_binary, save_obj])
+def test_cancelled_export_leaves_no_file(tmp_path, mesh, writer):
+    V, F = mesh
+    token = CancelToken()
+    token.cancel()
+    path = tmp_path / "m.out"
+    with pytest.raises(Cancelled):
+        writer(str(path), V, F, token=token)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("r_tail, kw", [(0.0, {}), (0.05, {"cap_ends": True}), (0.0, {"chord_tol": 1e-3})])
+def test_revolved_mesh_is_watertight(r_tail, kw):
+    x = np.linspace(0.0, 1.0, 60)
+    r = 0.1 * np.sin(np.pi * x)
+    if r_tail:
+        r = np.where(x > 0.9, r_tail, r)  # blunt tail
+    V, F = revolve_profile_to_mesh(x, r, n_theta=32, **kw)
+    edges = np.concatenate([F[:, [0, 1]], F[:, [1, 2]], F[:, [2, 0]]])
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    assert counts.max() == 1  # no directed edge used twice: consistent orientation
+    assert {tuple(e) for e in edges} == {tuple(e) for e in edges[:, ::-1]}  # every edge has its twin
+    volume = np.einsum("ij,ij->", V[F[:, 0]], np.cross(V[F[:, 1]], V[F[:, 2]])) / 6.0
+    assert volume == pytest.approx(np.trapezoid(np.pi * r**2, x), rel=0.02)  # closed and facing outwards
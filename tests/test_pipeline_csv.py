@@ -0,0 +1,32 @@
+# tests/test_pipeline_csv.py
+# Profile CSV placement with run_dirs: default path follows the run, an explicit directory is kept.
+import os
+
+import pytest
+
+from src.configio import normalize_config
+from src.pipeline import run_case
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _run(**io):
+    return run_case(normalize_config({"io": {"run_dirs": True, "run_index": "", "export_csv": True, **io}}))
+
+
+def test_default_csv_goes_into_the_run_folder(workdir):
+    payload = _run()
+    assert os.path.isfile(os.path.join(payload.run_dir, "fuselaje_xy.csv"))
+    assert not (workdir / "results" / "data" / "fuselaje_xy.csv").exists()
+
+
+@pytest.mark.parametrize("absolute", [False, True])
+def test_explicit_csv_directory_is_honoured(workdir, absolute):
+    rel = os.path.join("results", "custom", "perfil.csv")
+    payload = _run(csv_path=str(workdir / rel) if absolute else rel)
+    assert (workdir / rel).is_file()
+    assert not os.path.exists(os.path.join(payload.run_dir, "perfil.csv"))
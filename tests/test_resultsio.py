@@ -0,0 +1,76 @@
+# tests/test_resultsio.py
+# Compact results: lazy browsing of many stored runs without running out of file descriptors.
+import mmap
+import os
+
+import numpy as np
+import pytest
+
+from src import resultsio
+from src.resultsio import RunResult, open_runs, save_results_compact
+
+resource = pytest.importorskip("resource")  # POSIX only
+
+
+def _payload(i: int) -> dict:
+    x = np.linspace(0.0, 1.0 + i, 50)
+    return {"geom": {"x": x, "y": np.sqrt(x), "l": 1.0 + i}, "aero": {"CD_total": 0.01 * i}}
+
+
+@pytest.fixture
+def low_fd_limit():
+    """Soft RLIMIT_NOFILE lowered to 128 for the test, restored afterwards."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    limit = min(128, hard) if hard != resource.RLIM_INFINITY else 128
+    resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    try:
+        yield limit
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_browsing_more_runs_than_the_fd_limit(tmp_path, low_fd_limit):
+    n = 3 * low_fd_limit
+    for i in range(n):
+        save_results_compact(_payload(i), str(tmp_path / f"run_{i:04d}" / "resultados_compact.json"))
+
+    runs = open_runs(str(tmp_path))
+    assert len(runs) == n
+    arrays = [(run.array("geom.x"), run["geom"]["y"]) for run in runs]  # all kept alive at once
+    for run, (x, y) in zip(runs, arrays):
+        i = int(os.path.basename(os.path.dirname(run.path))[4:])
+        assert x[-1] == 1.0 + i and not x.flags.writeable
+        np.testing.assert_array_equal(y, np.sqrt(x))
+
+
+def test_compact_round_trip(tmp_path):
+    payload = {
+        "geom": {"x": np.linspace(0.0, 1.0, 7), "y": np.arange(6, dtype=np.float32)[::2],  # strided
+                 "l": 1.5, "tags": ["a", "b"]},
+        "batch": {"mode": np.array([0, 2, 1], dtype=np.int8), "ok": np.array([True, False]),
+                  "grid": np.arange(12, dtype=">i4").reshape(3, 4), "empty": np.zeros((0, 3))},
+        "aero": {"CD_total": np.float64(0.02), "n": np.int64(3), "flag": np.bool_(True)},
+    }
+    path = str(tmp_path / "resultados_compact.json")
+    save_results_compact(payload, path)
+    run = RunResult(path)
+    for sec, values in payload.items():
+        for k, v in values.items():
+            got = run[sec][k]
+            if isinstance(v, np.ndarray):
+                assert got.shape == v.shape and got.dtype == v.dtype.newbyteorder("<")
+                np.testing.assert_array_equal(got, v)
+            else:
+                assert got == v and not isinstance(got, np.generic)
+
+
+def test_large_sidecar_is_mapped_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(resultsio, "_EAGER_BYTES", 0)
+    path = str(tmp_path / "resultados_compact.json")
+    save_results_compact(_payload(3), path)
+    run = RunResult(path)
+    x, y = run.array("geom.x"), run.array("geom.y")
+    assert isinstance(run._buffer, mmap.mmap)
+    np.testing.assert_array_equal(y, np.sqrt(x))
+    run.close()
+    assert x[-1] == 4.0  # views outlive close()
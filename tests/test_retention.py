@@ -0,0 +1,82 @@
+# tests/test_retention.py
+# Retention planning (keep-last / age / quota / pins) and the folder scan it works from.
+import os
+import time
+
+import pytest
+
+from src.retention import _GRACE_S, PIN_FILE, RunDir, apply_retention, plan_retention, scan_run_dirs
+
+NOW = 1_700_000_000.0
+DAY = 86400.0
+
+
+def _runs(n: int, nbytes: int = 100) -> list:
+    """n run folders one day apart, oldest first."""
+    return [RunDir(f"/r/run_{i}", NOW - (n - i) * DAY, nbytes, False) for i in range(n)]
+
+
+def _names(runs) -> list:
+    return [os.path.basename(r.path) for r in runs]
+
+
+def test_keep_last():
+    assert _names(plan_retention(_runs(5), keep_last=2, now=NOW)) == ["run_0", "run_1", "run_2"]
+
+
+def test_max_age():
+    assert _names(plan_retention(_runs(5), max_age_days=2.5, now=NOW)) == ["run_0", "run_1", "run_2"]
+
+
+def test_max_bytes_drops_oldest_first():
+    assert _names(plan_retention(_runs(5), max_bytes=250, now=NOW)) == ["run_0", "run_1", "run_2"]
+
+
+def test_pinned_protected_and_busy_are_kept_and_not_counted():
+    runs = _runs(5)
+    runs[0] = runs[0]._replace(pinned=True)
+    runs[1] = runs[1]._replace(busy=True)
+    drop = plan_retention(runs, keep_last=1, protect=["/r/run_2"], now=NOW)
+    assert _names(drop) == ["run_3"]
+
+
+def test_no_limits_keeps_everything():
+    assert plan_retention(_runs(5), now=NOW) == []
+
+
+def _make_run(root, name: str, age_s: float, files=("resultados.json",)) -> str:
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    for f in files:
+        with open(os.path.join(path, f), "w") as fh:
+            fh.write("x" * 1000)
+    t = time.time() - age_s
+    os.utime(path, (t, t))
+    return path
+
+
+def test_scan_sizes_only_on_request(tmp_path):
+    _make_run(str(tmp_path), "run_2025-01-01_120000Z", DAY)
+    assert [r.nbytes for r in scan_run_dirs(str(tmp_path), sizes=False)] == [0]
+    assert [r.nbytes for r in scan_run_dirs(str(tmp_path))] == [1000]
+
+
+def test_apply_prunes_interrupted_runs_but_not_busy_ones(tmp_path):
+    root = str(tmp_path)
+    crashed = _make_run(root, "run_2025-01-01_120000Z", 30 * DAY, files=())
+    pinned = _make_run(root, "run_2025-01-02_120000Z", 30 * DAY, files=(PIN_FILE,))
+    busy = _make_run(root, "run_2025-01-03_120000Z", _GRACE_S / 2, files=())
+    removed = apply_retention(root, max_age_days=1)
+    assert removed == [crashed]
+    assert os.path.isdir(pinned) and os.path.isdir(busy)
+
+
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_apply_never_removes_latest(tmp_path, dry_run):
+    root = str(tmp_path)
+    old = _make_run(root, "run_2025-01-01_120000Z", 30 * DAY)
+    newer = _make_run(root, "run_2025-01-02_120000Z", 20 * DAY)
+    with open(os.path.join(root, "LATEST"), "w") as f:
+        f.write(os.path.basename(old) + "\n")
+    assert apply_retention(root, keep_last=0, max_age_days=1, dry_run=dry_run) == [newer]
+    assert os.path.isdir(newer) == dry_run
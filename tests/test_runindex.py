@@ -0,0 +1,57 @@
+# tests/test_runindex.py
+# Run index: one cfg_hash per design whether it was run alone or inside a sweep.
+import numpy as np
+
+from src.batch import MODES, DesignBatch, evaluate_batch
+from src.configio import normalize_config
+from src.pipeline import evaluate_case
+from src.runindex import RunIndex, batch_rows, config_hash, shared_index
+
+
+def _sweep(cfg):
+    batch = DesignBatch.from_grid(cfg, {"cf_mode": list(MODES), "V": [5.0, 10.0, 20.0], "geom.base_ratio": [0.0, 0.3]})
+    evaluate_batch(batch)
+    return batch
+
+
+def test_sweep_rows_hash_like_single_runs():
+    cfg = normalize_config({})
+    batch = _sweep(cfg)
+    hashes = [row[1] for row in batch_rows(batch)]
+    assert hashes == [config_hash(batch.config(i)) for i in range(len(batch))]
+    assert len(set(hashes)) == len(batch)
+
+
+def test_hash_of_the_base_design_matches_its_sweep_row():
+    cfg = normalize_config({"op": {"V": 10}, "cf_model": {"mode": "turbulent"}})  # int V as typed in a form
+    batch = _sweep(cfg)
+    row = np.flatnonzero((batch.mode_names() == "turbulent") & (batch.inputs["V"] == 10.0)
+                         & (batch.inputs["base_ratio"] == 0.0))[0]
+    assert [r[1] for r in batch_rows(batch)][row] == config_hash(cfg)
+
+
+def test_hash_ignores_io_plots_and_retention():
+    cfg = normalize_config({})
+    other = normalize_config({"io": {"results_format": "both", "storage_dtype": "float32"},
+                              "plots": {"dpi": 300}, "retention": {"keep_last": 3}})
+    assert config_hash(cfg) == config_hash(other)
+    assert config_hash(cfg) != config_hash(normalize_config({"geom": {"l": 1.2}}))
+
+
+def test_latest_is_unambiguous_within_one_second(tmp_path):
+    cfg = normalize_config({})
+    payload, _ = evaluate_case(cfg)
+    with RunIndex(str(tmp_path / "runs.sqlite")) as idx:
+        ids = [idx.add(cfg, payload) for _ in range(3)]
+        ids += [idx.add(cfg, payload, stamp="2025-01-01_120000Z") for _ in range(2)]  # old-style stamps
+        stamps = [r["stamp"] for r in idx.query(order_by="id")]
+        assert len(set(stamps[:3])) == 3 and stamps[:3] == sorted(stamps[:3])
+        assert [r["id"] for r in idx.query(("stamp", "<", "2026"), order_by="stamp", desc=True)] == ids[:2:-1]
+        assert idx.query(order_by="stamp", desc=True, limit=1)[0]["id"] == ids[2]
+
+
+def test_shared_index_reuses_one_connection(tmp_path):
+    path = str(tmp_path / "runs.sqlite")
+    idx = shared_index(path)
+    assert shared_index(path) is idx
+    assert shared_index(str(tmp_path / "." / "runs.sqlite")) is idx
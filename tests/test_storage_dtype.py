@@ -0,0 +1,117 @@
+# tests/test_storage_dtype.py
+# io.storage_dtype = "float32": stored/transported geometry stays within float32 rounding of the
+# float64 run, and everything computed by the pipeline is unaffected.
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src import calcs
+from src.configio import normalize_config
+from src.mesh import fuselage_lod
+from src.pipeline import evaluate_case, run_case, storage_dtype
+from src.records import Profile
+from src.resultsio import RunResult
+
+EPS32 = float(np.finfo(np.float32).eps)  # 2**-23; rounding to float32 is within EPS32 / 2 relative
+
+
+def _cfg(dtype: str) -> dict:
+    return normalize_config({
+        "io": {"storage_dtype": dtype, "results_format": "both", "run_dirs": True,
+               "export_csv": False, "run_index": ""},
+    })
+
+
+@pytest.fixture(scope="module")
+def runs(tmp_path_factory):
+    """Payload per storage dtype, written under a temporary working directory (absolute run_dir)."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("storage"))
+    try:
+        runs = {dtype: run_case(_cfg(dtype)) for dtype in ("float64", "float32")}
+        for payload in runs.values():
+            payload.run_dir = os.path.abspath(payload.run_dir)
+        return runs
+    finally:
+        os.chdir(cwd)
+
+
+def _stored(payload, name: str) -> dict:
+    """Geometry arrays as read back from resultados.json ("json") or the compact result ("compact")."""
+    if name == "json":
+        with open(os.path.join(payload.run_dir, "resultados.json"), "r", encoding="utf-8") as f:
+            geom = json.load(f)["geom"]
+        return {k: np.asarray(geom[k], dtype=float) for k in ("x", "y")}
+    run = RunResult(os.path.join(payload.run_dir, "resultados_compact.json"))
+    return {k: np.asarray(run.array(f"geom.{k}")) for k in ("x", "y")}
+
+
+def _rel_err(a, b) -> float:
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    return float(np.max(np.abs(a - b) / np.maximum(np.abs(b), np.finfo(float).tiny)))
+
+
+def test_payload_geometry_is_float32(runs):
+    assert runs["float64"].geom.x.dtype == np.float64
+    assert runs["float32"].geom.x.dtype == np.float32
+    assert runs["float32"].geom.y.dtype == np.float32
+
+
+@pytest.mark.parametrize("name", ["json", "compact"])
+def test_stored_profile_error(runs, name):
+    ref = _stored(runs["float64"], name)
+    got = _stored(runs["float32"], name)
+    for k in ("x", "y"):
+        assert got[k].shape == ref[k].shape
+        assert _rel_err(got[k], ref[k]) <= EPS32 / 2
+
+
+def test_json_round_trips_float32_exactly(runs):
+    stored = _stored(runs["float32"], "json")
+    for k in ("x", "y"):
+        assert np.array_equal(stored[k].astype(np.float32), runs["float32"].geom[k])
+
+
+@pytest.mark.parametrize("level", ["viewer", "export"])
+def test_lod_vertex_error(runs, level):
+    ref = fuselage_lod(runs["float64"].geom, level)
+    got = fuselage_lod(runs["float32"].geom, level)
+    assert got.V.dtype == np.float32 and ref.V.dtype == np.float64
+    assert got.V.shape == ref.V.shape and np.array_equal(got.F, ref.F)
+    scale = float(np.max(np.abs(ref.V)))
+    assert float(np.max(np.abs(got.V - ref.V))) <= 4 * EPS32 * scale
+
+
+@pytest.mark.parametrize("include_base", [False, True])
+def test_recomputed_integrals_error(runs, include_base):
+    """Integrals from the reloaded float32 profile vs the float64 one (the profile is the only input)."""
+    ref = calcs.geom_integrals(Profile.from_mapping(runs["float64"].geom), include_base)
+    got = calcs.geom_integrals(Profile.from_mapping(runs["float32"].geom).astype(np.float64), include_base)
+    assert ref.keys() == got.keys()
+    for k, v in ref.items():
+        if np.isfinite(v):
+            assert abs(got[k] - v) <= 1e-5 * max(abs(v), 1e-12), k
+        else:
+            assert not np.isfinite(got[k]), k
+
+
+def test_pipeline_scalars_bit_identical(runs):
+    ref = runs["float64"].results
+    got = runs["float32"].results
+    assert list(got) == list(ref)
+    for k in ref:
+        assert np.float64(got[k]).tobytes() == np.float64(ref[k]).tobytes(), k
+
+
+def test_live_path_uses_storage_dtype(runs):
+    cfg = _cfg("float32")
+    payload, _ = evaluate_case(cfg, dtype=storage_dtype(cfg))
+    again, timings = evaluate_case(cfg, dtype=storage_dtype(cfg))
+    assert again.geom is payload.geom and timings["geom_cached"]  # the view is not redrawn per edit
+    for k in ("x", "y"):
+        assert payload.geom[k].dtype == np.float32
+        np.testing.assert_array_equal(payload.geom[k], runs["float32"].geom[k])
+    assert dict(payload.results) == dict(runs["float32"].results)